@@ -2,14 +2,17 @@ import cv2
 import mediapipe as mp
 import pyautogui
 import numpy as np
-from screen_brightness_control import set_brightness, get_brightness
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+import os
 import time
 import sys
+import contextlib
 import win32gui
 import win32con
+from input_backend import get_input_backend
+from platform_services import PlatformServices
+from gesture_pipeline import GesturePipeline
+from hand_roi import TrackedHandDetector
+from gesture_scheduler import AdaptiveScheduler
 
 # Initialize MediaPipe
 mp_hands = mp.solutions.hands
@@ -20,14 +23,20 @@ pyautogui.FAILSAFE = True
 pyautogui.PAUSE = 0.1
 screen_width, screen_height = pyautogui.size()
 
-# Initialize audio controls
+# Cursor and click events skip pyautogui's PAUSE, so the cursor keeps up with the hand
+input_backend = get_input_backend()
+
+# Volume and brightness backends, probed once. The mixer connection stays open with the
+# level cached between frames, and brightness is read from an in-memory mirror and written
+# in the background, so frames don't wait on either.
 try:
-    devices = AudioUtilities.GetSpeakers()
-    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-    volume = cast(interface, POINTER(IAudioEndpointVolume))
+    services = PlatformServices()
+    volume = services.volume
+    brightness = services.brightness
 except Exception as e:
-    print(f"Warning: Could not initialize audio controls: {e}")
+    print(f"Warning: Could not initialize audio and brightness controls: {e}")
     volume = None
+    brightness = None
 
 class GestureController:
     def __init__(self):
@@ -45,6 +54,8 @@ class GestureController:
         self.volume_cooldown = 0.1
         self.brightness_cooldown = 0.1
         self.scroll_start_y = None
+        self.last_click = 0.0
+        self.click_cooldown = 0.2
         
     def calculate_finger_states(self, hand_landmarks):
         fingers = []
@@ -108,17 +119,20 @@ class GestureController:
                 if self.prev_hand_x is not None:
                     smoothed_x = int(self.prev_hand_x + (x - self.prev_hand_x) * self.smooth_factor)
                     smoothed_y = int(self.prev_hand_y + (y - self.prev_hand_y) * self.smooth_factor)
-                    pyautogui.moveTo(smoothed_x, smoothed_y)
+                    input_backend.move_to(smoothed_x, smoothed_y)
                 self.prev_hand_x = x
                 self.prev_hand_y = y
                 
             elif gesture == "LEFT_CLICK":
-                pyautogui.click()
-                time.sleep(0.2)
+                # Debounce without sleeping, so the next frame is still actuated promptly
+                if time.time() - self.last_click >= self.click_cooldown:
+                    input_backend.click()
+                    self.last_click = time.time()
                 
             elif gesture == "RIGHT_CLICK":
-                pyautogui.rightClick()
-                time.sleep(0.2)
+                if time.time() - self.last_click >= self.click_cooldown:
+                    input_backend.click(button="right")
+                    self.last_click = time.time()
                 
             elif gesture == "SCROLL_READY":
                 current_y = hand_landmarks.landmark[8].y
@@ -135,7 +149,7 @@ class GestureController:
                         cv2.putText(frame, f"Scrolling {direction} (Speed: {speed})", (10, 130),
                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
                         
-                        pyautogui.scroll(scroll_amount)
+                        input_backend.scroll(scroll_amount)
                     
                     # Don't reset scroll_start_y to allow continuous scrolling
                     
@@ -147,15 +161,13 @@ class GestureController:
                     else:
                         y_diff = hand_landmarks.landmark[4].y - self.volume_base
                         volume_change = -y_diff
-                        current_volume = volume.GetMasterVolumeLevelScalar()
-                        new_volume = max(0, min(1, current_volume + volume_change * 0.1))
-                        volume.SetMasterVolumeLevelScalar(new_volume, None)
-                        volume_percent = int(new_volume * 100)
+                        new_volume = volume.adjust(volume_change * 10)
+                        volume_percent = int(new_volume)
                         cv2.putText(frame, f"Volume: {volume_percent}%", (10, 90),
                                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
                         self.last_volume_change = current_time
                     
-            elif gesture == "BRIGHTNESS":
+            elif gesture == "BRIGHTNESS" and brightness is not None:
                 current_time = time.time()
                 if current_time - self.last_brightness_change >= self.brightness_cooldown:
                     if self.brightness_base is None:
@@ -163,11 +175,9 @@ class GestureController:
                     else:
                         try:
                             y_diff = hand_landmarks.landmark[8].y - self.brightness_base
-                            current_brightness = get_brightness()[0]
                             brightness_change = int(-y_diff * 50)
-                            new_brightness = max(0, min(100, current_brightness + brightness_change))
-                            set_brightness(new_brightness)
-                            cv2.putText(frame, f"Brightness: {new_brightness}%", (10, 90),
+                            new_brightness = brightness.adjust(brightness_change, smooth=True)
+                            cv2.putText(frame, f"Brightness: {int(new_brightness)}%", (10, 90),
                                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
                             self.last_brightness_change = current_time
                         except Exception as e:
@@ -181,6 +191,13 @@ class GestureController:
         except Exception as e:
             print(f"Error in process_gesture: {e}")
 
+def apply_capture_profile(cap, profile):
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    cap.set(cv2.CAP_PROP_FPS, profile.fps)
+    # Keep at most one frame queued, so a frame read after a pause isn't stale
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
 def cleanup(cap):
     if cap is not None:
         cap.release()
@@ -209,10 +226,13 @@ def main():
         print("Error: Could not initialize webcam after multiple attempts")
         return
     
+    # Full rate while a hand is in view; a few low-resolution frames a second otherwise
+    scheduler = AdaptiveScheduler(idle_after=float(os.getenv("GESTURE_IDLE_AFTER", "5")),
+                                  idle_fps=float(os.getenv("GESTURE_IDLE_FPS", "2")))
+    
     # Set lower resolution for better performance
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    cap.set(cv2.CAP_PROP_FPS, 30)
+    applied_profile = scheduler.profile
+    apply_capture_profile(cap, applied_profile)
     
     controller = GestureController()
     
@@ -226,11 +246,19 @@ def main():
                             win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
     
     # Initialize MediaPipe Hands
-    with mp_hands.Hands(
+    hand_options = dict(
         static_image_mode=False,
         max_num_hands=1,
         min_detection_confidence=0.7,
-        min_tracking_confidence=0.7) as hands:
+        min_tracking_confidence=0.7)
+    
+    # Opt-in until it has been measured on real webcams with benchmark_hand_roi.py --live
+    roi_tracking = os.getenv("HAND_ROI_TRACKING", "0") != "0"
+    
+    # ROI crops get their own instance, since video-mode tracking state
+    # from one would be wrong for the other
+    with mp_hands.Hands(**hand_options) as hands, \
+            (mp_hands.Hands(**hand_options) if roi_tracking else contextlib.nullcontext()) as roi_hands:
         
         print("\nGesture Control System Started")
         print("\nAvailable gestures (maximum 3 fingers):")
@@ -246,36 +274,66 @@ def main():
         print("6. Brightness Control: Index + Middle + Ring fingers (move hand up/down)")
         print("\nTo exit the program, press 'q'\n")
         
+        def read_frame():
+            nonlocal cap, applied_profile
+            # The camera is only reconfigured here, on the capture thread that reads it
+            if scheduler.profile is not applied_profile:
+                applied_profile = scheduler.profile
+                apply_capture_profile(cap, applied_profile)
+            ret, frame = cap.read()
+            if not ret:
+                print("Error: Could not read frame")
+                cap.release()
+                time.sleep(1)
+                cap = cv2.VideoCapture(0)
+                apply_capture_profile(cap, applied_profile)
+                return None
+            return cv2.flip(frame, 1)
+        
+        def process(image):
+            return hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        
+        def process_roi(image):
+            return roi_hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        
+        # Once a hand is found, only a padded box around it is converted and sent to MediaPipe
+        if roi_tracking:
+            infer = TrackedHandDetector(process_roi, full_process=process)
+        else:
+            infer = process
+        
+        def actuate(packet):
+            for hand_landmarks in packet.result.multi_hand_landmarks or []:
+                finger_states = controller.calculate_finger_states(hand_landmarks)
+                gesture = controller.get_gesture(finger_states)
+                controller.process_gesture(packet.frame, hand_landmarks, gesture)
+                packet.gestures.append(gesture)
+        
+        # Capture, inference and actuation run on their own threads; this thread only displays
+        pipeline = GesturePipeline(read_frame, infer, actuate, scheduler=scheduler)
+        pipeline.start()
         try:
+            shown = 0
             while True:
-                ret, frame = cap.read()
-                if not ret:
-                    print("Error: Could not read frame")
-                    cap.release()
-                    time.sleep(1)
-                    cap = cv2.VideoCapture(0)
-                    continue
-                
-                frame = cv2.flip(frame, 1)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                results = hands.process(rgb_frame)
-                
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
+                packet = pipeline.latest(shown, timeout=0.1)
+                if packet is not None:
+                    shown = packet.seq
+                    frame = packet.frame
+                    for hand_landmarks in packet.result.multi_hand_landmarks or []:
                         mp_drawing.draw_landmarks(
                             frame, 
                             hand_landmarks, 
                             mp_hands.HAND_CONNECTIONS)
-                        
-                        finger_states = controller.calculate_finger_states(hand_landmarks)
-                        gesture = controller.get_gesture(finger_states)
-                        controller.process_gesture(frame, hand_landmarks, gesture)
-                        
+                    for gesture in packet.gestures:
                         cv2.putText(frame, f"Gesture: {gesture}", (10, 50),
                                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
-                
-                cv2.imshow('Hand Gesture Control', frame)
+                    summary = pipeline.summary()
+                    cv2.putText(frame, f"Capture {summary['capture']['fps']:.0f} fps  "
+                                f"Inference {summary['inference']['fps']:.0f} fps  "
+                                f"Latency {summary['end_to_end']['latency_ms']:.0f} ms  "
+                                f"CPU {summary['cpu_percent']:.0f}%  {summary['mode'].title()}",
+                                (10, frame.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+                    cv2.imshow('Hand Gesture Control', frame)
                 
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     break
@@ -285,6 +343,11 @@ def main():
         except Exception as e:
             print(f"Unexpected error: {e}")
         finally:
+            pipeline.stop()
+            print(f"Gesture pipeline: {pipeline.format_summary()}")
+            print(f"Gesture scheduler: {scheduler.summary()}")
+            if isinstance(infer, TrackedHandDetector):
+                print(f"Hand tracking: {infer.summary()}")
             cleanup(cap)
 
 if __name__ == "__main__":
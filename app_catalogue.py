@@ -0,0 +1,425 @@
+import os
+import re
+import sys
+import json
+import shlex
+import shutil
+import difflib
+import threading
+import configparser
+
+DEFAULT_CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "app_catalogue.json")
+CATALOGUE_VERSION = 1
+
+# When several sources know the same name, prefer launchers meant for people
+SOURCE_PRIORITY = {"desktop": 0, "startmenu": 0, "path": 1}
+
+# .desktop Exec field codes (files, URLs, icons...) that we never pass
+DESKTOP_FIELD_CODES = re.compile(r"\s*%[fFuUdDnNickvm]")
+
+# Executable suffixes on Windows PATH
+WINDOWS_EXECUTABLE_SUFFIXES = (".exe", ".bat", ".cmd", ".com")
+
+# Sources whose entries may be matched fuzzily; PATH binaries need their exact name
+FUZZY_SOURCES = ("desktop", "startmenu")
+
+# Programs a misheard "open ..." must never start, whatever the source
+DESTRUCTIVE_COMMANDS = {
+    "reboot", "poweroff", "shutdown", "halt", "init", "telinit", "systemctl", "loginctl",
+    "rm", "rmdir", "del", "erase", "rd", "shred", "wipe", "wipefs", "dd", "format", "diskpart",
+    "fdisk", "sfdisk", "parted", "mkfs", "mkswap", "kill", "killall", "pkill", "taskkill",
+    "sudo", "su", "doas", "pkexec",
+}
+
+# Programs that run the rest of their arguments as another command
+COMMAND_WRAPPERS = {"env", "nohup", "nice", "ionice", "setsid", "exec", "command", "timeout", "stdbuf", "xargs"}
+
+# Shells and the flag that makes them run a command string
+SHELL_COMMAND_FLAGS = {"sh": "-c", "bash": "-c", "dash": "-c", "zsh": "-c", "ksh": "-c", "fish": "-c",
+                       "cmd": "/c", "powershell": "-command", "pwsh": "-command"}
+
+# Terminal emulators to run Terminal=true launchers in, with the flag before the command
+TERMINAL_EMULATORS = [("x-terminal-emulator", "-e"), ("gnome-terminal", "--"), ("konsole", "-e"),
+                      ("xfce4-terminal", "-x"), ("kitty", None), ("alacritty", "-e"), ("xterm", "-e")]
+
+
+def normalize_name(name):
+    """Lowercase a name and collapse punctuation so "Visual Studio Code" == "visual-studio code" """
+    return " ".join(re.sub(r"[^\w]+", " ", name.lower()).split())
+
+
+def _program_name(path):
+    program = os.path.basename(path).lower()
+    for suffix in WINDOWS_EXECUTABLE_SUFFIXES:
+        if program.endswith(suffix):
+            return program[:-len(suffix)]
+    return program
+
+
+def _runs_destructive(argv, depth=0):
+    """Whether a command, or one it wraps (env, sh -c, ...), is on the denylist"""
+    while argv:
+        program = _program_name(argv[0])
+        # mkfs.ext4, mkfs.vfat...
+        if program in DESTRUCTIVE_COMMANDS or program.split(".")[0] in DESTRUCTIVE_COMMANDS:
+            return True
+        if program in COMMAND_WRAPPERS:
+            # Skip the wrapper's options, variable assignments and numbers ("nice -n 10")
+            argv = argv[1:]
+            while argv and (argv[0].startswith("-") or "=" in argv[0] or argv[0].isdigit()):
+                argv = argv[1:]
+            continue
+        flag = SHELL_COMMAND_FLAGS.get(program)
+        if flag and depth < 3:
+            lowered = [arg.lower() for arg in argv[1:]]
+            if flag in lowered:
+                script = " ".join(argv[lowered.index(flag) + 2:])
+                for part in re.split(r"[;&|\n]+", script):
+                    try:
+                        words = shlex.split(part)
+                    except ValueError:
+                        words = part.split()
+                    if _runs_destructive(words, depth + 1):
+                        return True
+        return False
+    return False
+
+
+def is_destructive(entry):
+    """Whether a catalogue entry runs a command on the destructive-command denylist
+
+    Wrappers such as `env rm ...` or `sh -c "shutdown now"` are looked through.
+
+    Args:
+        entry (dict): Catalogue entry
+
+    Returns:
+        bool: True if the entry must not be launched
+    """
+    return _runs_destructive(list(entry.get("command") or []))
+
+
+def terminal_command(argv):
+    """Wrap a command in the user's terminal emulator, for Terminal=true launchers
+
+    Args:
+        argv (list): Command to run
+
+    Returns:
+        list: Terminal emulator command, or None if no terminal emulator is installed
+    """
+    candidates = list(TERMINAL_EMULATORS)
+    if os.getenv("TERMINAL"):
+        candidates.insert(0, (os.getenv("TERMINAL"), "-e"))
+    for terminal, flag in candidates:
+        path = shutil.which(terminal)
+        if path:
+            return [path] + ([flag] if flag else []) + list(argv)
+    return None
+
+
+def default_sources():
+    """Directories to scan for applications on this platform
+
+    Returns:
+        list: (directory, kind) pairs where kind is "path", "desktop" or "startmenu"
+    """
+    sources = []
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if directory:
+            sources.append((directory, "path"))
+
+    if sys.platform == "win32":
+        for base in (os.environ.get("PROGRAMDATA"), os.environ.get("APPDATA")):
+            if base:
+                sources.append((os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"), "startmenu"))
+    elif sys.platform != "darwin":
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+        for base in [data_home] + data_dirs.split(":"):
+            if base:
+                sources.append((os.path.join(base, "applications"), "desktop"))
+        for base in ("/var/lib/flatpak/exports/share", os.path.expanduser("~/.local/share/flatpak/exports/share")):
+            sources.append((os.path.join(base, "applications"), "desktop"))
+    return sources
+
+
+def parse_desktop_file(path):
+    """Read the launcher details from an XDG .desktop file
+
+    Args:
+        path (str): Path to the .desktop file
+
+    Returns:
+        dict: Catalogue entry, or None for hidden entries and non-applications
+    """
+    parser = configparser.RawConfigParser(strict=False, interpolation=None)
+    parser.optionxform = str
+    try:
+        parser.read(path, encoding="utf-8")
+        section = parser["Desktop Entry"]
+    except Exception:
+        return None
+
+    if section.get("Type", "Application") != "Application":
+        return None
+    if section.get("NoDisplay", "").lower() == "true" or section.get("Hidden", "").lower() == "true":
+        return None
+    name, exec_line = section.get("Name"), section.get("Exec")
+    if not name or not exec_line:
+        return None
+
+    exec_line = DESKTOP_FIELD_CODES.sub("", exec_line).replace("%%", "%")
+    try:
+        command = shlex.split(exec_line)
+    except ValueError:
+        return None
+    if not command:
+        return None
+
+    keywords = [section.get("GenericName", "")]
+    keywords += section.get("Keywords", "").split(";")
+    keywords += [os.path.splitext(os.path.basename(path))[0], os.path.basename(command[0])]
+    return {
+        "name": name,
+        "command": command,
+        "keywords": [keyword for keyword in keywords if keyword],
+        "source": "desktop",
+        "path": path,
+        "terminal": section.get("Terminal", "").lower() == "true",
+    }
+
+
+def _scan_directory(directory, kind):
+    """Scan one directory (not its subdirectories) for applications
+
+    Returns:
+        tuple: (entries, subdirectories)
+    """
+    entries, subdirs = [], []
+    with os.scandir(directory) as items:
+        for item in items:
+            try:
+                if item.is_dir():
+                    # PATH directories aren't searched recursively
+                    if kind != "path":
+                        subdirs.append(item.path)
+                    continue
+
+                if kind == "path":
+                    name, suffix = os.path.splitext(item.name)
+                    if sys.platform == "win32":
+                        if suffix.lower() not in WINDOWS_EXECUTABLE_SUFFIXES:
+                            continue
+                    else:
+                        name = item.name
+                        if not os.access(item.path, os.X_OK):
+                            continue
+                    entries.append({"name": name, "command": [item.path], "keywords": [],
+                                    "source": "path", "path": item.path})
+                elif kind == "desktop" and item.name.endswith(".desktop"):
+                    entry = parse_desktop_file(item.path)
+                    if entry:
+                        entries.append(entry)
+                elif kind == "startmenu" and item.name.lower().endswith((".lnk", ".url")):
+                    name = os.path.splitext(item.name)[0]
+                    entries.append({"name": name, "command": [item.path], "keywords": [],
+                                    "source": "startmenu", "path": item.path})
+            except OSError:
+                continue
+    return entries, subdirs
+
+
+class AppCatalogue:
+    """Installed applications found on PATH, in XDG .desktop files and Start Menu shortcuts
+
+    The scan is persisted to disk with each directory's mtime, so refreshing
+    only rescans directories whose contents changed since the last run.
+    Lookups go through dictionaries built at load time.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOGUE_PATH, sources=None):
+        """Initialize app catalogue
+
+        Args:
+            path (str, optional): JSON file the scan is persisted to, or None to keep it in memory
+            sources (list, optional): (directory, kind) pairs to scan, default default_sources()
+        """
+        self.path = path
+        self.sources = sources if sources is not None else default_sources()
+        self.directories = {}
+        self.by_name = {}
+        self.prefixes = {}
+        self.entries = []
+        self.loaded = False
+        self.stats = {"dirs_scanned": 0, "dirs_cached": 0}
+        self.lock = threading.Lock()
+        self.loader = None
+
+    def load_async(self):
+        """Load and refresh the catalogue in a background thread"""
+        self.loader = threading.Thread(target=self.ensure_loaded, daemon=True)
+        self.loader.start()
+        return self.loader
+
+    def ensure_loaded(self):
+        """Load the catalogue on first use"""
+        with self.lock:
+            if not self.loaded:
+                self._read_cache()
+                self._refresh()
+                self.loaded = True
+
+    def refresh(self):
+        """Rescan directories whose mtime changed and rebuild the lookup tables"""
+        with self.lock:
+            self._refresh()
+            self.loaded = True
+
+    def _read_cache(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CATALOGUE_VERSION:
+                self.directories = data.get("directories", {})
+        except Exception as e:
+            print(f"Error reading app catalogue cache: {e}")
+
+    def _write_cache(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOGUE_VERSION, "directories": self.directories}, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error writing app catalogue cache: {e}")
+
+    def _refresh(self):
+        changed = False
+        seen = set()
+        pending = list(self.sources)
+        while pending:
+            directory, kind = pending.pop()
+            if directory in seen:
+                continue
+            seen.add(directory)
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                changed = self.directories.pop(directory, None) is not None or changed
+                continue
+
+            cached = self.directories.get(directory)
+            if cached and cached.get("mtime") == mtime and cached.get("kind") == kind:
+                self.stats["dirs_cached"] += 1
+            else:
+                try:
+                    entries, subdirs = _scan_directory(directory, kind)
+                except OSError as e:
+                    print(f"Error scanning {directory}: {e}")
+                    continue
+                cached = {"mtime": mtime, "kind": kind, "entries": entries, "subdirs": subdirs}
+                self.directories[directory] = cached
+                self.stats["dirs_scanned"] += 1
+                changed = True
+            pending.extend((subdir, kind) for subdir in cached.get("subdirs", []))
+
+        # Forget directories that are no longer reachable from the sources
+        for directory in list(self.directories):
+            if directory not in seen:
+                del self.directories[directory]
+                changed = True
+
+        if changed:
+            self._write_cache()
+        self._build_index()
+
+    def _build_index(self):
+        entries = []
+        for cached in self.directories.values():
+            entries.extend(cached["entries"])
+        entries.sort(key=lambda entry: SOURCE_PRIORITY.get(entry["source"], 2))
+
+        by_name, prefixes = {}, {}
+        for entry in entries:
+            key = normalize_name(entry["name"])
+            if not key or is_destructive(entry):
+                continue
+            # Sorted by priority, so the first entry for a name wins
+            by_name.setdefault(key, entry)
+            if entry["source"] == "desktop":
+                # "firefox" should open the launcher, not the bare binary on PATH
+                by_name.setdefault(normalize_name(os.path.basename(entry["command"][0])), entry)
+            if entry["source"] not in FUZZY_SOURCES:
+                continue
+            for text in [entry["name"]] + entry.get("keywords", []):
+                for token in normalize_name(text).split():
+                    prefixes.setdefault(token[:3], []).append(entry)
+        self.entries, self.by_name, self.prefixes = entries, by_name, prefixes
+
+    def _score(self, query, entry):
+        name = normalize_name(entry["name"])
+        if name.startswith(query) or query in name.split():
+            # "code" -> "Visual Studio Code", "libre" -> "LibreOffice Writer"
+            score = 0.9
+        else:
+            score = difflib.SequenceMatcher(None, query, name).ratio()
+        for keyword in entry.get("keywords", []):
+            keyword = normalize_name(keyword)
+            if keyword == query:
+                score = max(score, 0.85)
+            elif keyword:
+                score = max(score, 0.9 * difflib.SequenceMatcher(None, query, keyword).ratio())
+        return score - 0.05 * SOURCE_PRIORITY.get(entry["source"], 2)
+
+    def find(self, name, min_score=0.7):
+        """Find the application that best matches a spoken name
+
+        Desktop and start-menu launchers are matched by keyword, prefix and
+        fuzzy score; bare PATH binaries only by their exact name. Commands on
+        the destructive-command denylist are never returned.
+
+        Args:
+            name (str): Application name, e.g. "firefox" or "text editor"
+            min_score (float): Minimum fuzzy match score (0-1)
+
+        Returns:
+            dict: Entry with name, command (argv list), keywords, source and path, or None
+        """
+        self.ensure_loaded()
+        query = normalize_name(name)
+        if not query:
+            return None
+        if query in self.by_name:
+            return self.by_name[query]
+        # Speech recognition often splits names: "fire fox", "libre office"
+        compact = query.replace(" ", "")
+        if compact in self.by_name and self.by_name[compact]["source"] in FUZZY_SOURCES:
+            return self.by_name[compact]
+
+        candidates = {}
+        for token in query.split():
+            for entry in self.prefixes.get(token[:3], ()):
+                candidates[id(entry)] = entry
+
+        best, best_score = None, min_score
+        for entry in candidates.values():
+            score = self._score(query, entry)
+            if score >= best_score:
+                best, best_score = entry, score
+        if best:
+            return best
+
+        # Misheard names may not share a prefix with anything; compare against every name
+        names = [key for key, entry in self.by_name.items() if entry["source"] in FUZZY_SOURCES]
+        close = difflib.get_close_matches(query, names, n=1, cutoff=min_score)
+        return self.by_name[close[0]] if close else None
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self.by_name)
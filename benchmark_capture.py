@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Screen capture benchmark
+
+Measures frames per second and MB of pixel memory allocated per frame
+for each available capture backend.
+
+Usage:
+    python benchmark_capture.py [--backend xshm|pil|fake] [--frames 100] [--region 0,0,800,600]
+"""
+
+import argparse
+import time
+import tracemalloc
+from screen_capture import CAPTURE_BACKENDS
+
+def benchmark_backend(backend, frames=100, region=None, to_image=False):
+    """Grab frames in a loop and measure throughput and allocations
+
+    Args:
+        backend (CaptureBackend): Backend to benchmark
+        frames (int): Number of frames to grab
+        region (tuple, optional): Region to capture (left, top, right, bottom)
+        to_image (bool): Also convert every frame to a PIL image
+
+    Returns:
+        dict: Benchmark results
+    """
+    # Warm up so one-time buffer setup isn't counted against every frame
+    backend.grab(region)
+    allocated_before = backend.bytes_allocated
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame = backend.grab(region)
+        if to_image:
+            frame.to_image()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend.name,
+        "frames": frames,
+        "size": frame.size,
+        "fps": frames / elapsed if elapsed > 0 else float("inf"),
+        "mb_per_frame": (backend.bytes_allocated - allocated_before) / frames / 1e6,
+        "traced_peak_mb": peak / 1e6,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen capture benchmark")
+    parser.add_argument("--backend", choices=sorted(CAPTURE_BACKENDS), action="append",
+                        help="Backend to benchmark (repeatable, default: all available)")
+    parser.add_argument("--frames", type=int, default=100, help="Frames to capture per backend")
+    parser.add_argument("--region", type=str, default=None, help="Region as left,top,right,bottom")
+    parser.add_argument("--to-image", action="store_true", help="Also convert each frame to a PIL image")
+    args = parser.parse_args()
+
+    region = tuple(int(v) for v in args.region.split(",")) if args.region else None
+
+    print("=" * 72)
+    print(f"{'backend':<8} {'size':>11} {'fps':>9} {'MB alloc/frame':>15} {'traced peak MB':>15}")
+    print("=" * 72)
+    for name in args.backend or sorted(CAPTURE_BACKENDS):
+        backend = CAPTURE_BACKENDS[name]()
+        if not backend.is_available():
+            print(f"{name:<8} not available")
+            continue
+        try:
+            result = benchmark_backend(backend, args.frames, region, args.to_image)
+            size = f"{result['size'][0]}x{result['size'][1]}"
+            print(f"{name:<8} {size:>11} {result['fps']:>9.1f} "
+                  f"{result['mb_per_frame']:>15.3f} {result['traced_peak_mb']:>15.3f}")
+        except Exception as e:
+            print(f"{name:<8} failed: {e}")
+        finally:
+            backend.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Gesture idle-mode benchmark
+
+Runs the gesture pipeline over a scripted scene where a hand comes and
+goes. It measures process CPU use, inferences run and wake-up latency
+(from the hand appearing to its first action) with the adaptive scheduler
+and with idle mode disabled.
+
+The camera and landmark model are simulated: frames cost capture time at
+the profile's frame rate, and inference burns CPU in proportion to the
+frame's pixels. On a real webcam, Hand_Gesture.py prints the same CPU and
+mode figures every few seconds.
+
+Usage:
+    python benchmark_gesture_idle.py [--duration 8] [--idle-after 1] [--idle-fps 2]
+"""
+
+import time
+import argparse
+import numpy as np
+from gesture_pipeline import GesturePipeline
+from gesture_scheduler import AdaptiveScheduler
+
+class _Results:
+    def __init__(self, hand):
+        self.multi_hand_landmarks = ["hand"] if hand else None
+
+def hand_windows(duration):
+    """Seconds during which a hand is in view: briefly at the start, then twice more"""
+    return [(0.0, 0.5), (duration * 0.4, duration * 0.5), (duration * 0.8, duration * 0.85)]
+
+def run(duration, scheduler, passes=4):
+    """Run the pipeline over the scripted scene
+
+    Args:
+        duration (float): Seconds to run
+        scheduler (AdaptiveScheduler): Scheduler to pace capture
+        passes (int): Simulated model cost, in passes over the frame's pixels
+
+    Returns:
+        dict: CPU use, inference count and wake-up latencies
+    """
+    windows = hand_windows(duration)
+    start = time.monotonic()
+    woken = {}
+
+    def hand_visible(now):
+        return any(begin <= now - start < end for begin, end in windows)
+
+    def read_frame():
+        profile = scheduler.profile
+        time.sleep(1.0 / profile.fps)
+        frame = np.zeros((profile.height, profile.width, 3), dtype=np.uint8)
+        return frame, hand_visible(time.monotonic())
+
+    def infer(item):
+        frame, visible = item
+        pixels = frame.astype(np.float32)
+        for _ in range(passes):
+            pixels = np.sqrt(pixels + 1.0)
+        return _Results(visible)
+
+    def actuate(packet):
+        if packet.result.multi_hand_landmarks:
+            now = time.monotonic() - start
+            for index, (begin, _) in enumerate(windows):
+                if index not in woken and now >= begin:
+                    woken[index] = now - begin
+
+    pipeline = GesturePipeline(read_frame, infer, actuate, report_interval=0, scheduler=scheduler)
+    cpu_start = time.process_time()
+    with pipeline:
+        time.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    # The hand is in view from the first frame, so the first window isn't a wake-up
+    wakes = [woken[index] for index in sorted(woken) if index > 0]
+    return {
+        "cpu_percent": cpu / duration * 100,
+        "inferences": pipeline.stats["inference"].count,
+        "max_wake_ms": max(wakes) * 1000 if wakes else None,
+        "mean_wake_ms": sum(wakes) / len(wakes) * 1000 if wakes else None,
+        "summary": scheduler.summary(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Gesture idle-mode benchmark")
+    parser.add_argument("--duration", type=float, default=8.0, help="Seconds per run")
+    parser.add_argument("--idle-after", type=float, default=1.0, help="Seconds without a hand before idling")
+    parser.add_argument("--idle-fps", type=float, default=2.0, help="Probe rate while idle")
+    parser.add_argument("--passes", type=int, default=4, help="Simulated model cost per frame")
+    args = parser.parse_args()
+
+    print(f"Hand in view during: {', '.join(f'{a:.1f}-{b:.1f}s' for a, b in hand_windows(args.duration))}")
+    print("=" * 72)
+    print(f"{'scheduler':<12} {'CPU %':>7} {'inferences':>11} {'max wake ms':>12} {'mean wake ms':>13}  idle s")
+    print("=" * 72)
+    for name, idle_after in (("always-on", 0), ("adaptive", args.idle_after)):
+        scheduler = AdaptiveScheduler(idle_after=idle_after, idle_fps=args.idle_fps)
+        result = run(args.duration, scheduler, args.passes)
+        max_wake = f"{result['max_wake_ms']:.0f}" if result["max_wake_ms"] is not None else "-"
+        mean_wake = f"{result['mean_wake_ms']:.0f}" if result["mean_wake_ms"] is not None else "-"
+        print(f"{name:<12} {result['cpu_percent']:>7.1f} {result['inferences']:>11} {max_wake:>12} "
+              f"{mean_wake:>13}  {result['summary']['seconds']['idle']:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Hand ROI tracking benchmark
+
+Compares hand-landmark inference on the full frame with inference on the
+tracked region: mean inference time per frame, how often tracking is lost,
+and how many frames with a hand go undetected.
+
+By default the camera and model are simulated: a square "hand" moves
+around a synthetic frame and the model's cost grows with the number of
+pixels it is given. With --live, frames come from the webcam (or --video)
+and both paths run MediaPipe Hands, which also reports how far the tracked
+landmarks are from the full-frame ones.
+
+Usage:
+    python benchmark_hand_roi.py [--frames 300] [--speed 6] [--ns-per-pixel 60]
+    python benchmark_hand_roi.py --live [--video clip.mp4] [--frames 300]
+"""
+
+import math
+import time
+import argparse
+import numpy as np
+from hand_roi import TrackedHandDetector
+
+HAND_SIZE = 60
+
+class _Landmark:
+    def __init__(self, x, y):
+        self.x, self.y, self.z = x, y, 0.0
+
+class _Hand:
+    def __init__(self, landmarks):
+        self.landmark = landmarks
+
+class _Results:
+    def __init__(self, hands):
+        self.multi_hand_landmarks = hands or None
+
+def simulated_model(ns_per_pixel):
+    """Fake landmark model: finds the bright square if it's wholly in view, at a per-pixel cost"""
+    def process(image):
+        height, width = image.shape[:2]
+        time.sleep(height * width * ns_per_pixel * 1e-9)
+        ys, xs = np.nonzero(image[:, :, 0])
+        if len(xs) < HAND_SIZE * HAND_SIZE * 0.9:
+            return _Results([])
+        x0, x1 = xs.min() / width, (xs.max() + 1) / width
+        y0, y1 = ys.min() / height, (ys.max() + 1) / height
+        points = [(x0, y0), (x1, y0), (x0, y1), (x1, y1), ((x0 + x1) / 2, (y0 + y1) / 2)]
+        return _Results([_Hand([_Landmark(x, y) for x, y in points])])
+    return process
+
+def simulated_frames(frames, speed, shape=(480, 640)):
+    """Yield frames of a hand moving on a Lissajous path, leaving the view now and then"""
+    height, width = shape
+    phase = 0.0
+    for i in range(frames):
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        # Hand leaves the view for 10 frames out of every 150
+        if i % 150 < 140:
+            phase += speed / 200.0
+            left = int((width - HAND_SIZE) * (0.5 + 0.45 * math.sin(phase)))
+            top = int((height - HAND_SIZE) * (0.5 + 0.45 * math.sin(phase * 1.3 + 1)))
+            frame[top:top + HAND_SIZE, left:left + HAND_SIZE] = 255
+        yield frame, i % 150 < 140
+
+def live_frames(frames, video=None):
+    import cv2
+    cap = cv2.VideoCapture(video if video else 0)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    try:
+        for _ in range(frames):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield cv2.flip(frame, 1), None
+    finally:
+        cap.release()
+
+def _reference_point(hand):
+    """Index fingertip for MediaPipe hands, the centre point for simulated ones"""
+    return hand.landmark[8] if len(hand.landmark) == 21 else hand.landmark[-1]
+
+def run(frames, full_process, tracked):
+    """Run both paths over the same frames
+
+    Returns:
+        dict: Full-frame and tracked results
+    """
+    full_time = 0.0
+    full_found = tracked_found = with_hand = agree = 0
+    distance = 0.0
+    for frame, hand_visible in frames:
+        start = time.perf_counter()
+        full = full_process(frame)
+        full_time += time.perf_counter() - start
+        result = tracked(frame)
+
+        if hand_visible is None:
+            # Live frames: the full-frame result is the reference
+            hand_visible = bool(full.multi_hand_landmarks)
+        with_hand += hand_visible
+        full_found += bool(full.multi_hand_landmarks)
+        tracked_found += bool(result.multi_hand_landmarks)
+        if full.multi_hand_landmarks and result.multi_hand_landmarks:
+            a = _reference_point(full.multi_hand_landmarks[0])
+            b = _reference_point(result.multi_hand_landmarks[0])
+            distance += math.hypot((a.x - b.x) * frame.shape[1], (a.y - b.y) * frame.shape[0])
+            agree += 1
+
+    summary = tracked.summary()
+    count = max(summary["frames"], 1)
+    return {
+        "frames": summary["frames"],
+        "full_ms": full_time / count * 1000,
+        "tracked_ms": summary["ms_per_frame"],
+        "roi_ms": summary["roi_ms"],
+        "roi_area": summary["roi_area"],
+        "roi_share": summary["roi_inferences"] / count,
+        "loss_rate": summary["loss_rate"],
+        "full_missed": with_hand - full_found,
+        "tracked_missed": with_hand - tracked_found,
+        "landmark_px": distance / agree if agree else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand ROI tracking benchmark")
+    parser.add_argument("--live", action="store_true", help="Use the webcam and MediaPipe instead of simulation")
+    parser.add_argument("--video", type=str, default=None, help="Video file to read instead of the webcam (with --live)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to process")
+    parser.add_argument("--speed", type=float, default=6.0, help="Simulated hand speed")
+    parser.add_argument("--ns-per-pixel", type=float, default=60.0, help="Simulated model cost per pixel")
+    parser.add_argument("--padding", type=float, default=0.3, help="ROI padding as a fraction of the hand size")
+    args = parser.parse_args()
+
+    if args.live:
+        import cv2
+        import mediapipe as mp
+        options = dict(static_image_mode=False, max_num_hands=1,
+                       min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        # One instance per path, set up as Hand_Gesture.py does for tracking
+        full_hands = mp.solutions.hands.Hands(**options)
+        roi_hands = mp.solutions.hands.Hands(**options)
+        retry_hands = mp.solutions.hands.Hands(**options)
+        full_process = lambda image: full_hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        roi_process = lambda image: roi_hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        retry_process = lambda image: retry_hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        frames = live_frames(args.frames, args.video)
+        print("Hold a hand in front of the camera and move it around...")
+    else:
+        full_process = roi_process = retry_process = simulated_model(args.ns_per_pixel)
+        frames = simulated_frames(args.frames, args.speed)
+
+    tracked = TrackedHandDetector(roi_process, full_process=retry_process)
+    tracked.tracker.padding = args.padding
+    result = run(frames, full_process, tracked)
+
+    print("=" * 60)
+    print(f"Frames:                   {result['frames']}")
+    print(f"Full-frame inference:     {result['full_ms']:.2f} ms/frame")
+    print(f"Tracked inference:        {result['tracked_ms']:.2f} ms/frame "
+          f"({result['roi_ms']:.2f} ms per ROI inference)")
+    if result["roi_area"] is not None:
+        print(f"Mean ROI area:            {result['roi_area'] * 100:.1f}% of the frame")
+    print(f"Frames inferred on ROI:   {result['roi_share'] * 100:.1f}%")
+    print(f"Tracking-loss rate:       {result['loss_rate'] * 100:.2f}% of ROI inferences")
+    print(f"Hand frames missed:       full {result['full_missed']}, tracked {result['tracked_missed']}")
+    print(f"Landmark disagreement:    {result['landmark_px']:.1f} px")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+LLM client benchmark
+
+Fires concurrent requests at the local Gemini stub server with simulated
+latency and errors, and reports latency percentiles and success rate.
+
+Usage:
+    python benchmark_llm_client.py [--requests 50] [--workers 8] [--latency 0.1] [--error-rate 0.2]
+"""
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from llm_client import LLMClient
+from llm_stub_server import LLMStubServer
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM client benchmark")
+    parser.add_argument("--requests", type=int, default=50, help="Total requests")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated server latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Simulated 503 rate (0-1)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Per-call deadline (s)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client connection limit")
+    args = parser.parse_args()
+
+    with LLMStubServer(latency=args.latency, error_rate=args.error_rate) as server:
+        client = LLMClient(base_url=server.base_url, timeout=args.timeout, backoff=0.05,
+                           max_concurrency=args.concurrency, breaker_threshold=args.requests)
+
+        def one_call(_):
+            start = time.perf_counter()
+            try:
+                client.generate_content("Explain this code")
+                return True, time.perf_counter() - start
+            except Exception:
+                return False, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(one_call, range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = [latency for ok, latency in results if ok]
+    print("=" * 60)
+    print(f"Requests: {args.requests}  workers: {args.workers}  latency: {args.latency}s  error rate: {args.error_rate}")
+    print("=" * 60)
+    print(f"Succeeded:   {len(latencies)}/{args.requests}")
+    print(f"Throughput:  {args.requests / elapsed:.1f} calls/s")
+    print(f"Latency p50: {percentile(latencies, 0.5) * 1000:.0f} ms")
+    print(f"Latency p95: {percentile(latencies, 0.95) * 1000:.0f} ms")
+    print(f"HTTP requests sent: {client.stats['requests']}  retries: {client.stats['retries']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Typing throughput benchmark
+
+Measures characters per second for key events, clipboard paste and the
+adaptive choice between them, over texts of different lengths.
+
+By default the input path is simulated with fixed per-key and per-paste
+costs. With --live the text is really typed, so focus an empty text editor
+during the countdown.
+
+Usage:
+    python benchmark_typing.py [--key-latency 0.004] [--paste-latency 0.03]
+    python benchmark_typing.py --live
+"""
+
+import time
+import argparse
+from text_injection import TextInjector
+
+LENGTHS = [5, 20, 80, 400]
+
+def simulated_injector(key_latency, paste_latency):
+    clipboard = {"text": ""}
+
+    def write(text):
+        time.sleep(key_latency * len(text))
+
+    def hotkey(*keys):
+        time.sleep(paste_latency)
+
+    def copy(text):
+        clipboard["text"] = text
+
+    return TextInjector(write=write, hotkey=hotkey, copy=copy, paste=lambda: clipboard["text"])
+
+def sample_text(length):
+    words = "the quick brown fox jumps over the lazy dog "
+    return (words * (length // len(words) + 1))[:length]
+
+def main():
+    parser = argparse.ArgumentParser(description="Typing throughput benchmark")
+    parser.add_argument("--live", action="store_true", help="Type into the focused window for real")
+    parser.add_argument("--key-latency", type=float, default=0.004, help="Simulated seconds per key event")
+    parser.add_argument("--paste-latency", type=float, default=0.03, help="Simulated seconds per paste")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per length and strategy")
+    args = parser.parse_args()
+
+    if args.live:
+        injector = TextInjector()
+        print("Focus an empty text editor; typing starts in 3 seconds...")
+        time.sleep(3)
+    else:
+        injector = simulated_injector(args.key_latency, args.paste_latency)
+
+    print("=" * 60)
+    print(f"{'chars':>6} {'keys cps':>10} {'paste cps':>10} {'auto cps':>10}  auto choice")
+    print("=" * 60)
+    for length in LENGTHS:
+        text = sample_text(length)
+        results = {}
+        for strategy in ("keys", "paste", None):
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                used = injector.type(text, strategy=strategy)
+            results[strategy or "auto"] = (length * args.repeats / (time.perf_counter() - start), used)
+        print(f"{length:>6} {results['keys'][0]:>10.0f} {results['paste'][0]:>10.0f} "
+              f"{results['auto'][0]:>10.0f}  {results['auto'][1]}")
+    injector.flush()
+    print(f"\nLearned estimates: {injector.keys_per_second:.0f} keys/s, "
+          f"{injector.paste_overhead * 1000:.0f} ms per paste")
+
+if __name__ == "__main__":
+    main()
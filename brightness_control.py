@@ -0,0 +1,280 @@
+import os
+import time
+import threading
+
+BACKLIGHT_ROOT = "/sys/class/backlight"
+
+# Kernel guidance: firmware interfaces are preferred over platform drivers over raw registers
+BACKLIGHT_TYPE_ORDER = {"firmware": 0, "platform": 1, "raw": 2}
+
+
+def _read_int(path):
+    with open(path, "r") as f:
+        return int(f.read().strip())
+
+
+class SysfsBacklightDriver:
+    """Backlight under /sys/class/backlight, written through a file descriptor kept open
+
+    max_brightness is read once when the device is discovered. Every write
+    goes to the hardware: something else (a hotkey, the desktop's power
+    manager) may have changed the level since our last one.
+    """
+
+    name = "sysfs"
+
+    def __init__(self, path):
+        """Initialize backlight driver
+
+        Args:
+            path (str): Device directory, e.g. /sys/class/backlight/intel_backlight
+        """
+        self.path = path
+        self.device = os.path.basename(path)
+        self.max_brightness = _read_int(os.path.join(path, "max_brightness"))
+        try:
+            with open(os.path.join(path, "type"), "r") as f:
+                self.type = f.read().strip()
+        except OSError:
+            self.type = "raw"
+        self.fd = None
+        self.last_raw = None
+
+    def is_writable(self):
+        return os.access(os.path.join(self.path, "brightness"), os.W_OK)
+
+    def read(self):
+        """Current brightness in percent"""
+        raw = _read_int(os.path.join(self.path, "brightness"))
+        self.last_raw = raw
+        return raw * 100.0 / self.max_brightness
+
+    def write(self, level):
+        """Set brightness in percent"""
+        raw = round(level * self.max_brightness / 100.0)
+        if self.fd is None:
+            self.fd = os.open(os.path.join(self.path, "brightness"), os.O_WRONLY)
+        os.pwrite(self.fd, f"{raw}\n".encode(), 0)
+        self.last_raw = raw
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class SBCBrightnessDriver:
+    """Windows/macOS displays through the screen_brightness_control package"""
+
+    name = "sbc"
+
+    def __init__(self):
+        import screen_brightness_control
+        self.sbc = screen_brightness_control
+
+    def read(self):
+        level = self.sbc.get_brightness()
+        return float(level[0] if isinstance(level, list) else level)
+
+    def write(self, level):
+        self.sbc.set_brightness(int(round(level)))
+
+    def close(self):
+        pass
+
+
+class FakeBrightnessDriver:
+    """In-memory backlight for tests, recording every write"""
+
+    name = "fake"
+
+    def __init__(self, level=50.0, write_time=0.0):
+        self.level = float(level)
+        self.write_time = write_time
+        self.reads = 0
+        self.writes = []
+
+    def read(self):
+        self.reads += 1
+        return self.level
+
+    def write(self, level):
+        time.sleep(self.write_time)
+        self.writes.append(level)
+        self.level = level
+
+    def close(self):
+        pass
+
+
+def discover_backlights(root=BACKLIGHT_ROOT):
+    """Find backlight devices, preferred first
+
+    Args:
+        root (str): Directory containing one entry per backlight
+
+    Returns:
+        list: SysfsBacklightDriver for each readable device
+    """
+    devices = []
+    try:
+        entries = sorted(os.listdir(root))
+    except OSError:
+        return devices
+    for entry in entries:
+        try:
+            devices.append(SysfsBacklightDriver(os.path.join(root, entry)))
+        except (OSError, ValueError) as e:
+            print(f"Skipping backlight {entry}: {e}")
+    devices.sort(key=lambda device: BACKLIGHT_TYPE_ORDER.get(device.type, 3))
+    return devices
+
+
+class BrightnessService:
+    """Screen brightness with an in-memory mirror and a background writer
+
+    set_brightness() only records the target and returns; a worker thread
+    writes it to the driver at most once per min_interval, easing towards
+    the target when smoothing is requested. get_brightness() returns the
+    mirror, so callers in a frame loop never wait on the hardware; like
+    VolumeBackend's cache, the mirror is re-read once it is older than
+    cache_ttl, so changes made outside the agent are picked up. Every
+    set_brightness() call is written, even if it matches the mirror.
+    """
+
+    def __init__(self, driver, min_interval=0.05, smoothing=0.5, cache_ttl=2.0):
+        """Initialize brightness service
+
+        Args:
+            driver (object): Driver with read(), write(level) and close(), levels in percent
+            min_interval (float): Minimum seconds between hardware writes
+            smoothing (float): Fraction of the remaining distance covered per smoothed write (0-1)
+            cache_ttl (float): Seconds a read or written level is trusted before re-reading
+        """
+        self.driver = driver
+        self.min_interval = min_interval
+        self.smoothing = smoothing
+        self.cache_ttl = cache_ttl
+        self.condition = threading.Condition()
+        self.level = float(driver.read())
+        self.applied = self.level
+        self.read_at = time.monotonic()
+        # A set_brightness() target the worker hasn't picked up yet
+        self.pending = False
+        self.smooth = False
+        self.last_write = 0.0
+        self.worker = None
+        self.closed = False
+
+    def get_brightness(self):
+        """Brightness in percent, from the mirror unless it has gone stale"""
+        with self.condition:
+            idle = not self.pending and self.applied == self.level
+            if idle and time.monotonic() - self.read_at >= self.cache_ttl:
+                try:
+                    self.level = self.applied = float(self.driver.read())
+                except Exception as e:
+                    print(f"Brightness read failed: {e}")
+                self.read_at = time.monotonic()
+            return self.level
+
+    def set_brightness(self, level, smooth=False):
+        """Set the target brightness without waiting for the hardware
+
+        Args:
+            level (float): Brightness percentage, clamped to 0-100
+            smooth (bool): Ease towards the level over several writes
+
+        Returns:
+            float: Target level
+        """
+        level = max(0.0, min(100.0, float(level)))
+        with self.condition:
+            self.level = level
+            self.smooth = smooth
+            self.pending = True
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+            self.condition.notify()
+        return level
+
+    def adjust(self, delta, smooth=False):
+        """Change the target brightness relative to the mirror"""
+        return self.set_brightness(self.get_brightness() + delta, smooth)
+
+    def wait(self, timeout=1.0):
+        """Block until the hardware has reached the target
+
+        Returns:
+            bool: True if it did before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.pending or self.applied != self.level:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and self.applied == self.level and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                target, smooth = self.level, self.smooth
+                self.pending = False
+
+            # Rate limit: later targets replace earlier ones while we wait
+            delay = self.last_write + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                with self.condition:
+                    target, smooth = self.level, self.smooth
+                    self.pending = False
+
+            step = target
+            if smooth:
+                step = self.applied + (target - self.applied) * self.smoothing
+                if abs(target - step) < 1.0:
+                    step = target
+            try:
+                self.driver.write(step)
+            except Exception as e:
+                print(f"Brightness write failed: {e}")
+                step = target
+            self.last_write = time.monotonic()
+            with self.condition:
+                self.applied = step
+                self.read_at = self.last_write
+                self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.driver.close()
+
+
+def get_brightness_service(root=BACKLIGHT_ROOT):
+    """Create a brightness service for the first usable display
+
+    Args:
+        root (str): Backlight directory to search on Linux
+
+    Returns:
+        BrightnessService: Brightness service, or None if brightness can't be controlled
+    """
+    for device in discover_backlights(root):
+        if device.is_writable():
+            print(f"Brightness device: {device.device} (max {device.max_brightness})")
+            return BrightnessService(device)
+        print(f"Backlight {device.device} is not writable; add a udev rule or join the video group")
+    try:
+        return BrightnessService(SBCBrightnessDriver())
+    except Exception as e:
+        print(f"Brightness control not available: {e}")
+        return None
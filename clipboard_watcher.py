@@ -0,0 +1,113 @@
+import sys
+import time
+
+
+def _windows_sequence_source():
+    """Clipboard sequence number on Windows (increments on every change)"""
+    try:
+        import ctypes
+        get_sequence = ctypes.windll.user32.GetClipboardSequenceNumber
+        get_sequence.restype = ctypes.c_uint
+        get_sequence()
+        return get_sequence
+    except Exception as e:
+        print(f"Clipboard sequence number not available: {e}")
+        return None
+
+
+def _macos_sequence_source():
+    """NSPasteboard changeCount on macOS (needs pyobjc)"""
+    try:
+        from AppKit import NSPasteboard
+        pasteboard = NSPasteboard.generalPasteboard()
+        return lambda: pasteboard.changeCount()
+    except Exception as e:
+        print(f"Pasteboard change count not available: {e}")
+        return None
+
+
+def detect_sequence_source():
+    """Get a cheap function returning a clipboard change counter, if the OS has one
+
+    Returns:
+        callable: Function returning the current sequence number, or None
+    """
+    if sys.platform == "win32":
+        return _windows_sequence_source()
+    if sys.platform == "darwin":
+        return _macos_sequence_source()
+    # X11/Wayland have no cheap counter without an event loop; fall back to polling content
+    return None
+
+
+class ClipboardWatcher:
+    def __init__(self, paste=None, sequence_source="auto", min_interval=0.002, max_interval=0.05):
+        """Initialize clipboard watcher
+
+        Args:
+            paste (callable, optional): Function returning clipboard text, default pyperclip.paste
+            sequence_source (callable, optional): Function returning a change counter,
+                "auto" to detect one, or None to always compare content
+            min_interval (float): First polling interval in seconds
+            max_interval (float): Longest polling interval in seconds
+        """
+        if paste is None:
+            import pyperclip
+            paste = pyperclip.paste
+        self.paste = paste
+        self.sequence_source = detect_sequence_source() if sequence_source == "auto" else sequence_source
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+    def token(self):
+        """Get a marker for the current clipboard state
+
+        Returns:
+            object: Sequence number, or the clipboard text when no counter is available
+        """
+        if self.sequence_source is not None:
+            return self.sequence_source()
+        return self.paste()
+
+    def wait_for_change(self, token, timeout=1.0):
+        """Wait until the clipboard differs from the state captured by token()
+
+        Polls with exponential backoff from min_interval to max_interval, so
+        fast apps return within a few milliseconds and slow ones still get
+        until the deadline.
+
+        Args:
+            token (object): Value returned by token() before the copy was triggered
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            tuple: (changed, text) where text is the current clipboard content
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.min_interval
+        while True:
+            current = self.token()
+            if current != token:
+                text = current if self.sequence_source is None else self.paste()
+                return True, text
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, current if self.sequence_source is None else self.paste()
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_interval)
+
+    def copy_and_wait(self, trigger_copy, timeout=1.0):
+        """Trigger a copy and return the new clipboard text as soon as it lands
+
+        Args:
+            trigger_copy (callable): Function that sends the copy shortcut
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            tuple: (changed, text)
+        """
+        token = self.token()
+        trigger_copy()
+        return self.wait_for_change(token, timeout)
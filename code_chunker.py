@@ -0,0 +1,99 @@
+import re
+import ast
+
+# Lines that start a new top-level definition in common languages
+DEFINITION_START = re.compile(
+    r"^(?:@|def |async def |class |function |export |public |private |protected |static |"
+    r"fn |func |impl |struct |interface |enum |type |const |let |var |module |package )"
+)
+
+
+def _python_units(code):
+    """Split Python code into top-level statements, keeping decorators and comments attached
+
+    Returns:
+        list: Source strings, or None if the code doesn't parse as Python
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    if not tree.body:
+        return None
+
+    lines = code.splitlines(keepends=True)
+    starts = []
+    for node in tree.body:
+        start = node.lineno
+        for decorator in getattr(node, "decorator_list", []):
+            start = min(start, decorator.lineno)
+        starts.append(start - 1)
+    starts[0] = 0
+
+    units = []
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(lines)
+        units.append("".join(lines[start:end]))
+    return units
+
+
+def _generic_units(code):
+    """Split code at unindented definition lines (for languages other than Python)"""
+    units = []
+    current = []
+    for line in code.splitlines(keepends=True):
+        if current and DEFINITION_START.match(line) and not DEFINITION_START.match(current[-1]):
+            units.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        units.append("".join(current))
+    return units
+
+
+def _split_long_unit(unit, max_chars):
+    """Split a single definition that is larger than a chunk on line boundaries"""
+    pieces = []
+    current = ""
+    for line in unit.splitlines(keepends=True):
+        if current and len(current) + len(line) > max_chars:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_code(code, max_chars=6000):
+    """Split code into chunks along function/class boundaries
+
+    Consecutive definitions are packed together until a chunk would exceed
+    max_chars. A single definition larger than max_chars is split by lines.
+
+    Args:
+        code (str): Source code
+        max_chars (int): Target maximum chunk size in characters
+
+    Returns:
+        list: Code chunks, in order
+    """
+    units = _python_units(code) or _generic_units(code)
+
+    chunks = []
+    current = ""
+    for unit in units:
+        if len(unit) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_long_unit(unit, max_chars))
+        elif current and len(current) + len(unit) > max_chars:
+            chunks.append(current)
+            current = unit
+        else:
+            current += unit
+    if current:
+        chunks.append(current)
+
+    return [chunk for chunk in chunks if chunk.strip()]
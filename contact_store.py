@@ -0,0 +1,318 @@
+import os
+import re
+import csv
+import sqlite3
+import difflib
+import argparse
+import threading
+
+DEFAULT_CONTACTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "contacts.sqlite")
+
+# Longest contact name (in words) tried when splitting "message <name> <text>"
+MAX_NAME_WORDS = 4
+
+# Spelling rewrites applied before building a phonetic key, in order
+PHONETIC_RULES = [
+    (r"ph", "f"), (r"ck", "k"), (r"gh", ""), (r"^kn", "n"), (r"^wr", "r"),
+    (r"c(?=[eiy])", "s"), (r"c", "k"), (r"q", "k"), (r"x", "ks"), (r"z", "s"),
+    (r"dg", "j"), (r"v", "f"),
+]
+
+
+def normalize_name(name):
+    """Lowercase a name and collapse punctuation and whitespace"""
+    return " ".join(re.sub(r"[^\w]+", " ", name.lower()).split())
+
+
+def phonetic_key(word):
+    """Rough sound-alike key, so "Jon"/"John" and "Kathryn"/"Catherine" match
+
+    Args:
+        word (str): Single word
+
+    Returns:
+        str: Consonant skeleton with a leading vowel marker
+    """
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    for pattern, replacement in PHONETIC_RULES:
+        word = re.sub(pattern, replacement, word)
+    if not word:
+        return ""
+    first = "A" if word[0] in "aeiou" else word[0].upper()
+    rest = re.sub(r"[aeiouhwy]", "", word[1:])
+    return first + re.sub(r"(.)\1+", r"\1", rest).upper()
+
+
+def normalize_phone(phone, default_country_code=None):
+    """Convert a phone number to international digits, as WhatsApp links expect
+
+    Args:
+        phone (str): Number as written, e.g. "+44 7700 900123" or "07700 900123"
+        default_country_code (str, optional): Code added to national numbers (leading 0)
+
+    Returns:
+        str: Digits without "+", or "" if there aren't enough digits
+    """
+    phone = phone.strip()
+    digits = re.sub(r"\D", "", phone)
+    if phone.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif default_country_code and digits.startswith("0"):
+        digits = default_country_code.lstrip("+") + digits[1:]
+    return digits if len(digits) >= 7 else ""
+
+
+class Contact:
+    """A named contact and the phone number messages go to"""
+
+    def __init__(self, name, phone, source="manual", score=1.0):
+        self.name = name
+        self.phone = phone
+        self.source = source
+        self.score = score
+        self.key = normalize_name(name)
+
+    def __repr__(self):
+        return f"Contact({self.name!r}, {self.phone!r}, score={self.score:.2f})"
+
+
+def _read_vcards(path):
+    """Yield (name, [phones]) for each card in a .vcf file"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        # Folded lines continue with a leading space or tab
+        text = re.sub(r"\r?\n[ \t]", "", f.read())
+
+    name, phones = None, []
+    for line in text.splitlines():
+        field, _, value = line.partition(":")
+        field = field.split(";")[0].upper()
+        # Grouped properties look like "item1.TEL"
+        field = field.rsplit(".", 1)[-1]
+        if field == "BEGIN":
+            name, phones = None, []
+        elif field == "FN":
+            name = value.replace("\\,", ",").strip()
+        elif field == "N" and not name:
+            parts = value.split(";")
+            name = " ".join(part for part in (parts[1:2] + parts[:1]) if part).strip()
+        elif field == "TEL":
+            # Mobile numbers first; WhatsApp lives on phones
+            if "CELL" in line.partition(":")[0].upper():
+                phones.insert(0, value.strip())
+            else:
+                phones.append(value.strip())
+        elif field == "END" and name and phones:
+            yield name, phones
+
+
+def _read_csv_contacts(path):
+    """Yield (name, [phones]) from Google, Outlook or simple name/phone CSV exports"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+            name = row.get("name") or row.get("full name") or row.get("display name")
+            if not name:
+                name = " ".join(part for part in (row.get("first name") or row.get("given name"),
+                                                  row.get("last name") or row.get("family name")) if part)
+            phones = [(key, value) for key, value in row.items()
+                      if value and ("phone" in key or "mobile" in key or key == "number")
+                      and "type" not in key and "label" not in key]
+            phones = [value for key, value in sorted(phones, key=lambda item: "mobile" not in item[0])]
+            # Google packs several numbers into one cell separated by " ::: "
+            phones = [number for value in phones for number in value.split(":::")]
+            if name and phones:
+                yield name, phones
+
+
+class ContactStore:
+    """SQLite-backed contact directory with fuzzy and phonetic name lookup
+
+    Names are indexed in memory by full name, by word and by the phonetic
+    key of each word, so resolving a spoken name only scores contacts that
+    share a word or a sound with it.
+    """
+
+    def __init__(self, path=DEFAULT_CONTACTS_PATH, default_country_code=None):
+        """Initialize contact store
+
+        Args:
+            path (str, optional): SQLite file, or None for an in-memory store
+            default_country_code (str, optional): Country code for national numbers,
+                default WHATSAPP_COUNTRY_CODE
+        """
+        self.default_country_code = default_country_code or os.getenv("WHATSAPP_COUNTRY_CODE")
+        self.lock = threading.Lock()
+        self.contacts = []
+        self.by_name = {}
+        self.by_word = {}
+        self.by_sound = {}
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS contacts ("
+            "name TEXT, phone TEXT, source TEXT, PRIMARY KEY (name, phone))"
+        )
+        self.db.commit()
+        self._load()
+
+    def _load(self):
+        rows = self.db.execute("SELECT name, phone, source FROM contacts").fetchall()
+        for name, phone, source in rows:
+            self._index(Contact(name, phone, source))
+
+    def _index(self, contact):
+        self.contacts.append(contact)
+        # First contact with a name wins, so duplicates from several imports resolve consistently
+        self.by_name.setdefault(contact.key, contact)
+        for word in contact.key.split():
+            self.by_word.setdefault(word, []).append(contact)
+            self.by_sound.setdefault(phonetic_key(word), []).append(contact)
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def add(self, name, phone, source="manual"):
+        """Add a contact
+
+        Args:
+            name (str): Contact name
+            phone (str): Phone number in any common format
+            source (str): Where the contact came from
+
+        Returns:
+            Contact: Added contact, or None if the number or name isn't usable
+        """
+        number = normalize_phone(phone, self.default_country_code)
+        if not number or not normalize_name(name):
+            return None
+        with self.lock:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO contacts (name, phone, source) VALUES (?, ?, ?)",
+                (name.strip(), number, source)
+            )
+            self.db.commit()
+            if cursor.rowcount == 0:
+                return self.by_name.get(normalize_name(name))
+            contact = Contact(name.strip(), number, source)
+            self._index(contact)
+            return contact
+
+    def import_file(self, path):
+        """Import contacts from a .vcf or .csv export
+
+        Args:
+            path (str): Path to the file
+
+        Returns:
+            int: Number of contacts added
+        """
+        reader = _read_vcards if path.lower().endswith((".vcf", ".vcard")) else _read_csv_contacts
+        source = os.path.basename(path)
+        added = 0
+        for name, phones in reader(path):
+            # Readers list mobile numbers first, so keep the first usable one
+            for phone in phones:
+                if self.add(name, phone, source):
+                    added += 1
+                    break
+        print(f"Imported {added} contacts from {path}")
+        return added
+
+    def _score(self, query, contact):
+        score = difflib.SequenceMatcher(None, query, contact.key).ratio()
+        query_words = query.split()
+        name_words = contact.key.split()
+        if len(query_words) <= len(name_words):
+            # "john" against "john smith": compare with the same number of words
+            prefix = " ".join(name_words[:len(query_words)])
+            score = max(score, 0.95 * difflib.SequenceMatcher(None, query, prefix).ratio())
+            sounds = [phonetic_key(word) for word in query_words]
+            if sounds == [phonetic_key(word) for word in name_words[:len(query_words)]]:
+                score = max(score, 0.9)
+        return score
+
+    def resolve(self, spoken, min_score=0.75):
+        """Find the contact a spoken name refers to
+
+        Args:
+            spoken (str): Name as recognised, e.g. "jon smith" or "catherine"
+            min_score (float): Minimum match score (0-1)
+
+        Returns:
+            Contact: Best match with its score, or None
+        """
+        query = normalize_name(spoken)
+        if not query:
+            return None
+        exact = self.by_name.get(query)
+        if exact:
+            return Contact(exact.name, exact.phone, exact.source, 1.0)
+
+        candidates = {}
+        for word in query.split():
+            for contact in self.by_word.get(word, []) + self.by_sound.get(phonetic_key(word), []):
+                candidates[id(contact)] = contact
+        if not candidates:
+            # Misrecognised words may share neither spelling nor sound; check everyone
+            candidates = {id(contact): contact for contact in self.contacts}
+
+        best, best_score = None, min_score
+        for contact in candidates.values():
+            score = self._score(query, contact)
+            if score > best_score or (best is None and score >= best_score):
+                best, best_score = contact, score
+        if best is None:
+            return None
+        return Contact(best.name, best.phone, best.source, best_score)
+
+    def split_name(self, text, min_score=0.85):
+        """Split "<contact name> <message>" where the name may be several words
+
+        Args:
+            text (str): Command text after "message"/"text"
+            min_score (float): Minimum match score for a name
+
+        Returns:
+            tuple: (Contact, remaining text), or (None, text) if no prefix is a known contact
+        """
+        words = text.split()
+        best = (None, text)
+        for count in range(min(MAX_NAME_WORDS, len(words) - 1), 0, -1):
+            contact = self.resolve(" ".join(words[:count]), min_score=min_score)
+            # Longer names win unless a shorter prefix is a clearly better match
+            if contact and (best[0] is None or contact.score > best[0].score + 0.1):
+                best = (contact, " ".join(words[count:]))
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage GRACE's WhatsApp contacts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Import a .vcf or .csv contacts export")
+    import_parser.add_argument("files", nargs="+")
+    add_parser = subparsers.add_parser("add", help="Add a single contact")
+    add_parser.add_argument("name")
+    add_parser.add_argument("phone")
+    find_parser = subparsers.add_parser("find", help="Resolve a spoken name")
+    find_parser.add_argument("name")
+    args = parser.parse_args()
+
+    store = ContactStore()
+    if args.command == "import":
+        for path in args.files:
+            store.import_file(path)
+    elif args.command == "add":
+        print(store.add(args.name, args.phone))
+    elif args.command == "find":
+        print(store.resolve(args.name))
+    print(f"{len(store)} contacts stored")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import json
+import requests
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class GeminiRestResponse:
+    """Response or stream chunk with the same .text attribute as the SDK's"""
+
+    def __init__(self, text, raw=None):
+        self.text = text
+        self.raw = raw
+
+
+def _extract_text(payload):
+    """Pull the generated text out of a generateContent JSON payload"""
+    parts = []
+    for candidate in payload.get("candidates", []):
+        for part in candidate.get("content", {}).get("parts", []):
+            parts.append(part.get("text", ""))
+    return "".join(parts)
+
+
+class GeminiRestModel:
+    """Minimal Gemini REST client compatible with GenerativeModel.generate_content
+
+    Talking to the REST API directly lets the base URL point at a local stub
+    server (see llm_stub_server.py) for tests and benchmarks.
+    """
+
+    def __init__(self, model_name="gemini-pro", api_key=None, base_url=DEFAULT_BASE_URL, session=None):
+        """Initialize REST model
+
+        Args:
+            model_name (str): Gemini model name
+            api_key (str, optional): Gemini API key
+            base_url (str): API base URL
+            session (requests.Session, optional): HTTP session to reuse
+        """
+        self.model_name = model_name
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+
+    def _url(self, method):
+        return f"{self.base_url}/models/{self.model_name}:{method}"
+
+    def generate_content(self, prompt, stream=False, timeout=None):
+        """Generate a response for a prompt
+
+        Args:
+            prompt (str): Prompt text
+            stream (bool): Yield chunks as they arrive instead of waiting for the whole response
+            timeout (float or tuple, optional): requests timeout (connect, read)
+
+        Returns:
+            GeminiRestResponse, or an iterator of them when streaming
+        """
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        params = {"key": self.api_key} if self.api_key else {}
+
+        if stream:
+            return self._stream(body, params, timeout)
+
+        response = self.session.post(self._url("generateContent"), params=params, json=body, timeout=timeout)
+        response.raise_for_status()
+        payload = response.json()
+        return GeminiRestResponse(_extract_text(payload), payload)
+
+    def _stream(self, body, params, timeout=None):
+        params = dict(params, alt="sse")
+        with self.session.post(self._url("streamGenerateContent"), params=params, json=body,
+                               stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                # Server-sent events: each chunk is a "data: {json}" line
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = json.loads(line[len("data:"):].strip())
+                text = _extract_text(payload)
+                if text:
+                    yield GeminiRestResponse(text, payload)
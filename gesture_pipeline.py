@@ -0,0 +1,280 @@
+import time
+import threading
+from collections import deque
+
+
+class DropQueue:
+    """Bounded hand-off between pipeline stages that discards the oldest item when full
+
+    A slow consumer always gets the freshest data instead of working through
+    a backlog of stale frames.
+    """
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self.items = deque()
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item):
+        with self.condition:
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """Take the oldest item
+
+        Returns:
+            object: Item, or None on timeout or once closed
+        """
+        with self.condition:
+            if not self.items and not self.closed:
+                self.condition.wait(timeout)
+            return self.items.popleft() if self.items else None
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class StageStats:
+    """Rate and latency of one pipeline stage over a sliding window"""
+
+    def __init__(self, name, window=2.0):
+        """Initialize stage statistics
+
+        Args:
+            name (str): Stage name used in reports
+            window (float): Seconds of history the rate and latency cover
+        """
+        self.name = name
+        self.window = window
+        self.samples = deque()
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def record(self, latency=0.0, now=None):
+        """Record one processed item
+
+        Args:
+            latency (float): Seconds the item spent in (or up to) this stage
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.samples.append((now, latency))
+            self.count += 1
+            while self.samples and now - self.samples[0][0] > self.window:
+                self.samples.popleft()
+
+    def fps(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            recent = [t for t, _ in self.samples if now - t <= self.window]
+        if len(recent) < 2:
+            return 0.0
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-6)
+
+    def latency(self):
+        """Mean latency in seconds over the window"""
+        with self.lock:
+            if not self.samples:
+                return 0.0
+            return sum(latency for _, latency in self.samples) / len(self.samples)
+
+
+class FramePacket:
+    """A camera frame and what each stage made of it"""
+
+    def __init__(self, seq, frame, captured_at):
+        self.seq = seq
+        self.frame = frame
+        self.captured_at = captured_at
+        self.result = None
+        self.gestures = []
+        self.inferred_at = None
+        self.actuated_at = None
+
+
+class GesturePipeline:
+    """Camera capture, hand inference and actuation on separate threads
+
+    Stages are joined by DropQueues of size one, so each stage works on the
+    newest output of the stage before it: a slow click or brightness write
+    delays only the actuation of that frame, never capture or inference.
+    The last actuated packet is kept for the display loop, which runs on
+    the caller's thread because GUI toolkits expect that. An optional
+    scheduler paces capture, e.g. slowing it down while no hand is in view.
+    """
+
+    def __init__(self, read_frame, infer, actuate, queue_size=1, report_interval=5.0, scheduler=None):
+        """Initialize gesture pipeline
+
+        Args:
+            read_frame (callable): Returns the next camera frame, or None if it couldn't be read
+            infer (callable): infer(frame) returns the landmark result for a frame
+            actuate (callable): actuate(packet) performs the gesture's action
+            queue_size (int): Frames each hand-off can hold before the oldest is dropped
+            report_interval (float): Seconds between printed stats reports, or 0 for none
+            scheduler (AdaptiveScheduler, optional): Decides when capture takes the next frame
+                and is told whether each inferred frame had a hand
+        """
+        self.read_frame = read_frame
+        self.infer = infer
+        self.actuate = actuate
+        self.report_interval = report_interval
+        self.scheduler = scheduler
+        self.inference_queue = DropQueue(queue_size)
+        self.actuation_queue = DropQueue(queue_size)
+        self.stats = {name: StageStats(name) for name in ("capture", "inference", "actuation")}
+        self.end_to_end = StageStats("end-to-end")
+        self.output = None
+        self.output_ready = threading.Condition()
+        self.running = False
+        self.threads = []
+        self.last_report = time.monotonic()
+        # (wall, process CPU) at the start of the current CPU measurement
+        self.cpu_mark = (time.monotonic(), time.process_time())
+        self.cpu_percent = 0.0
+
+    def start(self):
+        self.running = True
+        for name, target in (("capture", self._capture_loop), ("inference", self._inference_loop),
+                             ("actuation", self._actuation_loop)):
+            thread = threading.Thread(target=target, name=f"gesture-{name}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self, timeout=2.0):
+        self.running = False
+        self.inference_queue.close()
+        self.actuation_queue.close()
+        with self.output_ready:
+            self.output_ready.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _capture_loop(self):
+        seq = 0
+        while self.running:
+            if self.scheduler is not None:
+                delay = self.scheduler.next_frame_delay()
+                if delay > 0:
+                    # Short naps so stop() isn't held up by a slow probe rate
+                    time.sleep(min(delay, 0.1))
+                    continue
+                self.scheduler.frame_taken()
+            start = time.monotonic()
+            try:
+                frame = self.read_frame()
+            except Exception as e:
+                print(f"Capture error: {e}")
+                frame = None
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            now = time.monotonic()
+            self.stats["capture"].record(now - start, now)
+            seq += 1
+            self.inference_queue.put(FramePacket(seq, frame, now))
+
+    def _inference_loop(self):
+        while self.running:
+            packet = self.inference_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            start = time.monotonic()
+            try:
+                packet.result = self.infer(packet.frame)
+            except Exception as e:
+                print(f"Inference error: {e}")
+                continue
+            packet.inferred_at = time.monotonic()
+            self.stats["inference"].record(packet.inferred_at - start, packet.inferred_at)
+            if self.scheduler is not None:
+                self.scheduler.observe(bool(getattr(packet.result, "multi_hand_landmarks", None)),
+                                       packet.captured_at)
+            self.actuation_queue.put(packet)
+
+    def _actuation_loop(self):
+        while self.running:
+            packet = self.actuation_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            start = time.monotonic()
+            try:
+                self.actuate(packet)
+            except Exception as e:
+                print(f"Actuation error: {e}")
+            packet.actuated_at = time.monotonic()
+            self.stats["actuation"].record(packet.actuated_at - start, packet.actuated_at)
+            self.end_to_end.record(packet.actuated_at - packet.captured_at, packet.actuated_at)
+            with self.output_ready:
+                self.output = packet
+                self.output_ready.notify_all()
+            self._maybe_report(packet.actuated_at)
+
+    def latest(self, after_seq=0, timeout=None):
+        """Wait for an actuated packet newer than after_seq
+
+        Returns:
+            FramePacket: Newest actuated packet, or None on timeout
+        """
+        with self.output_ready:
+            if (self.output is None or self.output.seq <= after_seq) and self.running:
+                self.output_ready.wait(timeout)
+            if self.output is None or self.output.seq <= after_seq:
+                return None
+            return self.output
+
+    def summary(self):
+        """Per-stage rates and latencies
+
+        Returns:
+            dict: Stage name -> {"fps", "latency_ms"}, plus "end_to_end" and "dropped" counts
+        """
+        summary = {name: {"fps": stats.fps(), "latency_ms": stats.latency() * 1000}
+                   for name, stats in self.stats.items()}
+        summary["end_to_end"] = {"fps": self.end_to_end.fps(), "latency_ms": self.end_to_end.latency() * 1000}
+        summary["dropped"] = {"inference": self.inference_queue.dropped, "actuation": self.actuation_queue.dropped}
+        summary["cpu_percent"] = self.cpu_percent
+        if self.scheduler is not None:
+            summary["mode"] = self.scheduler.mode
+        return summary
+
+    def measure_cpu(self):
+        """Process CPU use since the last measurement, in percent of one core"""
+        wall, cpu = time.monotonic(), time.process_time()
+        if wall > self.cpu_mark[0]:
+            self.cpu_percent = (cpu - self.cpu_mark[1]) / (wall - self.cpu_mark[0]) * 100
+        self.cpu_mark = (wall, cpu)
+        return self.cpu_percent
+
+    def format_summary(self):
+        summary = self.summary()
+        stages = "  ".join(f"{name} {summary[name]['fps']:.1f} fps/{summary[name]['latency_ms']:.0f} ms"
+                           for name in ("capture", "inference", "actuation"))
+        text = (f"{stages}  end-to-end {summary['end_to_end']['latency_ms']:.0f} ms  "
+                f"dropped {summary['dropped']['inference']}/{summary['dropped']['actuation']}  "
+                f"cpu {summary['cpu_percent']:.0f}%")
+        if "mode" in summary:
+            text += f"  mode {summary['mode']}"
+        return text
+
+    def _maybe_report(self, now):
+        if self.report_interval and now - self.last_report >= self.report_interval:
+            self.last_report = now
+            self.measure_cpu()
+            print(f"Gesture pipeline: {self.format_summary()}")
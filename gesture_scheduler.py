@@ -0,0 +1,119 @@
+import time
+import threading
+
+
+class CaptureProfile:
+    """Camera settings for one scheduler mode"""
+
+    def __init__(self, name, width, height, fps):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    def __repr__(self):
+        return f"CaptureProfile({self.name!r}, {self.width}x{self.height}@{self.fps})"
+
+
+ACTIVE_PROFILE = CaptureProfile("active", 640, 480, 30)
+IDLE_PROFILE = CaptureProfile("idle", 320, 240, 5)
+
+
+class AdaptiveScheduler:
+    """Drop the gesture pipeline to a slow probe rate while no hand is in view
+
+    In active mode every camera frame is processed. After idle_after seconds
+    without a hand the scheduler switches to idle mode, where a frame is
+    only taken every 1/idle_fps seconds and the camera runs at the idle
+    profile's lower resolution and frame rate. The first probe that sees a
+    hand switches straight back to active mode.
+    """
+
+    def __init__(self, idle_after=5.0, idle_fps=2.0, active=ACTIVE_PROFILE, idle=IDLE_PROFILE, clock=time.monotonic):
+        """Initialize scheduler
+
+        Args:
+            idle_after (float): Seconds without a hand before going idle, or 0 to stay active
+            idle_fps (float): Frames processed per second while idle
+            active (CaptureProfile): Camera settings while a hand is in view
+            idle (CaptureProfile): Camera settings while idle
+            clock (callable): Monotonic time source, for tests
+        """
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.profiles = {"active": active, "idle": idle}
+        self.clock = clock
+        self.lock = threading.Lock()
+        now = clock()
+        self.mode = "active"
+        self.last_hand = now
+        self.last_frame = None
+        self.mode_since = now
+        self.stats = {"frames": {"active": 0, "idle": 0}, "seconds": {"active": 0.0, "idle": 0.0},
+                      "wakes": 0, "sleeps": 0}
+        self.wake_delays = []
+
+    @property
+    def profile(self):
+        """Camera settings for the current mode"""
+        return self.profiles[self.mode]
+
+    def next_frame_delay(self):
+        """Seconds the capture stage should wait before taking the next frame"""
+        if self.mode == "active" or self.last_frame is None:
+            return 0.0
+        return max(0.0, self.last_frame + 1.0 / self.idle_fps - self.clock())
+
+    def frame_taken(self):
+        """Record that the capture stage took a frame"""
+        with self.lock:
+            self.last_frame = self.clock()
+            self.stats["frames"][self.mode] += 1
+
+    def observe(self, hand_present, captured_at=None):
+        """Update the mode from an inference result
+
+        Args:
+            hand_present (bool): Whether the frame contained a hand
+            captured_at (float, optional): Capture time of the frame, to measure wake-up delay
+
+        Returns:
+            str: Mode after the update
+        """
+        with self.lock:
+            now = self.clock()
+            if hand_present:
+                self.last_hand = now
+                if self.mode == "idle":
+                    self._switch("active", now)
+                    self.stats["wakes"] += 1
+                    if captured_at is not None:
+                        self.wake_delays.append(now - captured_at)
+            elif self.mode == "active" and self.idle_after and now - self.last_hand >= self.idle_after:
+                self._switch("idle", now)
+                self.stats["sleeps"] += 1
+            return self.mode
+
+    def _switch(self, mode, now):
+        self.stats["seconds"][self.mode] += now - self.mode_since
+        print(f"Gesture control {mode}: {self.profiles[mode]}")
+        self.mode = mode
+        self.mode_since = now
+
+    def summary(self):
+        """Frames and seconds spent in each mode, and wake-up delays
+
+        Returns:
+            dict: Summary values
+        """
+        with self.lock:
+            seconds = dict(self.stats["seconds"])
+            seconds[self.mode] += self.clock() - self.mode_since
+            return {
+                "mode": self.mode,
+                "frames": dict(self.stats["frames"]),
+                "seconds": seconds,
+                "wakes": self.stats["wakes"],
+                "sleeps": self.stats["sleeps"],
+                "max_wake_ms": max(self.wake_delays) * 1000 if self.wake_delays else None,
+            }
@@ -0,0 +1,187 @@
+import time
+
+
+def remap_landmarks(landmarks, roi, width, height):
+    """Convert landmarks found in a crop to full-frame coordinates, in place
+
+    Args:
+        landmarks (iterable): Objects with normalized x, y, z relative to the crop
+        roi (tuple): Crop (left, top, right, bottom) in pixels
+        width (int): Full frame width
+        height (int): Full frame height
+    """
+    left, top, right, bottom = roi
+    crop_width, crop_height = right - left, bottom - top
+    for landmark in landmarks:
+        landmark.x = (left + landmark.x * crop_width) / width
+        landmark.y = (top + landmark.y * crop_height) / height
+        # MediaPipe scales z like x
+        landmark.z = landmark.z * crop_width / width
+
+
+class HandROITracker:
+    """Predict where the hand will be in the next frame from its last landmarks
+
+    The region is a square around the previous hand's bounding box, moved by
+    the hand's last frame-to-frame motion and padded on every side, so a
+    hand moving at a steady pace stays inside it.
+    """
+
+    def __init__(self, padding=0.3, min_fraction=0.3, predict_motion=True):
+        """Initialize ROI tracker
+
+        Args:
+            padding (float): Margin added on each side, as a fraction of the hand's size
+            min_fraction (float): Smallest region side, as a fraction of the frame's shorter side
+            predict_motion (bool): Shift the region by the hand's last movement
+        """
+        self.padding = padding
+        self.min_fraction = min_fraction
+        self.predict_motion = predict_motion
+        self.box = None
+        self.velocity = (0.0, 0.0)
+
+    @property
+    def tracking(self):
+        return self.box is not None
+
+    def predict(self, width, height):
+        """Region to search in the next frame
+
+        Args:
+            width (int): Frame width in pixels
+            height (int): Frame height in pixels
+
+        Returns:
+            tuple: (left, top, right, bottom) in pixels, or None to search the whole frame
+        """
+        if self.box is None:
+            return None
+        x0, y0, x1, y1 = self.box
+        center_x = (x0 + x1) / 2 * width
+        center_y = (y0 + y1) / 2 * height
+        if self.predict_motion:
+            center_x += self.velocity[0] * width
+            center_y += self.velocity[1] * height
+
+        side = max((x1 - x0) * width, (y1 - y0) * height) * (1 + 2 * self.padding)
+        side = int(round(max(side, self.min_fraction * min(width, height))))
+        if side >= min(width, height):
+            # The region would cover (nearly) the whole frame anyway
+            return None
+        left = int(min(max(center_x - side / 2, 0), width - side))
+        top = int(min(max(center_y - side / 2, 0), height - side))
+        return left, top, left + side, top + side
+
+    def update(self, points):
+        """Record the hand's landmarks in this frame
+
+        Args:
+            points (iterable): (x, y) pairs, normalized to the full frame
+        """
+        xs, ys = zip(*points)
+        box = (min(xs), min(ys), max(xs), max(ys))
+        if self.box is not None:
+            self.velocity = ((box[0] + box[2] - self.box[0] - self.box[2]) / 2,
+                             (box[1] + box[3] - self.box[1] - self.box[3]) / 2)
+        self.box = box
+
+    def lose(self):
+        """Forget the hand, so the next frame searches the whole frame"""
+        self.box = None
+        self.velocity = (0.0, 0.0)
+
+
+class TrackedHandDetector:
+    """Run hand-landmark inference on a predicted region instead of the whole frame
+
+    While a hand is tracked, only the padded region around it is converted
+    and sent to the model, and the landmarks are mapped back to full-frame
+    coordinates. When the hand isn't found in the region, tracking is lost
+    and the same frame is searched in full, so a lost track costs one extra
+    inference rather than a missed frame.
+
+    MediaPipe Hands in video mode carries tracking state from one call to
+    the next, so crops and whole frames should go to separate instances:
+    pass the whole-frame one as full_process.
+    """
+
+    def __init__(self, process, tracker=None, retry_full_frame=True, full_process=None):
+        """Initialize tracked detector
+
+        Args:
+            process (callable): process(image) returns a result with multi_hand_landmarks,
+                like MediaPipe Hands.process on an RGB conversion of image; used for ROI crops
+            tracker (HandROITracker, optional): ROI tracker, default a new one
+            retry_full_frame (bool): Search the whole frame straight away when tracking is lost
+            full_process (callable, optional): Like process, for whole frames; default process
+        """
+        self.process = process
+        self.full_process = full_process or process
+        self.tracker = tracker or HandROITracker()
+        self.retry_full_frame = retry_full_frame
+        self.stats = {"frames": 0, "roi_inferences": 0, "full_inferences": 0, "lost": 0,
+                      "roi_time": 0.0, "full_time": 0.0, "roi_pixels": 0, "full_pixels": 0}
+
+    def _infer(self, image, kind):
+        start = time.perf_counter()
+        results = (self.process if kind == "roi" else self.full_process)(image)
+        self.stats[f"{kind}_time"] += time.perf_counter() - start
+        self.stats[f"{kind}_inferences"] += 1
+        self.stats[f"{kind}_pixels"] += image.shape[0] * image.shape[1]
+        return results
+
+    def _track(self, results):
+        hands = results.multi_hand_landmarks
+        if hands:
+            self.tracker.update((landmark.x, landmark.y) for landmark in hands[0].landmark)
+        return bool(hands)
+
+    def __call__(self, frame):
+        """Find hand landmarks in a frame
+
+        Args:
+            frame (numpy.ndarray): Full frame, height x width x channels
+
+        Returns:
+            object: process() result with landmarks in full-frame coordinates
+        """
+        self.stats["frames"] += 1
+        height, width = frame.shape[:2]
+        roi = self.tracker.predict(width, height)
+        if roi is not None:
+            left, top, right, bottom = roi
+            # A slice is a view, so only the region is ever converted or copied
+            results = self._infer(frame[top:bottom, left:right], "roi")
+            for hand in results.multi_hand_landmarks or []:
+                remap_landmarks(hand.landmark, roi, width, height)
+            if self._track(results):
+                return results
+            self.tracker.lose()
+            self.stats["lost"] += 1
+            if not self.retry_full_frame:
+                return results
+
+        results = self._infer(frame, "full")
+        if not self._track(results):
+            self.tracker.lose()
+        return results
+
+    def summary(self):
+        """Inference counts, mean times and tracking-loss rate
+
+        Returns:
+            dict: Summary values
+        """
+        stats = self.stats
+        roi, full = stats["roi_inferences"], stats["full_inferences"]
+        return {
+            "frames": stats["frames"],
+            "roi_inferences": roi,
+            "full_inferences": full,
+            "roi_ms": stats["roi_time"] / roi * 1000 if roi else 0.0,
+            "full_ms": stats["full_time"] / full * 1000 if full else 0.0,
+            "ms_per_frame": (stats["roi_time"] + stats["full_time"]) / max(stats["frames"], 1) * 1000,
+            "loss_rate": stats["lost"] / roi if roi else 0.0,
+            "roi_area": stats["roi_pixels"] / roi / (stats["full_pixels"] / full) if roi and full else None,
+        }
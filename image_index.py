@@ -0,0 +1,293 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import datetime
+import threading
+from PIL import Image
+
+from image_jobs import DEFAULT_PARAMS, DEFAULT_ENGINE, THUMBNAIL_SIZE, thumbnail_path_for
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "image_index.sqlite")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+# Generated file names look like "<prompt>_<YYYYmmdd>_<HHMMSS>[_<job id>][_<n>]"
+FILENAME_PATTERN = re.compile(r"^(?P<prompt>.*?)_(?P<stamp>\d{8}_\d{6})(?:_\d+)*$")
+
+# Words ignored when searching, so "images of a fox" finds "a red fox"
+STOP_WORDS = {"a", "an", "the", "of", "with", "and", "in", "on", "image", "images", "picture", "photo", "my"}
+
+
+def normalize_prompt(prompt):
+    """Lowercase a prompt and collapse punctuation and whitespace
+
+    Args:
+        prompt (str): Prompt as spoken or typed
+
+    Returns:
+        str: Normalized prompt
+    """
+    return " ".join(re.sub(r"[^\w]+", " ", prompt.lower()).split())
+
+
+def make_image_key(prompt, params=None, engine=DEFAULT_ENGINE):
+    """Build the cache key for a generation request
+
+    Args:
+        prompt (str): Image description
+        params (dict, optional): Overrides for DEFAULT_PARAMS
+        engine (str): Engine ID
+
+    Returns:
+        str: Hex SHA-256 key
+    """
+    merged = dict(DEFAULT_PARAMS, **(params or {}))
+    payload = json.dumps([normalize_prompt(prompt), engine, merged], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def prompt_from_filename(name):
+    """Recover the prompt and creation time from a generated file name
+
+    Returns:
+        tuple: (prompt, created timestamp or None)
+    """
+    stem = os.path.splitext(name)[0]
+    match = FILENAME_PATTERN.match(stem)
+    if not match:
+        return stem.replace("_", " "), None
+    try:
+        created = datetime.datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        created = None
+    return match.group("prompt").replace("_", " "), created
+
+
+class ImageRecord:
+    """An indexed image"""
+
+    def __init__(self, path, prompt, thumbnail_path=None, width=None, height=None, created=None):
+        self.path = path
+        self.prompt = prompt
+        self.thumbnail_path = thumbnail_path
+        self.width = width
+        self.height = height
+        self.created = created
+
+    def __repr__(self):
+        return f"ImageRecord({os.path.basename(self.path)!r}, {self.prompt!r})"
+
+
+class ImageIndex:
+    """SQLite index of the generated-images folder
+
+    Images generated through the job manager are recorded with the cache key
+    of their prompt and parameters, so an identical request can reuse the
+    file instead of calling the API again. Every image's prompt words are
+    indexed for keyword search. refresh() brings the index in line with the
+    folder, only opening files that are new or changed since the last scan;
+    images from before the index existed are searchable by the prompt in
+    their file name but never served as cache hits, since their parameters
+    are unknown.
+    """
+
+    def __init__(self, directory, path=DEFAULT_INDEX_PATH, thumbnail_size=THUMBNAIL_SIZE):
+        """Initialize image index
+
+        Args:
+            directory (str): Folder of generated images
+            path (str, optional): SQLite file, or None for an in-memory index
+            thumbnail_size (tuple): Size of thumbnails made for unindexed images
+        """
+        self.directory = directory
+        self.thumbnail_size = thumbnail_size
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "scanned": 0, "unchanged": 0, "removed": 0}
+        self.loader = None
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS images ("
+            "name TEXT PRIMARY KEY, key TEXT, prompt TEXT, params TEXT, thumbnail TEXT, "
+            "width INTEGER, height INTEGER, size INTEGER, mtime INTEGER, created REAL);"
+            "CREATE INDEX IF NOT EXISTS images_key ON images (key);"
+            "CREATE TABLE IF NOT EXISTS image_words (word TEXT, name TEXT, PRIMARY KEY (word, name));"
+        )
+        self.db.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def _record(self, row):
+        name, prompt, thumbnail, width, height, created = row
+        return ImageRecord(os.path.join(self.directory, name), prompt,
+                           os.path.join(self.directory, thumbnail) if thumbnail else None,
+                           width, height, created)
+
+    def _store(self, name, key, prompt, params, thumbnail, width, height, stat, created):
+        self.db.execute(
+            "INSERT OR REPLACE INTO images (name, key, prompt, params, thumbnail, width, height, size, mtime, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, key, prompt, json.dumps(params) if params is not None else None, thumbnail,
+             width, height, stat.st_size, stat.st_mtime_ns, created)
+        )
+        self.db.execute("DELETE FROM image_words WHERE name = ?", (name,))
+        self.db.executemany("INSERT OR IGNORE INTO image_words (word, name) VALUES (?, ?)",
+                            [(word, name) for word in normalize_prompt(prompt).split()])
+
+    def _forget(self, name):
+        self.db.execute("DELETE FROM images WHERE name = ?", (name,))
+        self.db.execute("DELETE FROM image_words WHERE name = ?", (name,))
+
+    def add(self, path, prompt, params=None, thumbnail_path=None, size=None, engine=DEFAULT_ENGINE):
+        """Record a freshly generated image
+
+        Args:
+            path (str): Image file inside the directory
+            prompt (str): Prompt it was generated from
+            params (dict, optional): Generation parameter overrides
+            thumbnail_path (str, optional): Its thumbnail
+            size (tuple, optional): (width, height)
+            engine (str): Engine ID
+        """
+        name = os.path.relpath(path, self.directory)
+        thumbnail = os.path.relpath(thumbnail_path, self.directory) if thumbnail_path else None
+        width, height = size or (None, None)
+        stat = os.stat(path)
+        with self.lock:
+            self._store(name, make_image_key(prompt, params, engine), prompt, params or {}, thumbnail,
+                        width, height, stat, time.time())
+            self.db.commit()
+
+    def lookup(self, prompt, params=None, engine=DEFAULT_ENGINE):
+        """Find an existing image generated from the same prompt and parameters
+
+        Returns:
+            ImageRecord: Most recent match whose file still exists, or None
+        """
+        key = make_image_key(prompt, params, engine)
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT name, prompt, thumbnail, width, height, created FROM images "
+                "WHERE key = ? ORDER BY created DESC", (key,)
+            ).fetchall()
+            for row in rows:
+                record = self._record(row)
+                if os.path.exists(record.path):
+                    self.stats["hits"] += 1
+                    return record
+                self._forget(row[0])
+            if rows:
+                self.db.commit()
+            self.stats["misses"] += 1
+            return None
+
+    def search(self, query, limit=5):
+        """Find images whose prompts contain the query's words
+
+        Args:
+            query (str): Keywords, e.g. "fox in the snow"
+            limit (int): Maximum number of results
+
+        Returns:
+            list: ImageRecords, most matching words first, then newest first
+        """
+        words = [word for word in normalize_prompt(query).split() if word not in STOP_WORDS]
+        if not words:
+            return []
+        placeholders = ",".join("?" * len(words))
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT images.name, prompt, thumbnail, width, height, created FROM image_words "
+                "JOIN images ON images.name = image_words.name "
+                f"WHERE word IN ({placeholders}) GROUP BY images.name "
+                "ORDER BY COUNT(*) DESC, created DESC LIMIT ?", (*words, limit)
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def refresh_async(self):
+        """Refresh the index in a background thread"""
+        self.loader = threading.Thread(target=self.refresh, daemon=True)
+        self.loader.start()
+        return self.loader
+
+    def refresh(self):
+        """Bring the index in line with the directory
+
+        Only files that are new, or whose size or mtime changed, are opened.
+
+        Returns:
+            tuple: (files indexed, files forgotten)
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.directory)
+                       if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file()]
+        except OSError as e:
+            print(f"Error scanning {self.directory}: {e}")
+            return 0, 0
+
+        with self.lock:
+            known = {name: (size, mtime, key, prompt, params, created)
+                     for name, size, mtime, key, prompt, params, created in self.db.execute(
+                         "SELECT name, size, mtime, key, prompt, params, created FROM images")}
+
+        scanned = 0
+        for entry in entries:
+            stat = entry.stat()
+            previous = known.pop(entry.name, None)
+            if previous and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+                self.stats["unchanged"] += 1
+                continue
+            try:
+                self._index_file(entry.path, entry.name, stat, previous)
+                scanned += 1
+            except Exception as e:
+                print(f"Could not index image {entry.name}: {e}")
+
+        # Whatever is left in known was not in the directory when it was scanned.
+        # An image saved and added since then is in known too, so only forget
+        # rows whose file is really gone.
+        with self.lock:
+            removed = [name for name in known
+                       if not os.path.exists(os.path.join(self.directory, name))]
+            for name in removed:
+                self._forget(name)
+            self.db.commit()
+
+        self.stats["scanned"] += scanned
+        self.stats["removed"] += len(removed)
+        if scanned or removed:
+            print(f"Image index: {scanned} images indexed, {len(removed)} removed")
+        return scanned, len(removed)
+
+    def _index_file(self, path, name, stat, previous):
+        thumbnail_path = thumbnail_path_for(path)
+        with Image.open(path) as image:
+            size = image.size
+            if not os.path.exists(thumbnail_path):
+                os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+                thumbnail = image.convert("RGB")
+                thumbnail.thumbnail(self.thumbnail_size)
+                thumbnail.save(thumbnail_path, "JPEG", quality=85)
+
+        if previous:
+            # Rewritten in place: keep what we knew about how it was generated
+            _, _, key, prompt, params, created = previous
+            params = json.loads(params) if params else None
+        else:
+            prompt, created = prompt_from_filename(name)
+            key, params = None, None
+        with self.lock:
+            self._store(name, key, prompt, params, os.path.relpath(thumbnail_path, self.directory),
+                        size[0], size[1], stat, created or stat.st_mtime)
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,381 @@
+import os
+import re
+import time
+import base64
+import datetime
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import ImageFile
+
+DEFAULT_STABILITY_BASE = "https://api.stability.ai"
+DEFAULT_ENGINE = "stable-diffusion-xl-1024-v1-0"
+
+# Parameters sent with every text-to-image request
+DEFAULT_PARAMS = {
+    "cfg_scale": 7,
+    "height": 1024,
+    "width": 1024,
+    "samples": 1,
+    "steps": 30,
+}
+
+THUMBNAIL_SIZE = (256, 256)
+
+
+class ImageGenerationError(Exception):
+    """Raised when the image API fails or returns no image"""
+
+
+class StabilityClient:
+    """Stability AI text-to-image client over one reused HTTP session"""
+
+    def __init__(self, api_key, base_url=None, engine=DEFAULT_ENGINE, connect_timeout=10.0,
+                 read_timeout=120.0, session=None):
+        """Initialize Stability client
+
+        Args:
+            api_key (str): Stability AI API key
+            base_url (str, optional): API root, default STABILITY_API_BASE or the public API
+            engine (str): Engine ID
+            connect_timeout (float): Seconds allowed to establish a connection
+            read_timeout (float): Seconds allowed between bytes of the response
+            session (requests.Session, optional): HTTP session to reuse
+        """
+        self.api_key = api_key
+        self.base_url = (base_url or os.getenv("STABILITY_API_BASE") or DEFAULT_STABILITY_BASE).rstrip("/")
+        self.engine = engine
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = session or requests.Session()
+
+    def text_to_image_stream(self, prompt, params=None, chunk_size=64 * 1024):
+        """Generate an image and yield its PNG bytes as they arrive
+
+        The image is requested as raw PNG, so nothing is base64-encoded or
+        buffered whole. A JSON answer with base64 artifacts is decoded in
+        chunks instead.
+
+        Args:
+            prompt (str): Image description
+            params (dict, optional): Overrides for DEFAULT_PARAMS
+            chunk_size (int): Bytes per yielded chunk
+
+        Yields:
+            bytes: Consecutive pieces of the PNG file
+        """
+        body = dict(DEFAULT_PARAMS, **(params or {}))
+        body["text_prompts"] = [{"text": prompt}]
+        url = f"{self.base_url}/v1/generation/{self.engine}/text-to-image"
+        print(f"Calling Stability AI API with prompt: {prompt[:50]}...")
+        try:
+            response = self.session.post(url, json=body, timeout=self.timeout, stream=True,
+                                         headers={"Authorization": f"Bearer {self.api_key}", "Accept": "image/png"})
+        except requests.RequestException as e:
+            raise ImageGenerationError(f"Request failed: {e}") from e
+
+        with response:
+            if response.status_code != 200:
+                raise ImageGenerationError(f"Stability AI API error: {response.status_code}, {response.text[:200]}")
+            try:
+                if response.headers.get("Content-Type", "").startswith("image/"):
+                    yield from response.iter_content(chunk_size)
+                    return
+
+                artifacts = response.json().get("artifacts") or []
+                if not artifacts:
+                    raise ImageGenerationError("No image returned")
+                encoded = artifacts[0]["base64"]
+                # Whole base64 quanta (4 characters -> 3 bytes) per chunk
+                step = chunk_size // 3 * 4
+                for start in range(0, len(encoded), step):
+                    yield base64.b64decode(encoded[start:start + step])
+            except requests.RequestException as e:
+                raise ImageGenerationError(f"Download failed: {e}") from e
+
+    def text_to_image(self, prompt, params=None):
+        """Generate an image
+
+        Returns:
+            bytes: PNG data
+        """
+        return b"".join(self.text_to_image_stream(prompt, params))
+
+
+def thumbnail_path_for(path):
+    """Thumbnail location for an image: a JPEG of the same name in a thumbnails subfolder"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), "thumbnails", stem + ".jpg")
+
+
+def save_image_stream(chunks, path, thumbnail_path=None, thumbnail_size=THUMBNAIL_SIZE, cancelled=None):
+    """Write an image stream to its final file, decoding it in the same pass
+
+    Each chunk is written to "<path>.part" and fed to an incremental PIL
+    decoder, which checks the image and provides the thumbnail without
+    reading the file back. The finished file is renamed into place, so
+    path never holds a partial image.
+
+    Args:
+        chunks (iterable): Bytes of the encoded image
+        path (str): Final image path; must not exist yet
+        thumbnail_path (str, optional): Where to save a JPEG thumbnail
+        thumbnail_size (tuple): Maximum thumbnail width and height
+        cancelled (callable, optional): Returns True to abandon the download
+
+    Returns:
+        tuple: (width, height) of the image
+    """
+    part_path = path + ".part"
+    parser = ImageFile.Parser()
+    try:
+        with open(part_path, "xb") as f:
+            for chunk in chunks:
+                if cancelled and cancelled():
+                    raise ImageGenerationError("Cancelled")
+                f.write(chunk)
+                parser.feed(chunk)
+        image = parser.close()
+
+        if thumbnail_path:
+            os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+            thumbnail = image.convert("RGB")
+            thumbnail.thumbnail(thumbnail_size)
+            thumbnail.save(thumbnail_path + ".part", "JPEG", quality=85)
+            os.replace(thumbnail_path + ".part", thumbnail_path)
+
+        os.replace(part_path, path)
+        return image.size
+    except BaseException:
+        for leftover in (part_path, thumbnail_path and thumbnail_path + ".part"):
+            if leftover and os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+
+
+class ImageJob:
+    """One image generation request and its progress"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, prompt, params=None):
+        self.id = next(self._ids)
+        self.prompt = prompt
+        self.params = params or {}
+        self.status = "queued"
+        self.path = None
+        self.thumbnail_path = None
+        self.error = None
+        self.created_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.cached = False
+        self.done = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def describe(self):
+        """Short spoken summary of the job's state"""
+        if self.status == "queued":
+            return f"Your image of {self.prompt} is waiting to start."
+        if self.status == "cancelling":
+            return f"Your image of {self.prompt} is being cancelled."
+        if self.status == "running":
+            seconds = int(time.monotonic() - self.started_at)
+            return f"Your image of {self.prompt} has been generating for {seconds} seconds."
+        if self.status == "done":
+            return f"Your image of {self.prompt} is ready."
+        if self.status == "cancelled":
+            return f"Your image of {self.prompt} was cancelled."
+        return f"Your image of {self.prompt} failed."
+
+    def __repr__(self):
+        return f"ImageJob({self.id}, {self.prompt!r}, {self.status})"
+
+
+class ImageJobManager:
+    """Run image generations on a small worker pool instead of the caller's thread
+
+    Jobs get IDs and can be queried or cancelled while they run. A queued job
+    that is cancelled never starts; a running one is "cancelling" until it
+    stops downloading, and leaves no file behind. Each image is saved as it arrives to a unique
+    name in output_dir, with a thumbnail in output_dir/thumbnails. With an
+    index, a repeat of an earlier prompt and parameters is answered with the
+    existing image straight away.
+    """
+
+    def __init__(self, client, output_dir, workers=2, on_update=None, index=None):
+        """Initialize job manager
+
+        Args:
+            client (StabilityClient): Object with text_to_image_stream(prompt, params) yielding PNG bytes
+            output_dir (str): Folder generated images are saved in
+            workers (int): Maximum number of generations running at once
+            on_update (callable, optional): Called with the ImageJob whenever its status changes
+            index (ImageIndex, optional): Index that finished images are recorded in and looked up from
+        """
+        self.client = client
+        self.index = index
+        self.output_dir = output_dir
+        self.on_update = on_update
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-job")
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, prompt, params=None, use_cache=True):
+        """Queue an image generation
+
+        Args:
+            prompt (str): Image description
+            params (dict, optional): Generation parameter overrides
+            use_cache (bool): Reuse an indexed image of the same prompt and parameters
+
+        Returns:
+            ImageJob: Job to follow, query or cancel; already done if it was cached
+        """
+        job = ImageJob(prompt, params)
+        with self.lock:
+            self.jobs[job.id] = job
+
+        record = None
+        if use_cache and self.index is not None:
+            try:
+                record = self.index.lookup(prompt, params, self._engine())
+            except Exception as e:
+                print(f"Image index lookup failed: {e}")
+        if record is not None:
+            print(f"Image job {job.id} served from {record.path}")
+            job.path = record.path
+            job.thumbnail_path = record.thumbnail_path
+            job.cached = True
+            job.started_at = time.monotonic()
+            self._finish(job, "done")
+            return job
+
+        self.executor.submit(self._run, job)
+        return job
+
+    def _engine(self):
+        return getattr(self.client, "engine", DEFAULT_ENGINE)
+
+    def get(self, job_id=None):
+        """A job by ID, or the most recent one
+
+        Returns:
+            ImageJob: Job, or None
+        """
+        with self.lock:
+            if job_id is not None:
+                return self.jobs.get(job_id)
+            return self.jobs[max(self.jobs)] if self.jobs else None
+
+    def active(self):
+        """Jobs that are queued or running, oldest first; jobs being cancelled don't count"""
+        with self.lock:
+            return [job for job in self.jobs.values() if not job.finished and not job.cancel_requested]
+
+    def cancel(self, job_id=None):
+        """Cancel a job, or the most recent unfinished one
+
+        Returns:
+            ImageJob: Cancelled job, or None if there was nothing to cancel
+        """
+        with self.lock:
+            if job_id is None:
+                unfinished = [job for job in self.jobs.values() if not job.finished and not job.cancel_requested]
+                job = unfinished[-1] if unfinished else None
+            else:
+                job = self.jobs.get(job_id)
+            if job is None or job.finished or job.cancel_requested:
+                return None
+            job.cancel_requested = True
+            queued = job.status == "queued"
+            if not queued:
+                # The worker finishes it once the download stops
+                job.status = "cancelling"
+        if queued:
+            self._finish(job, "cancelled")
+        else:
+            self._notify(job)
+        return job
+
+    def wait(self, job, timeout=None):
+        """Wait for a job to finish
+
+        Returns:
+            bool: True if it finished in time
+        """
+        return job.done.wait(timeout)
+
+    def shutdown(self, wait=False):
+        for job in self.active():
+            self.cancel(job.id)
+        self.executor.shutdown(wait=wait)
+
+    def _notify(self, job):
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception as e:
+                print(f"Image job callback failed: {e}")
+
+    def _finish(self, job, status, error=None):
+        with self.lock:
+            if job.finished:
+                return
+            job.status = status
+            job.error = error
+            job.finished_at = time.monotonic()
+        job.done.set()
+        self._notify(job)
+
+    def _filename(self, job):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Create a sanitized filename from the prompt
+        sanitized_prompt = re.sub(r'[^\w\s-]', '', job.prompt)[:50]
+        sanitized_prompt = re.sub(r'\s+', '_', sanitized_prompt.strip()) or "image"
+        stem = f"{sanitized_prompt}_{timestamp}_{job.id}"
+        path = os.path.join(self.output_dir, stem + ".png")
+        counter = 1
+        # Another process (or an earlier run) may have used the name already
+        while os.path.exists(path) or os.path.exists(path + ".part"):
+            path = os.path.join(self.output_dir, f"{stem}_{counter}.png")
+            counter += 1
+        return path
+
+    def _run(self, job):
+        with self.lock:
+            if job.cancel_requested or job.finished:
+                return
+            job.status = "running"
+            job.started_at = time.monotonic()
+        self._notify(job)
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = self._filename(job)
+            thumbnail_path = thumbnail_path_for(path)
+            size = save_image_stream(self.client.text_to_image_stream(job.prompt, job.params), path,
+                              thumbnail_path, cancelled=lambda: job.cancel_requested)
+            if job.cancel_requested:
+                for leftover in (path, thumbnail_path):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+                self._finish(job, "cancelled")
+                return
+            job.path = path
+            job.thumbnail_path = thumbnail_path
+            if self.index is not None:
+                try:
+                    self.index.add(path, job.prompt, job.params, thumbnail_path, size, self._engine())
+                except Exception as e:
+                    print(f"Could not index image {path}: {e}")
+            print(f"Image job {job.id} saved to {path} in {time.monotonic() - job.started_at:.1f}s")
+            self._finish(job, "done")
+        except Exception as e:
+            print(f"Image job {job.id} failed: {e}")
+            self._finish(job, "cancelled" if job.cancel_requested else "failed", str(e))
@@ -0,0 +1,415 @@
+import os
+import sys
+import ctypes
+import ctypes.util
+import threading
+from contextlib import contextmanager
+
+# pyautogui key names that differ from the X11 keysym names
+X11_KEY_NAMES = {
+    "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+    "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R",
+    "win": "Super_L", "winleft": "Super_L", "winright": "Super_R", "command": "Super_L",
+    "enter": "Return", "return": "Return", "\n": "Return",
+    "esc": "Escape", "escape": "Escape",
+    "tab": "Tab", "\t": "Tab", "space": "space", " ": "space",
+    "backspace": "BackSpace", "delete": "Delete", "del": "Delete", "insert": "Insert",
+    "home": "Home", "end": "End", "pageup": "Prior", "pgup": "Prior", "pagedown": "Next", "pgdn": "Next",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "capslock": "Caps_Lock", "printscreen": "Print", "prtsc": "Print",
+    "volumeup": "XF86AudioRaiseVolume", "volumedown": "XF86AudioLowerVolume", "volumemute": "XF86AudioMute",
+}
+
+MOUSE_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class InputBackend:
+    """Base class for mouse and keyboard backends
+
+    Actions are turned into low-level events ("move", "button", "key",
+    "scroll") and queued. Outside a batch() block every action is sent as
+    soon as it's queued; inside one, all events go out together when the
+    outermost block ends, so e.g. a hotkey or a burst of cursor moves costs
+    a single flush.
+
+    The voice, gesture and typing threads share one backend, so actions,
+    batches and backend calls all hold a reentrant lock; a batch holds it
+    until it is sent, so other threads' events can't land in the middle.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.pending = []
+        self.batch_depth = 0
+        self.lock = threading.RLock()
+        # Number of flushes sent, for tests and benchmarks
+        self.flush_count = 0
+
+    def is_available(self):
+        return False
+
+    # Backend-specific ------------------------------------------------------
+
+    def _send(self, events):
+        """Send queued events to the system in order"""
+        raise NotImplementedError
+
+    def position(self):
+        raise NotImplementedError
+
+    def size(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # Batching --------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """Queue every action inside the block and send them in one flush"""
+        with self.lock:
+            self.batch_depth += 1
+            try:
+                yield self
+            finally:
+                self.batch_depth -= 1
+                if self.batch_depth == 0:
+                    self.flush()
+
+    def flush(self):
+        """Send all queued events"""
+        with self.lock:
+            if not self.pending:
+                return
+            events, self.pending = self.pending, []
+            self.flush_count += 1
+            self._send(events)
+
+    def _emit(self, *events):
+        with self.lock:
+            self.pending.extend(events)
+            if self.batch_depth == 0:
+                self.flush()
+
+    # Actions ---------------------------------------------------------------
+
+    def move_to(self, x, y):
+        self._emit(("move", int(x), int(y)))
+
+    def mouse_down(self, button="left"):
+        self._emit(("button", button, True))
+
+    def mouse_up(self, button="left"):
+        self._emit(("button", button, False))
+
+    def click(self, x=None, y=None, button="left", clicks=1):
+        """Click a mouse button, optionally moving there first
+
+        Args:
+            x (int, optional): X coordinate, or None for the current position
+            y (int, optional): Y coordinate, or None for the current position
+            button (str): "left", "right" or "middle"
+            clicks (int): Number of clicks (2 for a double click)
+        """
+        events = [("move", int(x), int(y))] if x is not None and y is not None else []
+        for _ in range(clicks):
+            events += [("button", button, True), ("button", button, False)]
+        self._emit(*events)
+
+    def scroll(self, amount):
+        """Scroll the wheel; positive is up, negative is down"""
+        if amount:
+            self._emit(("scroll", int(amount)))
+
+    def key_down(self, key):
+        self._emit(("key", key, True))
+
+    def key_up(self, key):
+        self._emit(("key", key, False))
+
+    def press(self, key):
+        self._emit(("key", key, True), ("key", key, False))
+
+    def hotkey(self, *keys):
+        """Press keys in order and release them in reverse, e.g. hotkey("ctrl", "c")"""
+        self._emit(*([("key", key, True) for key in keys] + [("key", key, False) for key in reversed(keys)]))
+
+    def write(self, text):
+        """Type ASCII text as key events"""
+        events = []
+        for char in text:
+            events += [("key", char, True), ("key", char, False)]
+        self._emit(*events)
+
+
+class PyAutoGUIInputBackend(InputBackend):
+    """Portable backend that replays events through pyautogui
+
+    pyautogui's PAUSE sleep is skipped for every event, so this is already
+    faster than calling pyautogui directly.
+    """
+
+    name = "pyautogui"
+
+    def __init__(self):
+        super().__init__()
+        import pyautogui
+        self.pyautogui = pyautogui
+
+    def is_available(self):
+        return True
+
+    def _send(self, events):
+        gui = self.pyautogui
+        for event in events:
+            kind = event[0]
+            if kind == "move":
+                gui.moveTo(event[1], event[2], _pause=False)
+            elif kind == "button":
+                (gui.mouseDown if event[2] else gui.mouseUp)(button=event[1], _pause=False)
+            elif kind == "key":
+                (gui.keyDown if event[2] else gui.keyUp)(event[1], _pause=False)
+            elif kind == "scroll":
+                gui.scroll(event[1], _pause=False)
+
+    def position(self):
+        return tuple(self.pyautogui.position())
+
+    def size(self):
+        return tuple(self.pyautogui.size())
+
+
+class XTestInputBackend(InputBackend):
+    """Native X11 backend using the XTEST extension through ctypes
+
+    Events are written to the X connection's output buffer and sent with a
+    single XFlush per batch, without any per-event sleep. Every Xlib call
+    holds the backend lock, and XInitThreads is called before the display
+    is opened in case other threads use Xlib too.
+    """
+
+    name = "xtest"
+
+    def __init__(self):
+        super().__init__()
+        self.display = None
+        self.keycodes = {}
+        self._xlib = None
+        self._xtst = None
+
+    def is_available(self):
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            return False
+        try:
+            self._open()
+            return True
+        except Exception as e:
+            print(f"XTest input not available: {e}")
+            return False
+
+    def _open(self):
+        with self.lock:
+            if not self.display:
+                self._open_display()
+
+    def _open_display(self):
+        xlib_path = ctypes.util.find_library("X11")
+        xtst_path = ctypes.util.find_library("Xtst")
+        if not xlib_path or not xtst_path:
+            raise RuntimeError("libX11 or libXtst not found")
+        xlib = ctypes.CDLL(xlib_path)
+        xtst = ctypes.CDLL(xtst_path)
+        # Must come before any other Xlib call to make the connection safe to share
+        xlib.XInitThreads()
+
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XStringToKeysym.restype = ctypes.c_ulong
+        xlib.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xlib.XkbKeycodeToKeysym.restype = ctypes.c_ulong
+        xlib.XkbKeycodeToKeysym.argtypes = [ctypes.c_void_p, ctypes.c_ubyte, ctypes.c_int, ctypes.c_int]
+        xlib.XQueryPointer.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_uint),
+        ]
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+
+        xtst.XTestQueryExtension.argtypes = [ctypes.c_void_p] + [ctypes.POINTER(ctypes.c_int)] * 4
+        xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            raise RuntimeError("Could not open X display")
+        ints = [ctypes.c_int() for _ in range(4)]
+        if not xtst.XTestQueryExtension(display, *[ctypes.byref(value) for value in ints]):
+            xlib.XCloseDisplay(display)
+            raise RuntimeError("X server does not support XTEST")
+
+        self._xlib, self._xtst = xlib, xtst
+        self.display = display
+        self.screen = xlib.XDefaultScreen(display)
+        self.root = xlib.XDefaultRootWindow(display)
+
+    def _keycode(self, key):
+        """(keycode, needs_shift) for a pyautogui key name or a single character"""
+        if key in self.keycodes:
+            return self.keycodes[key]
+
+        name = X11_KEY_NAMES.get(key.lower() if len(key) > 1 else key)
+        if name:
+            keysym = self._xlib.XStringToKeysym(name.encode())
+        elif len(key) == 1 and 32 <= ord(key) < 256:
+            # Latin-1 keysyms are the characters' code points
+            keysym = ord(key)
+        elif key[0] in "fF" and key[1:].isdigit():
+            # "f5" -> "F5"
+            keysym = self._xlib.XStringToKeysym(key.upper().encode())
+        else:
+            keysym = self._xlib.XStringToKeysym(key.encode())
+        keycode = self._xlib.XKeysymToKeycode(self.display, keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"No key on the current keyboard layout for {key!r}")
+
+        # Characters on the shifted level of a key (e.g. "A", "!") need Shift held
+        needs_shift = (self._xlib.XkbKeycodeToKeysym(self.display, keycode, 0, 0) != keysym
+                       and self._xlib.XkbKeycodeToKeysym(self.display, keycode, 0, 1) == keysym)
+        self.keycodes[key] = (keycode, needs_shift)
+        return keycode, needs_shift
+
+    def _send(self, events):
+        self._open()
+        with self.lock:
+            # Look every key up first: a key missing from the layout must fail the
+            # batch before anything is sent, not after e.g. ctrl is already held down
+            keycodes = {event[1]: self._keycode(event[1]) for event in events if event[0] == "key"}
+            if any(needs_shift for _, needs_shift in keycodes.values()):
+                shift = self._keycode("shift")[0]
+            xtst, display = self._xtst, self.display
+            for event in events:
+                kind = event[0]
+                if kind == "move":
+                    xtst.XTestFakeMotionEvent(display, self.screen, event[1], event[2], 0)
+                elif kind == "button":
+                    xtst.XTestFakeButtonEvent(display, MOUSE_BUTTONS[event[1]], int(event[2]), 0)
+                elif kind == "scroll":
+                    # Wheel steps are clicks of buttons 4 (up) and 5 (down)
+                    button = 4 if event[1] > 0 else 5
+                    for _ in range(abs(event[1])):
+                        xtst.XTestFakeButtonEvent(display, button, 1, 0)
+                        xtst.XTestFakeButtonEvent(display, button, 0, 0)
+                elif kind == "key":
+                    keycode, needs_shift = keycodes[event[1]]
+                    if needs_shift and event[2]:
+                        xtst.XTestFakeKeyEvent(display, shift, 1, 0)
+                    xtst.XTestFakeKeyEvent(display, keycode, int(event[2]), 0)
+                    if needs_shift and not event[2]:
+                        xtst.XTestFakeKeyEvent(display, shift, 0, 0)
+            self._xlib.XFlush(display)
+
+    def position(self):
+        self._open()
+        root, child = ctypes.c_ulong(), ctypes.c_ulong()
+        x, y, win_x, win_y = ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        mask = ctypes.c_uint()
+        with self.lock:
+            self._xlib.XQueryPointer(self.display, self.root, ctypes.byref(root), ctypes.byref(child),
+                                     ctypes.byref(x), ctypes.byref(y), ctypes.byref(win_x), ctypes.byref(win_y),
+                                     ctypes.byref(mask))
+        return (x.value, y.value)
+
+    def size(self):
+        self._open()
+        with self.lock:
+            return (
+                self._xlib.XDisplayWidth(self.display, self.screen),
+                self._xlib.XDisplayHeight(self.display, self.screen),
+            )
+
+    def close(self):
+        with self.lock:
+            if self.display:
+                self._xlib.XCloseDisplay(self.display)
+                self.display = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class RecordingInputBackend(InputBackend):
+    """Fake backend that records flushed events instead of sending them, for tests"""
+
+    name = "recording"
+
+    def __init__(self, screen_size=(1920, 1080)):
+        super().__init__()
+        self.screen_size = screen_size
+        self.cursor = (0, 0)
+        self.batches = []
+
+    def is_available(self):
+        return True
+
+    @property
+    def events(self):
+        """All sent events, in order"""
+        return [event for batch in self.batches for event in batch]
+
+    def _send(self, events):
+        for event in events:
+            if event[0] == "move":
+                self.cursor = (event[1], event[2])
+        self.batches.append(events)
+
+    def position(self):
+        return self.cursor
+
+    def size(self):
+        return self.screen_size
+
+    def clear(self):
+        self.batches = []
+
+
+INPUT_BACKENDS = {
+    "xtest": XTestInputBackend,
+    "pyautogui": PyAutoGUIInputBackend,
+    "recording": RecordingInputBackend,
+}
+
+
+def get_input_backend(name=None):
+    """Get an input backend by name, or the fastest available one
+
+    Args:
+        name (str, optional): Backend name, or None to use INPUT_BACKEND / auto-detect
+
+    Returns:
+        InputBackend: Input backend instance
+    """
+    name = name or os.getenv("INPUT_BACKEND")
+    if name in INPUT_BACKENDS:
+        return INPUT_BACKENDS[name]()
+    if name:
+        print(f"Unknown input backend '{name}' (expected one of {', '.join(INPUT_BACKENDS)}), auto-detecting")
+
+    backend = XTestInputBackend()
+    if backend.is_available():
+        return backend
+    return PyAutoGUIInputBackend()
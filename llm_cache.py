@@ -0,0 +1,175 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import textwrap
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "llm_cache.sqlite")
+
+
+def normalize_input(text):
+    """Normalize text so trivially different selections share a cache entry
+
+    Line endings, common indentation and trailing whitespace are ignored.
+
+    Args:
+        text (str): Text or code to normalize
+
+    Returns:
+        str: Normalized text
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [line.rstrip() for line in textwrap.dedent(text).split("\n")]
+    return "\n".join(lines).strip("\n")
+
+
+def make_cache_key(operation, model, prompt_version, text):
+    """Build a content-addressed cache key
+
+    Args:
+        operation (str): Operation name, e.g. "analyze"
+        model (str): Model name
+        prompt_version (str): Version of the prompt template
+        text (str): Input text
+
+    Returns:
+        str: Hex SHA-256 key
+    """
+    payload = json.dumps([operation, model, prompt_version, normalize_input(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_memory_entries=128, ttl=7 * 24 * 3600):
+        """Initialize two-level (memory LRU + SQLite) response cache
+
+        Args:
+            path (str, optional): SQLite file, or None for a memory-only cache
+            max_memory_entries (int): Entries kept in the in-memory LRU
+            ttl (float): Seconds before an entry expires
+        """
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+        self.db = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self.db = sqlite3.connect(path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, operation TEXT, value TEXT, created REAL)"
+                )
+                self.db.commit()
+            except Exception as e:
+                print(f"Warning: Could not open response cache at {path}: {e}")
+                self.db = None
+
+    def get(self, key):
+        """Look up a cached response
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str: Cached value, or None on a miss
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created < self.ttl:
+                    self.memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return value
+                del self.memory[key]
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if now - created < self.ttl:
+                        self._remember(key, value, created)
+                        self.counters["disk_hits"] += 1
+                        return value
+                    self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.db.commit()
+
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key, value, operation=""):
+        """Store a response in both cache levels
+
+        Args:
+            key (str): Cache key
+            value (str): Response text
+            operation (str, optional): Operation name, kept for inspection
+        """
+        created = time.time()
+        with self.lock:
+            self._remember(key, value, created)
+            self.counters["stores"] += 1
+            if self.db is not None:
+                try:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO responses (key, operation, value, created) VALUES (?, ?, ?, ?)",
+                        (key, operation, value, created),
+                    )
+                    self.db.commit()
+                except Exception as e:
+                    print(f"Warning: Could not write response cache: {e}")
+
+    def _remember(self, key, value, created):
+        self.memory[key] = (value, created)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def purge_expired(self):
+        """Delete expired entries from disk
+
+        Returns:
+            int: Number of entries deleted
+        """
+        if self.db is None:
+            return 0
+        with self.lock:
+            cursor = self.db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            self.db.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self.lock:
+            self.memory.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM responses")
+                self.db.commit()
+
+    def stats(self):
+        """Get hit/miss counters
+
+        Returns:
+            dict: Counters plus hit rate and memory entry count
+        """
+        with self.lock:
+            stats = dict(self.counters)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+            stats["memory_entries"] = len(self.memory)
+            return stats
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
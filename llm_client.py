@@ -0,0 +1,260 @@
+import os
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from gemini_rest import GeminiRestModel, DEFAULT_BASE_URL
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when an LLM request fails after retries"""
+
+
+class CircuitOpenError(LLMError):
+    """Raised without making a request while the circuit breaker is open"""
+
+
+class DeadlineExceeded(LLMError):
+    """Raised when a request can't finish before its deadline"""
+
+
+class CircuitBreaker:
+    """Stop calling a failing service for a while after repeated failures
+
+    closed -> open after `threshold` consecutive failures; open -> half-open
+    after `reset_timeout` seconds, when one trial request is let through.
+    """
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Check whether a request may be made now
+
+        Returns:
+            bool: True if the request may proceed
+        """
+        with self.lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class LLMClient:
+    def __init__(self, api_key=None, model_name="gemini-pro", base_url=None, timeout=30.0,
+                 connect_timeout=5.0, max_retries=3, backoff=0.5, max_backoff=8.0,
+                 max_concurrency=4, breaker_threshold=5, breaker_reset=30.0):
+        """Initialize shared LLM client
+
+        Args:
+            api_key (str, optional): Gemini API key
+            model_name (str): Gemini model name
+            base_url (str, optional): API base URL, or None for GEMINI_API_BASE / the public API
+            timeout (float): Default deadline in seconds for a whole call, including retries
+            connect_timeout (float): Seconds allowed to establish a connection
+            max_retries (int): Retries after the first attempt for transient errors
+            backoff (float): Base delay for exponential backoff
+            max_backoff (float): Maximum delay between retries
+            max_concurrency (int): Maximum requests in flight at once
+            breaker_threshold (int): Consecutive failures that open the circuit breaker
+            breaker_reset (float): Seconds before an open breaker allows a trial request
+        """
+        self.model_name = model_name
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+        # Calls come from several threads at once (e.g. ScreenReader's chunk pool)
+        self.stats_lock = threading.Lock()
+
+        # One pooled session so keep-alive connections are reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.model = GeminiRestModel(
+            model_name=model_name,
+            api_key=api_key,
+            base_url=base_url or os.getenv("GEMINI_API_BASE", DEFAULT_BASE_URL),
+            session=self.session,
+        )
+
+    def _is_retryable(self, error):
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in RETRYABLE_STATUSES
+        return False
+
+    def _delay(self, attempt, deadline):
+        """Full-jitter exponential backoff, never sleeping past the deadline"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        return min(delay, max(0.0, deadline - time.monotonic()))
+
+    def _count(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def _call(self, request, deadline, hold_slot=False):
+        """Run a request with concurrency limiting, retries and the circuit breaker
+
+        Args:
+            request (callable): Called with the per-attempt timeout tuple
+            deadline (float): time.monotonic() value the call must finish by
+            hold_slot (bool): Keep the concurrency slot after a successful request;
+                the caller must release self.semaphore when it's done
+
+        Returns:
+            object: Whatever request returns
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise CircuitOpenError("LLM service is unavailable (circuit breaker open)")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("LLM request deadline exceeded")
+
+            if not self.semaphore.acquire(timeout=remaining):
+                raise DeadlineExceeded("Timed out waiting for a free LLM connection")
+            release = True
+            try:
+                self._count("requests")
+                remaining = max(0.01, deadline - time.monotonic())
+                result = request((min(self.connect_timeout, remaining), remaining))
+                self.breaker.record_success()
+                release = not hold_slot
+                return result
+            except Exception as e:
+                retryable = self._is_retryable(e)
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    # The service answered (e.g. a 400), so it isn't down
+                    self.breaker.record_success()
+                if not retryable or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise LLMError(f"LLM request failed: {e}") from e
+                print(f"LLM request failed ({e}), retrying...")
+            finally:
+                if release:
+                    self.semaphore.release()
+
+            delay = self._delay(attempt, deadline)
+            attempt += 1
+            self._count("retries")
+            time.sleep(delay)
+
+    def generate_content(self, prompt, stream=False, timeout=None):
+        """Generate a response, with the same interface as GenerativeModel.generate_content
+
+        Args:
+            prompt (str): Prompt text
+            stream (bool): Yield chunks as they arrive
+            timeout (float, optional): Deadline in seconds for this call, or None for the default
+
+        Returns:
+            GeminiRestResponse, or an iterator of them when streaming
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        if stream:
+            return self._stream(prompt, deadline)
+        return self._call(lambda t: self.model.generate_content(prompt, timeout=t), deadline)
+
+    def _stream(self, prompt, deadline):
+        # Retrying is only safe until the first chunk has been handed to the caller,
+        # so the connection and first chunk are fetched inside _call. The stream
+        # keeps its concurrency slot until it has been read to the end or closed.
+        def open_stream(timeout):
+            chunks = self.model.generate_content(prompt, stream=True, timeout=timeout)
+            return chunks, next(chunks, None)
+
+        chunks, first = self._call(open_stream, deadline, hold_slot=True)
+        try:
+            if first is None:
+                return
+            yield first
+            for chunk in chunks:
+                if time.monotonic() > deadline:
+                    raise DeadlineExceeded("LLM stream deadline exceeded")
+                yield chunk
+        except LLMError:
+            raise
+        except Exception as e:
+            # Failed after text was handed out, so it can't be retried
+            if self._is_retryable(e):
+                self.breaker.record_failure()
+            self._count("failures")
+            raise LLMError(f"LLM stream failed: {e}") from e
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+            self.semaphore.release()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(api_key=None, model_name="gemini-pro", **options):
+    """Get the shared LLM client for an API key and model
+
+    Args:
+        api_key (str, optional): Gemini API key
+        model_name (str): Gemini model name
+        **options: LLMClient options, only used when the client is first created
+
+    Returns:
+        LLMClient: Shared client
+    """
+    with _clients_lock:
+        key = (api_key, model_name)
+        if key not in _clients:
+            _clients[key] = LLMClient(api_key=api_key, model_name=model_name, **options)
+        return _clients[key]
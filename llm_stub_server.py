@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Gemini REST API
+
+Serves generateContent and streamGenerateContent (server-sent events) with
+canned text so streaming and LLM code can be tested offline. It can also
+simulate slow responses and transient errors for LLM client tests and benchmarks.
+
+Usage:
+    python llm_stub_server.py [--port 8765] [--chunk-delay 0.2] [--latency 0.5] [--error-rate 0.2]
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CHUNKS = [
+    "This code defines a recursive factorial function. ",
+    "It returns one for inputs of one or less. ",
+    "Otherwise it multiplies n by the factorial of n minus one.",
+]
+
+
+def _payload(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        stub.requests.append({"path": self.path, "body": body})
+
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        error_status = stub.next_error()
+        if error_status:
+            self._send_json(error_status, {"error": {"code": error_status, "message": "Simulated error"}})
+            return
+
+        if ":streamGenerateContent" in self.path:
+            self._send_stream(stub)
+        elif ":generateContent" in self.path:
+            self._send_json(200, _payload("".join(stub.chunks)))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, stub):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in stub.chunks:
+            time.sleep(stub.chunk_delay)
+            event = f"data: {json.dumps(_payload(chunk))}\r\n\r\n".encode("utf-8")
+            self.wfile.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class LLMStubServer:
+    def __init__(self, chunks=None, chunk_delay=0.0, latency=0.0, error_rate=0.0, fail_first=0,
+                 error_status=503, host="127.0.0.1", port=0):
+        """Initialize stub server
+
+        Args:
+            chunks (list, optional): Text chunks to return, in order
+            chunk_delay (float): Seconds to wait before sending each streamed chunk
+            latency (float): Seconds to wait before answering any request
+            error_rate (float): Probability (0-1) of answering with error_status
+            fail_first (int): Number of initial requests that always fail
+            error_status (int): HTTP status used for simulated errors
+            host (str): Interface to bind
+            port (int): Port to bind, or 0 for any free port
+        """
+        self.chunks = list(chunks or DEFAULT_CHUNKS)
+        self.chunk_delay = chunk_delay
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_status = error_status
+        self.requests = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.thread = None
+
+    def next_error(self):
+        """Decide whether the current request should fail
+
+        Returns:
+            int: HTTP status to fail with, or None to succeed
+        """
+        with self.lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return self.error_status
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def start(self):
+        """Start serving in a background thread
+
+        Returns:
+            str: Base URL to pass to GeminiRestModel
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini API stub server")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--chunk-delay", type=float, default=0.2, help="Delay before each streamed chunk")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay before answering each request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for simulated errors")
+    args = parser.parse_args()
+
+    server = LLMStubServer(chunk_delay=args.chunk_delay, latency=args.latency, error_rate=args.error_rate,
+                           error_status=args.error_status, port=args.port)
+    print(f"Gemini stub server listening on {server.base_url}")
+    print(f"Point GRACE at it with: GEMINI_API_BASE={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStub server stopped")
+
+if __name__ == "__main__":
+    main()
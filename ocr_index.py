@@ -0,0 +1,276 @@
+import re
+import time
+import difflib
+
+# Prefix lengths indexed for every word; labels are looked up by their first word
+PREFIX_LENGTHS = (1, 2, 3)
+
+# Size in pixels of the grid cells used for spatial lookups
+GRID_CELL = 64
+
+
+def normalize_word(text):
+    """Lowercase a word and strip punctuation OCR tends to attach to it"""
+    return re.sub(r"[^\w]+", "", text.lower())
+
+
+class WordBox:
+    """A recognised word and its bounding box in screen coordinates"""
+
+    def __init__(self, text, left, top, width, height, conf=-1, line=None, position=0):
+        self.text = text
+        self.key = normalize_word(text)
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.conf = conf
+        self.line = line
+        self.position = position
+
+    @property
+    def box(self):
+        return (self.left, self.top, self.left + self.width, self.top + self.height)
+
+    @property
+    def center(self):
+        return (self.left + self.width // 2, self.top + self.height // 2)
+
+    def __repr__(self):
+        return f"WordBox({self.text!r}, {self.box})"
+
+
+class TextMatch:
+    """A run of words on one line that matched a label"""
+
+    def __init__(self, words, score):
+        self.words = words
+        self.score = score
+        self.text = " ".join(word.text for word in words)
+        self.box = (
+            min(word.left for word in words),
+            min(word.top for word in words),
+            max(word.left + word.width for word in words),
+            max(word.top + word.height for word in words),
+        )
+
+    @property
+    def center(self):
+        left, top, right, bottom = self.box
+        return ((left + right) // 2, (top + bottom) // 2)
+
+    def __repr__(self):
+        return f"TextMatch({self.text!r}, score={self.score:.2f}, center={self.center})"
+
+
+def parse_tesseract_data(data, offset=(0, 0), min_conf=0):
+    """Convert pytesseract.image_to_data(..., output_type=Output.DICT) into lines of words
+
+    Args:
+        data (dict): Tesseract data dict with text/left/top/width/height/conf and
+            block_num/par_num/line_num lists
+        offset (tuple): (x, y) of the captured region, added to every box
+        min_conf (float): Words below this confidence are dropped (-1 keeps all)
+
+    Returns:
+        list: Lines, each a list of WordBox in reading order
+    """
+    lines = {}
+    order = []
+    dx, dy = offset
+    for i, text in enumerate(data.get("text", [])):
+        if not text or not text.strip():
+            continue
+        try:
+            conf = float(data["conf"][i])
+        except (KeyError, ValueError, TypeError):
+            conf = -1
+        if conf != -1 and conf < min_conf:
+            continue
+
+        line_id = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        if line_id not in lines:
+            lines[line_id] = []
+            order.append(line_id)
+        lines[line_id].append(WordBox(
+            text.strip(),
+            int(data["left"][i]) + dx,
+            int(data["top"][i]) + dy,
+            int(data["width"][i]),
+            int(data["height"][i]),
+            conf,
+        ))
+
+    result = []
+    for line_id in order:
+        words = sorted(lines[line_id], key=lambda word: word.left)
+        for position, word in enumerate(words):
+            word.line = words
+            word.position = position
+        result.append(words)
+    return result
+
+
+def _intersects(box, region):
+    left, top, right, bottom = box
+    r_left, r_top, r_right, r_bottom = region
+    return left < r_right and right > r_left and top < r_bottom and bottom > r_top
+
+
+class OCRIndex:
+    """Spatial and prefix index over OCR word boxes
+
+    Words are bucketed into a coarse grid for region queries and into a
+    prefix table for label lookups, so finding "save" or "sign in" only
+    scores a handful of candidates instead of every word on screen.
+    Rescanning a region replaces just the words inside it.
+    """
+
+    def __init__(self, cell_size=GRID_CELL):
+        """Initialize OCR index
+
+        Args:
+            cell_size (int): Grid cell size in pixels for spatial lookups
+        """
+        self.cell_size = cell_size
+        self.lines = []
+        self.words = set()
+        self.grid = {}
+        self.prefixes = {}
+        self.updated_at = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def age(self):
+        """Seconds since the index was last updated, or None if it's empty"""
+        if self.updated_at is None:
+            return None
+        return time.monotonic() - self.updated_at
+
+    def _cells(self, box):
+        left, top, right, bottom = box
+        size = self.cell_size
+        for cx in range(left // size, (max(left, right - 1)) // size + 1):
+            for cy in range(top // size, (max(top, bottom - 1)) // size + 1):
+                yield (cx, cy)
+
+    def _add_word(self, word):
+        self.words.add(word)
+        for cell in self._cells(word.box):
+            self.grid.setdefault(cell, set()).add(word)
+        for length in PREFIX_LENGTHS:
+            if len(word.key) >= length:
+                self.prefixes.setdefault(word.key[:length], set()).add(word)
+
+    def _remove_word(self, word):
+        self.words.discard(word)
+        for cell in self._cells(word.box):
+            bucket = self.grid.get(cell)
+            if bucket:
+                bucket.discard(word)
+                if not bucket:
+                    del self.grid[cell]
+        for length in PREFIX_LENGTHS:
+            bucket = self.prefixes.get(word.key[:length])
+            if bucket:
+                bucket.discard(word)
+                if not bucket:
+                    del self.prefixes[word.key[:length]]
+
+    def words_in(self, region):
+        """Get the words whose boxes intersect a region
+
+        Args:
+            region (tuple): (left, top, right, bottom)
+
+        Returns:
+            list: WordBox objects in reading order
+        """
+        found = set()
+        for cell in self._cells(region):
+            for word in self.grid.get(cell, ()):
+                if _intersects(word.box, region):
+                    found.add(word)
+        return sorted(found, key=lambda word: (word.top, word.left))
+
+    def update(self, lines, region=None):
+        """Replace the indexed words, or just those inside a rescanned region
+
+        Args:
+            lines (list): Lines of WordBox from parse_tesseract_data
+            region (tuple, optional): Region that was rescanned, or None for the whole screen
+        """
+        if region is None:
+            stale = list(self.words)
+        else:
+            # Lines crossing the region edge are dropped whole so no half-lines remain
+            stale = {w for word in self.words_in(region) for w in word.line}
+        for word in stale:
+            self._remove_word(word)
+
+        stale_lines = {id(word.line) for word in stale}
+        self.lines = [line for line in self.lines if id(line) not in stale_lines]
+        for line in lines:
+            self.lines.append(line)
+            for word in line:
+                self._add_word(word)
+        self.updated_at = time.monotonic()
+
+    def text(self, region=None):
+        """Rebuild plain text from the indexed lines
+
+        Args:
+            region (tuple, optional): Only include lines inside this region
+
+        Returns:
+            str: One OCR line per text line, top to bottom
+        """
+        lines = [line for line in self.lines if line]
+        if region is not None:
+            lines = [line for line in lines if any(_intersects(word.box, region) for word in line)]
+        lines.sort(key=lambda line: (line[0].top, line[0].left))
+        return "\n".join(" ".join(word.text for word in line) for line in lines)
+
+    def _candidates(self, first):
+        """Words that could start a match for a label's first word"""
+        for length in sorted(PREFIX_LENGTHS, reverse=True):
+            if len(first) >= length and first[:length] in self.prefixes:
+                return self.prefixes[first[:length]]
+        # OCR may have garbled the first letters; fall back to every word
+        return self.words
+
+    def find(self, label, min_score=0.75, region=None):
+        """Find the on-screen text that best matches a spoken label
+
+        Args:
+            label (str): Label to look for, e.g. "save" or "sign in"
+            min_score (float): Minimum similarity (0-1) to accept
+            region (tuple, optional): Only consider words in this region
+
+        Returns:
+            TextMatch: Best match, or None if nothing is similar enough
+        """
+        tokens = [normalize_word(token) for token in label.split()]
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            return None
+        target = " ".join(tokens)
+
+        best = None
+        for candidates in (self._candidates(tokens[0]), self.words):
+            for word in candidates:
+                span = word.line[word.position:word.position + len(tokens)]
+                if region is not None and not _intersects(word.box, region):
+                    continue
+                text = " ".join(w.key for w in span)
+                matcher = difflib.SequenceMatcher(None, target, text)
+                if matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score:
+                    continue
+                score = matcher.ratio()
+                if score >= min_score and (best is None or score > best.score):
+                    best = TextMatch(span, score)
+            # Only scan the whole index when the prefix candidates found nothing
+            if best is not None or candidates is self.words:
+                break
+        return best
@@ -0,0 +1,118 @@
+import os
+import shutil
+import platform
+import subprocess
+
+from volume_control import get_volume_backend
+from brightness_control import get_brightness_service
+
+
+class PlatformServices:
+    """Platform-specific operations, probed once and bound at startup
+
+    Each service is either a ready-to-call function (or backend object) for
+    this machine, or None when it isn't supported, so command handlers don't
+    check the platform or try failing commands on every call.
+
+    Attributes:
+        volume (VolumeBackend): Mixer, or None
+        brightness (BrightnessService): Backlight service, or None
+        set_brightness (callable): set_brightness(level), or None
+        open_file (callable): open_file(path) in the default app, or None
+        shutdown (callable): shutdown() powers the computer off, or None
+        capabilities (dict): Service name -> implementation name, or None if unsupported
+    """
+
+    def __init__(self, system=None, which=shutil.which, run=subprocess.run, popen=subprocess.Popen,
+                 volume="auto", brightness="auto"):
+        """Probe the platform and bind implementations
+
+        Args:
+            system (str, optional): platform.system() value, for tests
+            which (callable): shutil.which replacement, for tests
+            run (callable): subprocess.run replacement, for tests
+            popen (callable): subprocess.Popen replacement, for tests
+            volume (VolumeBackend, optional): Volume backend, "auto" to probe, or None for none
+            brightness (BrightnessService, optional): Brightness service, "auto" to probe, or None for none
+        """
+        self.system = system or platform.system()
+        self.which = which
+        self.run = run
+        self.popen = popen
+        self.capabilities = {}
+
+        self.volume = get_volume_backend() if volume == "auto" else volume
+        self.capabilities["volume"] = self.volume.name if self.volume else None
+
+        self.brightness = get_brightness_service() if brightness == "auto" else brightness
+        self.set_brightness = self._bind_brightness()
+        self.open_file = self._bind_open_file()
+        self.shutdown = self._bind_shutdown()
+
+        print("Platform services: " + ", ".join(
+            f"{name}={implementation or 'unavailable'}" for name, implementation in self.capabilities.items()))
+
+    def supports(self, service):
+        """Whether a service (e.g. "volume", "shutdown") is available"""
+        return bool(self.capabilities.get(service))
+
+    def _bind(self, service, implementation, function):
+        self.capabilities[service] = implementation if function else None
+        return function
+
+    def _bind_brightness(self):
+        if self.brightness is not None:
+            return self._bind("brightness", getattr(self.brightness.driver, "name", "service"),
+                              self.brightness.set_brightness)
+
+        if self.system == "Windows" and self.which("powershell"):
+            def set_brightness(level):
+                self.run(["powershell", "-NoProfile", "-Command",
+                          "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
+                          f".WmiSetBrightness(1, {int(level)})"], check=True, timeout=10)
+            return self._bind("brightness", "wmi", set_brightness)
+
+        if self.system == "Darwin" and self.which("osascript"):
+            def set_brightness(level):
+                self.run(["osascript", "-e", 'tell application "System Events" to set brightness of '
+                          f"(get first desktop) to {level / 100.0}"], check=True, timeout=5)
+            return self._bind("brightness", "osascript", set_brightness)
+
+        return self._bind("brightness", None, None)
+
+    def _bind_open_file(self):
+        if self.system == "Windows":
+            return self._bind("open_file", "startfile", lambda path: os.startfile(path))
+        if self.system == "Darwin":
+            tool = "open" if self.which("open") else None
+        else:
+            tool = next((name for name in ("xdg-open", "gio") if self.which(name)), None)
+        if not tool:
+            return self._bind("open_file", None, None)
+
+        argv = [tool, "open"] if tool == "gio" else [tool]
+
+        def open_file(path):
+            # Don't wait for the viewer
+            self.popen(argv + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return self._bind("open_file", tool, open_file)
+
+    def _bind_shutdown(self):
+        if self.system == "Windows":
+            argv = ["shutdown", "/s", "/t", "10", "/f"]
+        elif self.system == "Darwin":
+            argv = ["osascript", "-e", 'tell app "System Events" to shut down']
+        elif self.which("systemctl"):
+            argv = ["systemctl", "poweroff"]
+        else:
+            argv = ["shutdown", "-h", "now"]
+        if not self.which(argv[0]):
+            return self._bind("shutdown", None, None)
+
+        def shutdown():
+            self.run(argv, check=True, timeout=10)
+        return self._bind("shutdown", argv[0], shutdown)
+
+    def exit_process(self, code=0):
+        """Terminate this process immediately, without running cleanup handlers"""
+        os._exit(code)
@@ -0,0 +1,384 @@
+import os
+import re
+import sys
+import time
+import shutil
+import threading
+import subprocess
+
+
+def _linux_descendants(pid):
+    """PIDs of a process and all its descendants, read from /proc"""
+    children = {}
+    try:
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as f:
+                    stat = f.read()
+                # The command name may contain spaces, so parse after its closing parenthesis
+                ppid = int(stat[stat.rindex(b")") + 2:].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, ValueError, IndexError):
+                continue
+    except OSError:
+        return {pid}
+
+    found, pending = {pid}, [pid]
+    while pending:
+        for child in children.get(pending.pop(), ()):
+            if child not in found:
+                found.add(child)
+                pending.append(child)
+    return found
+
+
+class X11WindowProbe:
+    """Detect application windows with xdotool
+
+    xdotool matches --name patterns as case-insensitive POSIX regular
+    expressions, so titles are escaped before searching.
+    """
+
+    name = "x11"
+
+    def __init__(self, tree_ttl=1.0):
+        """Initialize probe
+
+        Args:
+            tree_ttl (float): Seconds a process tree read from /proc is reused
+        """
+        self.xdotool = shutil.which("xdotool")
+        self.tree_ttl = tree_ttl
+        # pid -> (time read, descendant pids); rescanning /proc on every poll is slow
+        self.trees = {}
+
+    def is_available(self):
+        return bool(os.environ.get("DISPLAY")) and self.xdotool is not None
+
+    def _search(self, *args):
+        try:
+            result = subprocess.run([self.xdotool, "search", "--onlyvisible"] + list(args),
+                                    capture_output=True, text=True, timeout=1)
+            return result.stdout.split()
+        except Exception:
+            return []
+
+    def _descendants(self, pid):
+        now = time.monotonic()
+        cached = self.trees.get(pid)
+        if cached is None or now - cached[0] >= self.tree_ttl:
+            for old in [key for key, (read_at, _) in self.trees.items() if now - read_at > 60]:
+                self.trees.pop(old, None)
+            cached = (now, _linux_descendants(pid))
+            self.trees[pid] = cached
+        return cached[1]
+
+    def has_window(self, pid=None, title=None):
+        """Check whether a visible window matches a title or belongs to a process tree
+
+        Args:
+            pid (int, optional): Launched process; its descendants are checked too
+            title (str, optional): Case-insensitive window title fragment
+
+        Returns:
+            bool: True if a matching window is mapped
+        """
+        # One xdotool call for the title before one per process in the tree
+        if title and self._search("--name", re.escape(title)):
+            return True
+        if pid is not None:
+            for candidate in self._descendants(pid):
+                if self._search("--pid", str(candidate)):
+                    return True
+        return False
+
+    def activate(self, pid=None, title=None):
+        """Raise and focus the first visible window matching a process tree or title
+
+        Returns:
+            bool: True if a matching window was found and activated
+        """
+        windows = []
+        if pid is not None:
+            for candidate in self._descendants(pid):
+                windows += self._search("--pid", str(candidate))
+        if not windows and title:
+            windows = self._search("--name", re.escape(title))
+        if not windows:
+            return False
+        try:
+            result = subprocess.run([self.xdotool, "windowactivate", "--sync", windows[0]],
+                                    capture_output=True, timeout=2)
+            return result.returncode == 0
+        except Exception:
+            return False
+
+
+class WindowsWindowProbe:
+    """Detect application windows with EnumWindows"""
+
+    name = "windows"
+
+    def is_available(self):
+        return sys.platform == "win32"
+
+    def _find_window(self, pid=None, title=None):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        title = title.lower() if title else None
+        found = []
+
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def callback(hwnd, _):
+            if not user32.IsWindowVisible(hwnd):
+                return True
+            if pid is not None:
+                owner = wintypes.DWORD()
+                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+                if owner.value == pid:
+                    found.append(hwnd)
+                    return False
+            if title:
+                length = user32.GetWindowTextLengthW(hwnd)
+                buffer = ctypes.create_unicode_buffer(length + 1)
+                user32.GetWindowTextW(hwnd, buffer, length + 1)
+                if title in buffer.value.lower():
+                    found.append(hwnd)
+                    return False
+            return True
+
+        user32.EnumWindows(callback, 0)
+        return found[0] if found else None
+
+    def has_window(self, pid=None, title=None):
+        return self._find_window(pid, title) is not None
+
+    def activate(self, pid=None, title=None):
+        """Restore and focus the first visible window matching a process or title
+
+        Returns:
+            bool: True if a matching window was found and brought to the foreground
+        """
+        import ctypes
+
+        hwnd = self._find_window(pid, title)
+        if hwnd is None:
+            return False
+        user32 = ctypes.windll.user32
+        if user32.IsIconic(hwnd):
+            user32.ShowWindow(hwnd, 9)  # SW_RESTORE
+        return bool(user32.SetForegroundWindow(hwnd))
+
+
+def detect_window_probe():
+    """Get a window probe for this platform, or None if windows can't be inspected"""
+    for probe_class in (WindowsWindowProbe, X11WindowProbe):
+        probe = probe_class()
+        if probe.is_available():
+            return probe
+    return None
+
+
+class LaunchHandle:
+    """A launched application and whether it has become ready"""
+
+    def __init__(self, name, process=None):
+        self.name = name
+        self.process = process
+        self.pid = process.pid if process else None
+        self.started_at = time.monotonic()
+        self.ready_at = None
+        self.failed = False
+        self.ready_event = threading.Event()
+
+    @property
+    def ready(self):
+        return self.ready_at is not None
+
+    @property
+    def done(self):
+        """True once the app is ready or readiness has been given up on"""
+        return self.ready_event.is_set()
+
+    def startup_time(self):
+        """Seconds from launch until the app was ready, or None"""
+        return None if self.ready_at is None else self.ready_at - self.started_at
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def wait_ready(self, timeout=None):
+        """Block until the app is ready or readiness detection gives up
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            bool: True if the app became ready
+        """
+        self.ready_event.wait(timeout)
+        return self.ready
+
+    def _finish(self, ready):
+        if ready:
+            self.ready_at = time.monotonic()
+        else:
+            self.failed = True
+        self.ready_event.set()
+
+    def __repr__(self):
+        state = "ready" if self.ready else ("failed" if self.failed else "starting")
+        return f"LaunchHandle({self.name!r}, pid={self.pid}, {state})"
+
+
+class ProcessLauncher:
+    """Start applications without a shell and detect when they're ready
+
+    Each launch is watched from a background thread until the app's window
+    appears (or a custom readiness probe passes), so callers can wait exactly
+    as long as the app takes to start instead of sleeping a fixed time.
+    """
+
+    def __init__(self, window_probe="auto", poll_interval=0.05, grace_period=0.5, max_poll_interval=0.5):
+        """Initialize launcher
+
+        Args:
+            window_probe (object, optional): Probe with has_window(pid, title), "auto" to
+                detect one, or None to only track the process
+            poll_interval (float): Seconds before the second readiness check
+            grace_period (float): Without a window probe, a process still running after
+                this many seconds is considered ready
+            max_poll_interval (float): Longest gap between readiness checks; the gap grows
+                from poll_interval since each window check is a few subprocess calls
+        """
+        self.window_probe = detect_window_probe() if window_probe == "auto" else window_probe
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.grace_period = grace_period
+        self.children = {}
+        # Broker processes, kept only so they can be waited for once they exit
+        self.brokers = []
+        self.lock = threading.Lock()
+
+    def launch(self, argv, name=None, ready_probe=None, timeout=15.0, title=None, broker=False):
+        """Start a program directly from an argv list
+
+        Args:
+            argv (list): Program and arguments; no shell is involved
+            name (str, optional): Display name, default the program name
+            ready_probe (callable, optional): Returns True once the app is usable
+            timeout (float): Seconds to wait for readiness before giving up
+            title (str, optional): Window title fragment to look for, default name
+            broker (bool): argv only asks another process to open the app (explorer.exe
+                shell:..., xdg-open), so its exit code says nothing about the app
+
+        Returns:
+            LaunchHandle: Handle to wait on
+        """
+        # Collect apps that have exited since the last launch so they don't linger as zombies
+        self.reap()
+        options = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if os.name == "nt":
+            options["creationflags"] = getattr(subprocess, "DETACHED_PROCESS", 0)
+        else:
+            # Own session, so the app survives the agent and doesn't get its signals
+            options["start_new_session"] = True
+
+        process = subprocess.Popen(list(argv), **options)
+        handle = LaunchHandle(name or os.path.basename(argv[0]), process)
+        if broker:
+            # The broker exits on its own and the app's window won't be in its process tree
+            handle.pid = None
+            handle.process = None
+            with self.lock:
+                self.brokers.append(process)
+        else:
+            with self.lock:
+                self.children[process.pid] = handle
+        print(f"Launched {handle.name} (pid {process.pid})")
+
+        self._watch(handle, ready_probe, timeout, title or name)
+        return handle
+
+    def track(self, name, ready_probe=None, timeout=15.0, title=None):
+        """Watch for an app started some other way (e.g. a URI or os.startfile)
+
+        Returns:
+            LaunchHandle: Handle without a process, ready when its window appears
+        """
+        handle = LaunchHandle(name)
+        self._watch(handle, ready_probe, timeout, title or name)
+        return handle
+
+    def _watch(self, handle, ready_probe, timeout, title):
+        thread = threading.Thread(target=self._wait_until_ready,
+                                  args=(handle, ready_probe, timeout, title), daemon=True)
+        thread.start()
+
+    def _is_ready(self, handle, ready_probe, title):
+        if ready_probe is not None:
+            return ready_probe()
+        if self.window_probe is not None:
+            return self.window_probe.has_window(pid=handle.pid, title=title)
+        if handle.process is None:
+            return True
+        # No way to see windows: trust a process that survives its first moments
+        return time.monotonic() - handle.started_at >= self.grace_period
+
+    def _wait_until_ready(self, handle, ready_probe, timeout, title):
+        deadline = handle.started_at + timeout
+        interval = self.poll_interval
+        while time.monotonic() < deadline:
+            try:
+                if self._is_ready(handle, ready_probe, title):
+                    handle._finish(True)
+                    print(f"{handle.name} ready after {handle.startup_time():.2f}s")
+                    return
+            except Exception as e:
+                print(f"Readiness check for {handle.name} failed: {e}")
+
+            if handle.process is not None:
+                code = handle.process.poll()
+                # Single-instance apps hand off to a running copy and exit 0, so keep
+                # looking for the window; a non-zero exit means the launch failed
+                if code not in (None, 0):
+                    print(f"{handle.name} exited with code {code}")
+                    handle._finish(False)
+                    return
+            time.sleep(interval)
+            interval = min(interval * 1.5, self.max_poll_interval)
+
+        print(f"Gave up waiting for {handle.name} after {timeout:.0f}s")
+        handle._finish(False)
+
+    def reap(self):
+        """Wait for and forget launched processes that have exited
+
+        Called on every launch, so exited apps don't stay zombies while the agent runs.
+
+        Returns:
+            list: Handles still running
+        """
+        with self.lock:
+            self.brokers = [process for process in self.brokers if process.poll() is None]
+            for pid, handle in list(self.children.items()):
+                if not handle.is_running():
+                    del self.children[pid]
+            return list(self.children.values())
+
+    def terminate(self, pid):
+        """Terminate a process started by this launcher
+
+        Returns:
+            bool: True if the process was found and signalled
+        """
+        with self.lock:
+            handle = self.children.pop(pid, None)
+        if handle is None or not handle.is_running():
+            return False
+        handle.process.terminate()
+        return True
@@ -0,0 +1,409 @@
+import os
+import sys
+import ctypes
+import ctypes.util
+from collections import OrderedDict
+import numpy as np
+
+
+class Frame:
+    """A captured frame backed by a (possibly shared) pixel buffer
+
+    The buffer is owned by the capture backend and is overwritten by the next
+    grab of the same size, so call copy() before handing a frame to another thread.
+    """
+
+    def __init__(self, buffer, width, height, region=None, rawmode="BGRX", image=None):
+        """Initialize frame
+
+        Args:
+            buffer (numpy.ndarray): 2D uint8 array of rows (height x stride)
+            width (int): Frame width in pixels
+            height (int): Frame height in pixels
+            region (tuple, optional): Screen region the frame was taken from
+            rawmode (str): PIL raw mode describing the pixel layout
+            image (PIL.Image, optional): Image the buffer was created from, if any
+        """
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.region = region
+        self.rawmode = rawmode
+        self._image = image
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    @property
+    def stride(self):
+        return self.buffer.shape[1]
+
+    @property
+    def array(self):
+        """Zero-copy (height, width, 4) view of the pixels"""
+        return self.buffer[:, :self.width * 4].reshape(self.height, self.width, 4)
+
+    def to_image(self):
+        """Convert to an RGB PIL image in a single decode pass
+
+        Returns:
+            PIL.Image: RGB image
+        """
+        from PIL import Image
+        if self._image is not None:
+            return self._image
+        return Image.frombuffer("RGB", self.size, self.buffer, "raw", self.rawmode, self.stride, 1)
+
+    def copy(self):
+        """Detach the frame from the backend's reusable buffer
+
+        Returns:
+            Frame: Frame that owns its own pixels
+        """
+        return Frame(self.buffer.copy(), self.width, self.height, self.region, self.rawmode, self._image)
+
+
+class CaptureBackend:
+    """Base class for screen capture backends"""
+
+    name = "base"
+
+    def __init__(self):
+        # Bytes of pixel memory this backend has allocated, for benchmarks
+        self.bytes_allocated = 0
+
+    def is_available(self):
+        return False
+
+    def get_screen_size(self):
+        raise NotImplementedError
+
+    def grab(self, region=None):
+        """Capture the screen or a region of it
+
+        Args:
+            region (tuple, optional): Region to capture (left, top, right, bottom)
+
+        Returns:
+            Frame: Captured frame
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PILCaptureBackend(CaptureBackend):
+    """Capture with PIL's ImageGrab, falling back to pyautogui (allocates every frame)"""
+
+    name = "pil"
+
+    def is_available(self):
+        try:
+            from PIL import ImageGrab
+            return True
+        except Exception:
+            return False
+
+    def get_screen_size(self):
+        import pyautogui
+        return tuple(pyautogui.size())
+
+    def grab(self, region=None):
+        try:
+            from PIL import ImageGrab
+            image = ImageGrab.grab(bbox=region) if region else ImageGrab.grab()
+        except Exception as e:
+            print(f"ImageGrab failed, using pyautogui: {e}")
+            import pyautogui
+            if region:
+                left, top, right, bottom = region
+                image = pyautogui.screenshot(region=(left, top, right - left, bottom - top))
+            else:
+                image = pyautogui.screenshot()
+
+        image = image.convert("RGB")
+        width, height = image.size
+        rgbx = image.convert("RGBX")
+        buffer = np.frombuffer(rgbx.tobytes(), dtype=np.uint8).reshape(height, width * 4)
+        self.bytes_allocated += buffer.nbytes + width * height * 3
+        return Frame(buffer, width, height, region, rawmode="RGBX", image=image)
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class XShmCaptureBackend(CaptureBackend):
+    """Capture on X11 with the MIT-SHM extension into preallocated shared memory
+
+    The X server writes pixels straight into a shared segment that is mapped as
+    a NumPy array, so repeated grabs of the same size allocate nothing.
+    """
+
+    name = "xshm"
+
+    _ZPIXMAP = 2
+    _IPC_PRIVATE = 0
+    _IPC_CREAT = 0o1000
+    _IPC_RMID = 0
+    _ALL_PLANES = ctypes.c_ulong(-1)
+    # Keep a handful of region sizes mapped; more than that is a sign of churn
+    _MAX_SEGMENTS = 4
+
+    def __init__(self):
+        super().__init__()
+        self.display = None
+        # Least recently used first, so the oldest segment is released first
+        self.segments = OrderedDict()
+        self._xlib = None
+        self._xext = None
+        self._libc = None
+        self._destroy_image = None
+
+    def is_available(self):
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            return False
+        try:
+            self._open()
+            return True
+        except Exception as e:
+            print(f"MIT-SHM capture not available: {e}")
+            return False
+
+    def _open(self):
+        if self.display:
+            return
+
+        xlib = ctypes.CDLL(ctypes.util.find_library("X11"))
+        xext = ctypes.CDLL(ctypes.util.find_library("Xext"))
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultVisual.restype = ctypes.c_void_p
+        xlib.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_char_p, ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+            ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+
+        libc.shmget.restype = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            raise RuntimeError("Could not open X display")
+        if not xext.XShmQueryExtension(display):
+            xlib.XCloseDisplay(display)
+            raise RuntimeError("X server does not support MIT-SHM")
+
+        self._xlib, self._xext, self._libc = xlib, xext, libc
+        # XDestroyImage is only a macro on very old libX11 builds
+        self._destroy_image = getattr(xlib, "XDestroyImage", None)
+        self.display = display
+        self.screen = xlib.XDefaultScreen(display)
+        self.root = xlib.XDefaultRootWindow(display)
+
+    def get_screen_size(self):
+        self._open()
+        return (
+            self._xlib.XDisplayWidth(self.display, self.screen),
+            self._xlib.XDisplayHeight(self.display, self.screen),
+        )
+
+    def _get_segment(self, width, height):
+        """Get (or create) the shared-memory image for a capture size"""
+        key = (width, height)
+        if key in self.segments:
+            self.segments.move_to_end(key)
+            return self.segments[key]
+
+        if len(self.segments) >= self._MAX_SEGMENTS:
+            self._release_segment(*self.segments.popitem(last=False))
+
+        xlib, xext, libc = self._xlib, self._xext, self._libc
+        shminfo = _XShmSegmentInfo()
+        ximage = xext.XShmCreateImage(
+            self.display, xlib.XDefaultVisual(self.display, self.screen),
+            xlib.XDefaultDepth(self.display, self.screen), self._ZPIXMAP,
+            None, ctypes.byref(shminfo), width, height,
+        )
+        if not ximage:
+            raise RuntimeError("XShmCreateImage failed")
+        if ximage.contents.bits_per_pixel != 32:
+            raise RuntimeError(f"Unsupported pixel depth: {ximage.contents.bits_per_pixel} bpp")
+
+        stride = ximage.contents.bytes_per_line
+        nbytes = stride * height
+        shminfo.shmid = libc.shmget(self._IPC_PRIVATE, nbytes, self._IPC_CREAT | 0o600)
+        if shminfo.shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        shminfo.shmaddr = libc.shmat(shminfo.shmid, None, 0)
+        shminfo.readOnly = 0
+        ximage.contents.data = shminfo.shmaddr
+
+        xext.XShmAttach(self.display, ctypes.byref(shminfo))
+        xlib.XSync(self.display, 0)
+        # Mark for removal now so the segment can't leak if we crash
+        libc.shmctl(shminfo.shmid, self._IPC_RMID, None)
+
+        raw = (ctypes.c_ubyte * nbytes).from_address(shminfo.shmaddr)
+        buffer = np.ctypeslib.as_array(raw).reshape(height, stride)
+        self.bytes_allocated += nbytes
+
+        segment = (ximage, shminfo, buffer)
+        self.segments[key] = segment
+        return segment
+
+    def _release_segment(self, key, segment):
+        ximage, shminfo, buffer = segment
+        try:
+            self._xext.XShmDetach(self.display, ctypes.byref(shminfo))
+            ximage.contents.data = None
+            if self._destroy_image:
+                self._destroy_image(ximage)
+            self._libc.shmdt(ctypes.c_void_p(shminfo.shmaddr))
+        except Exception as e:
+            print(f"Error releasing capture segment {key}: {e}")
+
+    def grab(self, region=None):
+        self._open()
+        if region:
+            left, top, right, bottom = region
+        else:
+            left, top = 0, 0
+            right, bottom = self.get_screen_size()
+        width, height = right - left, bottom - top
+
+        ximage, shminfo, buffer = self._get_segment(width, height)
+        if not self._xext.XShmGetImage(self.display, self.root, ximage, left, top, self._ALL_PLANES):
+            raise RuntimeError("XShmGetImage failed")
+        return Frame(buffer, width, height, region, rawmode="BGRX")
+
+    def close(self):
+        if not self.display:
+            return
+        for key, segment in list(self.segments.items()):
+            self._release_segment(key, segment)
+        self.segments.clear()
+        self._xlib.XCloseDisplay(self.display)
+        self.display = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class FakeCaptureBackend(CaptureBackend):
+    """Synthetic capture backend for tests and benchmarks without a display"""
+
+    name = "fake"
+
+    def __init__(self, screen_size=(1920, 1080)):
+        super().__init__()
+        self.screen_size = screen_size
+        self.grab_count = 0
+        width, height = screen_size
+        # Deterministic gradient "desktop" that grabs are copied out of
+        self.desktop = np.zeros((height, width, 4), dtype=np.uint8)
+        self.desktop[..., 0] = (np.arange(width) % 256)[None, :]
+        self.desktop[..., 1] = (np.arange(height) % 256)[:, None]
+        self.buffers = {}
+
+    def is_available(self):
+        return True
+
+    def get_screen_size(self):
+        return self.screen_size
+
+    def grab(self, region=None):
+        left, top, right, bottom = region or (0, 0) + tuple(self.screen_size)
+        width, height = right - left, bottom - top
+
+        buffer = self.buffers.get((width, height))
+        if buffer is None:
+            buffer = np.empty((height, width * 4), dtype=np.uint8)
+            self.buffers[(width, height)] = buffer
+            self.bytes_allocated += buffer.nbytes
+
+        np.copyto(buffer.reshape(height, width, 4), self.desktop[top:bottom, left:right])
+        self.grab_count += 1
+        return Frame(buffer, width, height, region, rawmode="BGRX")
+
+
+CAPTURE_BACKENDS = {
+    "xshm": XShmCaptureBackend,
+    "pil": PILCaptureBackend,
+    "fake": FakeCaptureBackend,
+}
+
+
+def get_capture_backend(name=None):
+    """Get a capture backend by name, or the fastest available one
+
+    Args:
+        name (str, optional): Backend name, or None to use SCREEN_CAPTURE_BACKEND / auto-detect
+
+    Returns:
+        CaptureBackend: Capture backend instance
+    """
+    name = name or os.getenv("SCREEN_CAPTURE_BACKEND")
+    if name in CAPTURE_BACKENDS:
+        return CAPTURE_BACKENDS[name]()
+    if name:
+        print(f"Unknown capture backend '{name}' (expected one of {', '.join(CAPTURE_BACKENDS)}), auto-detecting")
+
+    backend = XShmCaptureBackend()
+    if backend.is_available():
+        return backend
+    return PILCaptureBackend()
@@ -5,18 +5,52 @@ import tempfile
 import pyautogui
 import pyperclip
 import time
-import google.generativeai as genai
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from screen_regions import RegionResolver
+from screen_capture import Frame, get_capture_backend
+from llm_cache import ResponseCache, make_cache_key
+from code_chunker import split_code
+from llm_client import get_llm_client
+from clipboard_watcher import ClipboardWatcher
+from ocr_index import OCRIndex, parse_tesseract_data
 
 class ScreenReader:
-    def __init__(self, gemini_api_key=None):
+    # Bump a version when its prompt template changes so old cached answers aren't reused
+    PROMPT_VERSIONS = {
+        "analyze": "1",
+        "debug": "1",
+        "summarize": "1",
+        "analyze_chunk": "1",
+        "reduce": "1",
+    }
+    
+    # Placed in the clipboard before copying so a selection equal to the old clipboard still registers
+    CLIPBOARD_MARKER = "\u200bGRACE selection marker\u200b"
+    
+    def __init__(self, gemini_api_key=None, region_resolver=None, capture_backend=None, response_cache=None,
+                 gemini_model=None, chunk_size=None, max_chunk_workers=None):
         """Initialize screen reader
         
         Args:
             gemini_api_key (str, optional): API key for Gemini AI
+            region_resolver (RegionResolver, optional): Resolver for named screen regions
+            capture_backend (CaptureBackend, optional): Screen capture backend, or None to auto-detect
+            response_cache (ResponseCache, optional): Cache for Gemini results, or None for the default on-disk cache
+            gemini_model (object, optional): Preconfigured model with generate_content(), e.g. a GeminiRestModel
+            chunk_size (int, optional): Code larger than this many characters is analyzed in chunks
+            max_chunk_workers (int, optional): Maximum chunks analyzed concurrently
         """
         self.temp_files = []
+        self.chunk_size = chunk_size or int(os.getenv("ANALYZE_CHUNK_SIZE", "6000"))
+        self.max_chunk_workers = max_chunk_workers or int(os.getenv("ANALYZE_CHUNK_WORKERS", "4"))
+        self.last_chunk_timings = []
+        self.clipboard_watcher = ClipboardWatcher(paste=pyperclip.paste)
+        self.text_index = OCRIndex()
+        self.region_resolver = region_resolver or RegionResolver()
+        self.capture_backend = capture_backend or get_capture_backend()
+        print(f"Using screen capture backend: {self.capture_backend.name}")
         
         # Check if Tesseract is properly installed and configured
         try:
@@ -43,11 +77,13 @@ class ScreenReader:
             print("Install Tesseract OCR from: https://github.com/UB-Mannheim/tesseract/wiki")
         
         # Set up Gemini if API key provided
-        self.gemini_model = None
-        if gemini_api_key:
+        self.gemini_model = gemini_model
+        self.gemini_model_name = getattr(gemini_model, 'model_name', 'gemini-pro')
+        self.response_cache = response_cache or ResponseCache()
+        if gemini_api_key and not gemini_model:
             try:
-                genai.configure(api_key=gemini_api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-pro')
+                # Shared client with connection reuse, deadlines, retries and a circuit breaker
+                self.gemini_model = get_llm_client(gemini_api_key, self.gemini_model_name)
                 print("Successfully connected to Gemini AI")
             except Exception as e:
                 print(f"Error setting up Gemini: {e}")
@@ -62,6 +98,17 @@ class ScreenReader:
             except:
                 pass
     
+    def capture_frame(self, region=None):
+        """Capture the screen or a region of it into the backend's reusable buffer
+        
+        Args:
+            region (tuple, optional): Region to capture (left, top, right, bottom)
+            
+        Returns:
+            Frame: Captured frame, valid until the next capture of the same size
+        """
+        return self.capture_backend.grab(region)
+    
     def capture_screen(self, region=None):
         """Capture the screen or a region of it
         
@@ -71,6 +118,13 @@ class ScreenReader:
         Returns:
             PIL.Image: Captured image
         """
+        try:
+            screenshot = self.capture_frame(region).to_image()
+            print(f"Screen captured: {screenshot.size[0]}x{screenshot.size[1]} pixels")
+            return screenshot
+        except Exception as e:
+            print(f"Error capturing screen with {self.capture_backend.name} backend: {e}")
+        
         try:
             if region:
                 screenshot = ImageGrab.grab(bbox=region)
@@ -85,7 +139,11 @@ class ScreenReader:
             
             # Alternative method using pyautogui as fallback
             try:
-                screenshot = pyautogui.screenshot()
+                if region:
+                    left, top, right, bottom = region
+                    screenshot = pyautogui.screenshot(region=(left, top, right - left, bottom - top))
+                else:
+                    screenshot = pyautogui.screenshot()
                 print(f"Screen captured using fallback method: {screenshot.size[0]}x{screenshot.size[1]} pixels")
                 return screenshot
             except Exception as fallback_error:
@@ -93,6 +151,24 @@ class ScreenReader:
                 # Return a blank image as last resort
                 return Image.new('RGB', (800, 600), color='white')
     
+    def resolve_region(self, phrase):
+        """Resolve a spoken region such as "top half" or "active window"
+        
+        Args:
+            phrase (str): Region phrase from the command
+            
+        Returns:
+            tuple: (left, top, right, bottom), or None for the full screen
+        """
+        try:
+            region = self.region_resolver.resolve(phrase)
+            if region:
+                print(f"Resolved region '{phrase}' to {region}")
+            return region
+        except Exception as e:
+            print(f"Error resolving region '{phrase}': {e}")
+            return None
+    
     def save_screenshot(self, image, filename=None):
         """Save screenshot to file
         
@@ -121,7 +197,7 @@ class ScreenReader:
         """Extract text from image using OCR
         
         Args:
-            image (PIL.Image or str): Image or path to image
+            image (PIL.Image, Frame or str): Image, captured frame or path to image
             
         Returns:
             str: Extracted text
@@ -129,6 +205,8 @@ class ScreenReader:
         try:
             if isinstance(image, str):
                 image = Image.open(image)
+            elif isinstance(image, Frame):
+                image = image.to_image()
             
             # Try to extract text using Tesseract OCR
             text = pytesseract.image_to_string(image)
@@ -147,6 +225,55 @@ class ScreenReader:
             print("Make sure Tesseract OCR is properly installed")
             return "Error: Could not extract text from screen. Make sure Tesseract OCR is installed."
     
+    def scan_screen_text(self, region=None, image=None):
+        """OCR the screen into word boxes and refresh the text index for that region
+        
+        Args:
+            region (tuple, optional): Region to scan (left, top, right, bottom), or None for the full screen
+            image (PIL.Image, optional): Already captured image of the region
+            
+        Returns:
+            str: Text rebuilt from the recognised lines
+        """
+        if image is None:
+            image = self.capture_screen(region)
+        
+        start = time.perf_counter()
+        data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        offset = region[:2] if region else (0, 0)
+        lines = parse_tesseract_data(data, offset=offset, min_conf=30)
+        self.text_index.update(lines, region)
+        print(f"OCR indexed {sum(len(line) for line in lines)} words in {time.perf_counter() - start:.2f}s")
+        return self.text_index.text(region)
+    
+    def find_text_on_screen(self, label, region=None, max_age=5.0):
+        """Find where a label appears on screen
+        
+        Looks the label up in the existing text index first and only rescans the
+        screen when the index is stale or the label isn't found.
+        
+        Args:
+            label (str): Text to look for, e.g. "save" or "sign in"
+            region (tuple, optional): Only search this region
+            max_age (float): Seconds an index is trusted before rescanning
+            
+        Returns:
+            TextMatch: Best match with .text, .box and .center, or None
+        """
+        try:
+            age = self.text_index.age()
+            if age is not None and age < max_age:
+                match = self.text_index.find(label, region=region)
+                if match:
+                    return match
+            
+            self.scan_screen_text(region)
+            return self.text_index.find(label, region=region)
+        except Exception as e:
+            print(f"Error finding '{label}' on screen: {e}")
+            print(f"Detailed error: {traceback.format_exc()}")
+            return None
+    
     def read_screen_text(self, region=None):
         """Capture screen and extract text
         
@@ -160,18 +287,16 @@ class ScreenReader:
             print("Capturing screen...")
             screenshot = self.capture_screen(region)
             
-            # Save screenshot temporarily for better OCR
-            temp_path = self.save_screenshot(screenshot)
-            
+            # OCR the in-memory image into word boxes so a following "click on" can reuse them
             print("Extracting text from screen...")
-            text = self.extract_text_from_image(temp_path)
-            
-            # Clean up temp file if it exists
-            if temp_path and os.path.exists(temp_path):
-                os.unlink(temp_path)
-                self.temp_files.remove(temp_path)
-            
-            return text
+            try:
+                text = self.scan_screen_text(region, image=screenshot)
+                if text.strip():
+                    print(f"OCR extracted {len(text)} characters")
+                    return text
+            except Exception as e:
+                print(f"Error indexing screen text: {e}")
+            return self.extract_text_from_image(screenshot)
         except Exception as e:
             print(f"Error reading screen text: {e}")
             print(f"Detailed error: {traceback.format_exc()}")
@@ -187,16 +312,22 @@ class ScreenReader:
             # Save current clipboard content
             current_clipboard = pyperclip.paste()
             
-            # Copy selected text to clipboard
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(0.5)  # Wait for clipboard to update
+            # Without an OS change counter we detect the copy by content, so clear it first
+            if self.clipboard_watcher.sequence_source is None:
+                pyperclip.copy(self.CLIPBOARD_MARKER)
             
-            # Get text from clipboard
-            text = pyperclip.paste()
+            # Copy selected text and return as soon as the clipboard updates
+            start = time.perf_counter()
+            changed, text = self.clipboard_watcher.copy_and_wait(
+                lambda: pyautogui.hotkey('ctrl', 'c'), timeout=1.0
+            )
             
-            # If text is the same as before, selection might have failed
-            if text == current_clipboard:
+            # If the clipboard never changed, selection might have failed
+            if not changed or text == self.CLIPBOARD_MARKER:
                 print("Warning: Selected text may not have been copied correctly")
+                text = ""
+            else:
+                print(f"Clipboard updated after {(time.perf_counter() - start) * 1000:.0f} ms")
             
             print(f"Got selected text: {len(text)} characters")
             
@@ -208,6 +339,247 @@ class ScreenReader:
             print(f"Error getting selected text: {e}")
             return ""
     
+    def _build_prompt(self, operation, text):
+        """Build the Gemini prompt for an operation
+        
+        Args:
+            operation (str): "analyze", "debug" or "summarize"
+            text (str): Code or text to include
+            
+        Returns:
+            str: Prompt
+        """
+        if operation == "analyze":
+            return f"""
+            Please analyze this code and provide a brief explanation of what it does.
+            Focus on the main functionality, structure, and any notable patterns or issues.
+            
+            CODE:
+            ```
+            {text}
+            ```
+            """
+        if operation == "debug":
+            return f"""
+            Please debug this code, identify any errors or potential issues, and suggest fixes.
+            Focus on logical errors, edge cases, performance issues, and best practices.
+            
+            CODE:
+            ```
+            {text}
+            ```
+            """
+        if operation == "analyze_chunk":
+            return f"""
+            This is one part of a larger file. Briefly explain what the code in this part does.
+            Mention the functions and classes it defines and any notable patterns or issues.
+            
+            CODE:
+            ```
+            {text}
+            ```
+            """
+        if operation == "reduce":
+            return f"""
+            Below are analyses of consecutive parts of one code file.
+            Combine them into a single brief explanation of what the whole file does.
+            Focus on the main functionality, structure, and any notable patterns or issues.
+            
+            PART ANALYSES:
+            {text}
+            """
+        return f"""
+            Please summarize the following text concisely, capturing the main points:
+            
+            {text}
+            """
+    
+    def _generate(self, operation, text, prompt):
+        """Get a Gemini response, serving repeats of the same input from the cache
+        
+        Args:
+            operation (str): Operation name used in the cache key
+            text (str): User input the prompt was built from
+            prompt (str): Full prompt to send
+            
+        Returns:
+            str: Response text
+        """
+        key = make_cache_key(operation, self.gemini_model_name, self.PROMPT_VERSIONS[operation], text)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            print(f"Using cached {operation} result ({self.response_cache.stats()['hit_rate']:.0%} hit rate)")
+            return cached
+        
+        response = self.gemini_model.generate_content(prompt)
+        result = response.text.strip()
+        if result:
+            self.response_cache.put(key, result, operation)
+        return result
+    
+    def _generate_stream(self, operation, text, empty_message):
+        """Stream a Gemini response for an operation as text chunks
+        
+        Cached results are yielded as a single chunk. The full streamed
+        response is cached once it completes.
+        
+        Args:
+            operation (str): "analyze", "debug" or "summarize"
+            text (str): Code or text to send
+            empty_message (str): Message to yield when there is no input
+            
+        Yields:
+            str: Response text chunks
+        """
+        if not self.gemini_model:
+            print("Warning: Gemini AI is not available. Please provide an API key.")
+            yield "Gemini AI is not available. Please provide an API key."
+            return
+        
+        if not text.strip():
+            print(f"Warning: No input provided for {operation}")
+            yield empty_message
+            return
+        
+        key = make_cache_key(operation, self.gemini_model_name, self.PROMPT_VERSIONS[operation], text)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            print(f"Using cached {operation} result")
+            yield cached
+            return
+        
+        parts = []
+        try:
+            print(f"Streaming {operation} from Gemini AI ({len(text)} characters)...")
+            prompt = self._build_prompt(operation, text)
+            for chunk in self.gemini_model.generate_content(prompt, stream=True):
+                chunk_text = chunk.text
+                if chunk_text:
+                    parts.append(chunk_text)
+                    yield chunk_text
+        except Exception as e:
+            print(f"Error streaming {operation}: {e}")
+            print(f"Detailed error: {traceback.format_exc()}")
+            yield f" Error during {operation}: {str(e)}"
+            return
+        
+        result = "".join(parts).strip()
+        print(f"Streamed {operation} complete: {len(result)} characters")
+        if result:
+            self.response_cache.put(key, result, operation)
+    
+    def analyze_code_stream(self, code):
+        """Analyze code using Gemini AI, yielding text as it is generated
+        
+        Large code is analyzed in chunks first and only the final merge is streamed.
+        
+        Args:
+            code (str): Code to analyze
+            
+        Yields:
+            str: Analysis text chunks
+        """
+        if self.gemini_model and len(code) > self.chunk_size:
+            try:
+                partials = self._analyze_chunks(code)
+            except Exception as e:
+                print(f"Chunked analysis failed, analyzing in one request: {e}")
+            else:
+                yield from self._generate_stream("reduce", partials, "No code was provided for analysis.")
+                return
+        yield from self._generate_stream("analyze", code, "No code was provided for analysis. Please select some code first.")
+    
+    def _analyze_chunks(self, code):
+        """Map step of chunked analysis: analyze each chunk concurrently
+        
+        Per-chunk timings are stored in self.last_chunk_timings.
+        
+        Args:
+            code (str): Code to analyze
+            
+        Returns:
+            str: Chunk analyses joined in order, ready for the reduce step
+        """
+        chunks = split_code(code, self.chunk_size)
+        print(f"Analyzing {len(chunks)} chunks with up to {self.max_chunk_workers} workers...")
+        
+        def analyze_chunk(index):
+            start = time.perf_counter()
+            try:
+                result = self._generate("analyze_chunk", chunks[index], self._build_prompt("analyze_chunk", chunks[index]))
+            except Exception as e:
+                print(f"Error analyzing chunk {index + 1}: {e}")
+                result = f"(This part could not be analyzed: {e})"
+            elapsed = time.perf_counter() - start
+            return result, {"chunk": index + 1, "characters": len(chunks[index]), "seconds": elapsed}
+        
+        with ThreadPoolExecutor(max_workers=self.max_chunk_workers) as executor:
+            results = list(executor.map(analyze_chunk, range(len(chunks))))
+        
+        self.last_chunk_timings = [timing for _, timing in results]
+        for timing in self.last_chunk_timings:
+            print(f"Chunk {timing['chunk']}/{len(chunks)}: {timing['characters']} chars in {timing['seconds']:.2f}s")
+        
+        return "\n\n".join(f"PART {i + 1}:\n{analysis}" for i, (analysis, _) in enumerate(results))
+    
+    def analyze_code_chunked(self, code):
+        """Analyze large code by analyzing chunks concurrently and merging the results
+        
+        Args:
+            code (str): Code to analyze
+            
+        Returns:
+            str: Merged analysis
+        """
+        if not self.gemini_model:
+            print("Warning: Gemini AI is not available. Please provide an API key.")
+            return "Gemini AI is not available. Please provide an API key."
+        
+        if not code.strip():
+            print("Warning: No code provided for analysis")
+            return "No code was provided for analysis. Please select some code first."
+        
+        try:
+            start = time.perf_counter()
+            partials = self._analyze_chunks(code)
+            result = self._generate("reduce", partials, self._build_prompt("reduce", partials))
+            print(f"Chunked analysis complete in {time.perf_counter() - start:.2f}s: {len(result)} characters")
+            return result
+        except Exception as e:
+            print(f"Error analyzing code in chunks: {e}")
+            print(f"Detailed error: {traceback.format_exc()}")
+            return f"Error analyzing code: {str(e)}"
+    
+    def debug_code_stream(self, code):
+        """Debug code using Gemini AI, yielding text as it is generated
+        
+        Args:
+            code (str): Code to debug
+            
+        Yields:
+            str: Debugging text chunks
+        """
+        return self._generate_stream("debug", code, "No code was provided for debugging. Please select some code first.")
+    
+    def summarize_text_stream(self, text):
+        """Summarize text using Gemini AI, yielding text as it is generated
+        
+        Args:
+            text (str): Text to summarize
+            
+        Yields:
+            str: Summary text chunks
+        """
+        return self._generate_stream("summarize", text, "No text was provided for summarization.")
+    
+    def get_cache_stats(self):
+        """Get hit/miss counters for the Gemini response cache
+        
+        Returns:
+            dict: Cache statistics
+        """
+        return self.response_cache.stats()
+    
     def analyze_code(self, code):
         """Analyze code using Gemini AI
         
@@ -225,20 +597,13 @@ class ScreenReader:
             print("Warning: No code provided for analysis")
             return "No code was provided for analysis. Please select some code first."
         
+        if len(code) > self.chunk_size:
+            return self.analyze_code_chunked(code)
+        
         try:
             print(f"Analyzing code with Gemini AI ({len(code)} characters)...")
-            prompt = f"""
-            Please analyze this code and provide a brief explanation of what it does.
-            Focus on the main functionality, structure, and any notable patterns or issues.
-            
-            CODE:
-            ```
-            {code}
-            ```
-            """
-            
-            response = self.gemini_model.generate_content(prompt)
-            result = response.text.strip()
+            prompt = self._build_prompt("analyze", code)
+            result = self._generate("analyze", code, prompt)
             print(f"Analysis complete: {len(result)} characters")
             return result
         except Exception as e:
@@ -265,18 +630,8 @@ class ScreenReader:
         
         try:
             print(f"Debugging code with Gemini AI ({len(code)} characters)...")
-            prompt = f"""
-            Please debug this code, identify any errors or potential issues, and suggest fixes.
-            Focus on logical errors, edge cases, performance issues, and best practices.
-            
-            CODE:
-            ```
-            {code}
-            ```
-            """
-            
-            response = self.gemini_model.generate_content(prompt)
-            result = response.text.strip()
+            prompt = self._build_prompt("debug", code)
+            result = self._generate("debug", code, prompt)
             print(f"Debug analysis complete: {len(result)} characters")
             return result
         except Exception as e:
@@ -303,14 +658,8 @@ class ScreenReader:
         
         try:
             print(f"Summarizing text with Gemini AI ({len(text)} characters)...")
-            prompt = f"""
-            Please summarize the following text concisely, capturing the main points:
-            
-            {text}
-            """
-            
-            response = self.gemini_model.generate_content(prompt)
-            result = response.text.strip()
+            prompt = self._build_prompt("summarize", text)
+            result = self._generate("summarize", text, prompt)
             print(f"Summarization complete: {len(result)} characters")
             return result
         except Exception as e:
@@ -0,0 +1,261 @@
+import os
+import re
+import json
+import shutil
+import subprocess
+
+
+# Named regions expressed as fractions of the screen (left, top, right, bottom)
+NAMED_REGIONS = {
+    "top half": (0.0, 0.0, 1.0, 0.5),
+    "upper half": (0.0, 0.0, 1.0, 0.5),
+    "bottom half": (0.0, 0.5, 1.0, 1.0),
+    "lower half": (0.0, 0.5, 1.0, 1.0),
+    "left half": (0.0, 0.0, 0.5, 1.0),
+    "left pane": (0.0, 0.0, 0.5, 1.0),
+    "left side": (0.0, 0.0, 0.5, 1.0),
+    "right half": (0.5, 0.0, 1.0, 1.0),
+    "right pane": (0.5, 0.0, 1.0, 1.0),
+    "right side": (0.5, 0.0, 1.0, 1.0),
+    "top left": (0.0, 0.0, 0.5, 0.5),
+    "top right": (0.5, 0.0, 1.0, 0.5),
+    "bottom left": (0.0, 0.5, 0.5, 1.0),
+    "bottom right": (0.5, 0.5, 1.0, 1.0),
+    "center": (0.25, 0.25, 0.75, 0.75),
+    "middle": (0.25, 0.25, 0.75, 0.75),
+}
+
+# Phrases that refer to the currently focused window
+WINDOW_PHRASES = ("active window", "focused window", "current window", "this window", "window")
+
+
+class X11WindowBackend:
+    """Resolve the active window and screen size using xdotool/xdpyinfo"""
+
+    name = "x11"
+
+    def __init__(self):
+        self.xdotool = shutil.which("xdotool")
+        self.xdpyinfo = shutil.which("xdpyinfo")
+
+    def is_available(self):
+        return bool(os.environ.get("DISPLAY")) and self.xdotool is not None
+
+    def get_active_window(self):
+        """Get the bounding box of the focused window
+
+        Returns:
+            tuple: (left, top, right, bottom) or None if it can't be determined
+        """
+        try:
+            result = subprocess.run(
+                [self.xdotool, "getactivewindow", "getwindowgeometry", "--shell"],
+                capture_output=True, text=True, timeout=1
+            )
+            values = dict(
+                line.split("=", 1) for line in result.stdout.splitlines() if "=" in line
+            )
+            x, y = int(values["X"]), int(values["Y"])
+            width, height = int(values["WIDTH"]), int(values["HEIGHT"])
+            return (x, y, x + width, y + height)
+        except Exception as e:
+            print(f"Could not get active window from xdotool: {e}")
+            return None
+
+    def get_screen_size(self):
+        """Get the screen size
+
+        Returns:
+            tuple: (width, height) or None if it can't be determined
+        """
+        if self.xdpyinfo is None:
+            return None
+        try:
+            result = subprocess.run([self.xdpyinfo], capture_output=True, text=True, timeout=1)
+            match = re.search(r"dimensions:\s+(\d+)x(\d+)", result.stdout)
+            if match:
+                return (int(match.group(1)), int(match.group(2)))
+        except Exception as e:
+            print(f"Could not get screen size from xdpyinfo: {e}")
+        return None
+
+
+class SwayWindowBackend:
+    """Resolve the active window and screen size on Wayland (sway/wlroots)"""
+
+    name = "sway"
+
+    def __init__(self):
+        self.swaymsg = shutil.which("swaymsg")
+
+    def is_available(self):
+        return bool(os.environ.get("WAYLAND_DISPLAY")) and self.swaymsg is not None
+
+    def _query(self, kind):
+        result = subprocess.run(
+            [self.swaymsg, "-t", kind, "-r"], capture_output=True, text=True, timeout=1
+        )
+        return json.loads(result.stdout)
+
+    def get_active_window(self):
+        try:
+            stack = [self._query("get_tree")]
+            while stack:
+                node = stack.pop()
+                if node.get("focused") and node.get("type") in ("con", "floating_con"):
+                    rect = node["rect"]
+                    return (rect["x"], rect["y"], rect["x"] + rect["width"], rect["y"] + rect["height"])
+                stack.extend(node.get("nodes", []))
+                stack.extend(node.get("floating_nodes", []))
+        except Exception as e:
+            print(f"Could not get active window from swaymsg: {e}")
+        return None
+
+    def get_screen_size(self):
+        try:
+            for output in self._query("get_outputs"):
+                if output.get("focused"):
+                    rect = output["rect"]
+                    return (rect["width"], rect["height"])
+        except Exception as e:
+            print(f"Could not get screen size from swaymsg: {e}")
+        return None
+
+
+class HyprlandWindowBackend:
+    """Resolve the active window and screen size on Wayland (Hyprland)"""
+
+    name = "hyprland"
+
+    def __init__(self):
+        self.hyprctl = shutil.which("hyprctl")
+
+    def is_available(self):
+        return bool(os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")) and self.hyprctl is not None
+
+    def _query(self, kind):
+        result = subprocess.run([self.hyprctl, kind, "-j"], capture_output=True, text=True, timeout=1)
+        return json.loads(result.stdout)
+
+    def get_active_window(self):
+        try:
+            window = self._query("activewindow")
+            x, y = window["at"]
+            width, height = window["size"]
+            return (x, y, x + width, y + height)
+        except Exception as e:
+            print(f"Could not get active window from hyprctl: {e}")
+            return None
+
+    def get_screen_size(self):
+        try:
+            for monitor in self._query("monitors"):
+                if monitor.get("focused"):
+                    return (monitor["width"], monitor["height"])
+        except Exception as e:
+            print(f"Could not get screen size from hyprctl: {e}")
+        return None
+
+
+class StaticWindowBackend:
+    """Backend with fixed values, used in tests and as a last resort"""
+
+    name = "static"
+
+    def __init__(self, screen_size=None, active_window=None):
+        self.screen_size = screen_size
+        self.active_window = active_window
+
+    def is_available(self):
+        return True
+
+    def get_active_window(self):
+        return self.active_window
+
+    def get_screen_size(self):
+        return self.screen_size
+
+
+def detect_window_backend():
+    """Pick the first window backend that works on this system
+
+    Returns:
+        object: Window backend instance
+    """
+    for backend_class in (HyprlandWindowBackend, SwayWindowBackend, X11WindowBackend):
+        backend = backend_class()
+        if backend.is_available():
+            return backend
+    return StaticWindowBackend()
+
+
+class RegionResolver:
+    def __init__(self, backend=None, screen_size=None):
+        """Initialize region resolver
+
+        Args:
+            backend (object, optional): Window backend, or None to auto-detect
+            screen_size (tuple, optional): (width, height) to use if the backend can't report it
+        """
+        self.backend = backend or detect_window_backend()
+        self.screen_size = screen_size
+
+    def get_screen_size(self):
+        """Get the screen size from the backend, falling back to pyautogui
+
+        Returns:
+            tuple: (width, height) or None
+        """
+        size = self.backend.get_screen_size() or self.screen_size
+        if size is None:
+            try:
+                import pyautogui
+                size = tuple(pyautogui.size())
+            except Exception as e:
+                print(f"Could not determine screen size: {e}")
+                return None
+        self.screen_size = size
+        return size
+
+    def resolve(self, phrase):
+        """Resolve a spoken region phrase to a bounding box
+
+        Args:
+            phrase (str): Text such as "top half", "left pane" or "active window"
+
+        Returns:
+            tuple: (left, top, right, bottom), or None for the full screen
+        """
+        if not phrase:
+            return None
+        phrase = " ".join(phrase.lower().split())
+
+        # Longest names first so "top left" wins over "top"
+        for name in sorted(NAMED_REGIONS, key=len, reverse=True):
+            if name in phrase:
+                size = self.get_screen_size()
+                if size is None:
+                    return None
+                left, top, right, bottom = NAMED_REGIONS[name]
+                width, height = size
+                return (int(left * width), int(top * height), int(right * width), int(bottom * height))
+
+        for name in WINDOW_PHRASES:
+            if re.search(rf"\b{name}\b", phrase):
+                return self._clip(self.backend.get_active_window())
+
+        return None
+
+    def _clip(self, box):
+        """Clip a bounding box to the screen so off-screen window edges aren't grabbed"""
+        if box is None:
+            return None
+        left, top, right, bottom = box
+        size = self.get_screen_size()
+        if size is not None:
+            width, height = size
+            left, top = max(0, left), max(0, top)
+            right, bottom = min(width, right), min(height, bottom)
+        if right <= left or bottom <= top:
+            return None
+        return (left, top, right, bottom)
@@ -0,0 +1,240 @@
+import os
+import time
+import queue
+import hashlib
+import threading
+
+DEFAULT_SCREENSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
+
+# File extension and PIL format name for each supported output format
+FORMATS = {
+    "png": (".png", "PNG"),
+    "webp": (".webp", "WEBP"),
+    "jpeg": (".jpg", "JPEG"),
+}
+
+# Other names people use for the supported formats
+FORMAT_ALIASES = {"jpg": "jpeg"}
+
+
+class ScreenshotJob:
+    """A screenshot queued for encoding
+
+    path is final as soon as the job is created, so callers can report it
+    straight away; done is set once the file has been written.
+    """
+
+    def __init__(self, path, image, digest, duplicate=False):
+        self.path = path
+        self.image = image
+        self.digest = digest
+        self.duplicate = duplicate
+        self.error = None
+        self.done = threading.Event()
+        self.submitted_at = time.monotonic()
+        self.encode_time = None
+
+    def wait(self, timeout=None):
+        """Wait for the file to be written
+
+        Returns:
+            bool: True if it was written successfully
+        """
+        return self.done.wait(timeout) and self.error is None
+
+
+class ScreenshotWriter:
+    """Encode and save screenshots on a background thread
+
+    The caller captures and hashes the frame; encoding and writing happen on
+    a worker, so a screenshot command returns immediately. A frame identical
+    to the previous one reuses the previous file. After writing, old files
+    are swept so the directory stays within count, size and age limits.
+    """
+
+    def __init__(self, directory=DEFAULT_SCREENSHOT_DIR, image_format="png", png_compress_level=1,
+                 quality=85, max_files=200, max_bytes=500 * 1024 * 1024, max_age_days=30,
+                 sweep_interval=60.0):
+        """Initialize screenshot writer
+
+        Args:
+            directory (str): Folder screenshots are saved in
+            image_format (str): "png", "webp" or "jpeg" ("jpg" also works); anything
+                else falls back to PNG with a warning
+            png_compress_level (int): zlib level for PNG (0-9); low levels are much faster
+            quality (int): WebP/JPEG quality (1-100)
+            max_files (int, optional): Keep at most this many screenshots
+            max_bytes (int, optional): Keep at most this many bytes of screenshots
+            max_age_days (float, optional): Delete screenshots older than this
+            sweep_interval (float): Minimum seconds between retention sweeps
+        """
+        image_format = FORMAT_ALIASES.get(image_format.lower(), image_format.lower())
+        if image_format not in FORMATS:
+            print(f"Unsupported screenshot format '{image_format}' (expected one of "
+                  f"{', '.join(FORMATS)}), saving PNG instead")
+            image_format = "png"
+        self.directory = directory
+        self.image_format = image_format
+        self.png_compress_level = png_compress_level
+        self.quality = quality
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.sweep_interval = sweep_interval
+
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+        self.last_job = None
+        self.last_sweep = 0.0
+        # Paths of queued jobs, which don't exist on disk yet
+        self.reserved = set()
+
+    def _filename(self):
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        millis = int(time.time() * 1000) % 1000
+        extension = FORMATS[self.image_format][0]
+        path = os.path.join(self.directory, f"screenshot_{stamp}_{millis:03d}{extension}")
+        counter = 1
+        while os.path.exists(path) or path in self.reserved:
+            path = os.path.join(self.directory, f"screenshot_{stamp}_{millis:03d}_{counter}{extension}")
+            counter += 1
+        return path
+
+    def submit(self, image, filename=None):
+        """Queue a screenshot for saving
+
+        Args:
+            image (Frame or PIL.Image): Captured screen; frames are copied, since
+                capture backends reuse their buffers
+            filename (str, optional): File name inside the directory, default a timestamped name
+
+        Returns:
+            ScreenshotJob: Job with the final path
+        """
+        if hasattr(image, "buffer"):
+            image = image.copy()
+            pixels = image.buffer
+        else:
+            pixels = image.tobytes()
+        digest = hashlib.blake2b(memoryview(pixels), digest_size=16).digest()
+
+        with self.lock:
+            previous = self.last_job
+            if (filename is None and previous is not None and previous.digest == digest
+                    and previous.error is None and (not previous.done.is_set() or os.path.exists(previous.path))):
+                # Same screen as last time: point at the existing file instead of writing another
+                job = ScreenshotJob(previous.path, None, digest, duplicate=True)
+                job.done.set()
+                return job
+
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, filename) if filename else self._filename()
+            job = ScreenshotJob(path, image, digest)
+            self.reserved.add(path)
+            self.last_job = job
+            self.pending.put(job)
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+        return job
+
+    def flush(self, timeout=None):
+        """Wait until every queued screenshot has been written
+
+        Returns:
+            bool: True if the queue drained before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _save_options(self):
+        if self.image_format == "png":
+            return {"compress_level": self.png_compress_level}
+        if self.image_format == "webp":
+            return {"quality": self.quality, "method": 4}
+        return {"quality": self.quality, "optimize": False}
+
+    def _encode(self, job):
+        image = job.image.to_image() if hasattr(job.image, "to_image") else job.image
+        if self.image_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        # Write under a temporary name so a half-written file never has the final name
+        temp_path = job.path + ".part"
+        image.save(temp_path, FORMATS[self.image_format][1], **self._save_options())
+        os.replace(temp_path, job.path)
+
+    def _run(self):
+        while True:
+            try:
+                job = self.pending.get(timeout=5.0)
+            except queue.Empty:
+                # Exit when idle; submit() starts a new worker
+                with self.lock:
+                    if self.pending.empty():
+                        self.worker = None
+                        return
+                continue
+
+            start = time.perf_counter()
+            try:
+                self._encode(job)
+                job.encode_time = time.perf_counter() - start
+                print(f"Screenshot saved to {job.path} ({job.encode_time * 1000:.0f} ms)")
+            except Exception as e:
+                job.error = e
+                print(f"Error saving screenshot {job.path}: {e}")
+            finally:
+                job.image = None
+                with self.lock:
+                    self.reserved.discard(job.path)
+                job.done.set()
+
+            if time.monotonic() - self.last_sweep >= self.sweep_interval:
+                self.sweep()
+            self.pending.task_done()
+
+    def sweep(self):
+        """Delete screenshots beyond the age, count and size limits, oldest first
+
+        Returns:
+            int: Number of files deleted
+        """
+        self.last_sweep = time.monotonic()
+        extensions = tuple(extension for extension, _ in FORMATS.values())
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("screenshot_") and entry.name.endswith(extensions) and entry.is_file():
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return 0
+        files.sort()
+
+        now = time.time()
+        total = sum(size for _, size, _ in files)
+        keep_path = self.last_job.path if self.last_job else None
+        deleted = 0
+        for mtime, size, path in files:
+            too_old = self.max_age_days is not None and now - mtime > self.max_age_days * 86400
+            too_many = self.max_files is not None and len(files) - deleted > self.max_files
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (too_old or too_many or too_big):
+                break
+            if path == keep_path:
+                continue
+            try:
+                os.remove(path)
+                deleted += 1
+                total -= size
+            except OSError as e:
+                print(f"Could not delete old screenshot {path}: {e}")
+        if deleted:
+            print(f"Removed {deleted} old screenshots")
+        return deleted
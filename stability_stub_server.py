@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Stability AI text-to-image API
+
+Answers /v1/generation/<engine>/text-to-image with a small PNG whose
+colour depends on the prompt, as raw image/png or as base64 JSON artifacts
+depending on the Accept header, so image generation can be tried and tested
+offline. It can also simulate slow generations and errors.
+
+Usage:
+    python stability_stub_server.py [--port 8766] [--latency 2.0] [--error-rate 0.2]
+"""
+
+import io
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+
+
+def render_prompt(prompt, size=(64, 64)):
+    """PNG bytes of a solid image coloured by the prompt's hash"""
+    color = tuple(hashlib.md5(prompt.encode("utf-8")).digest()[:3])
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        stub.requests.append({"path": self.path, "body": body, "headers": dict(self.headers)})
+
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_json(401, {"name": "unauthorized", "message": "Missing API key"})
+            return
+        error_status = stub.next_error()
+        if error_status:
+            self._send_json(error_status, {"name": "simulated_error", "message": "Simulated error"})
+            return
+        if not self.path.startswith("/v1/generation/") or not self.path.endswith("/text-to-image"):
+            self._send_json(404, {"name": "not_found", "message": "Not found"})
+            return
+
+        prompt = " ".join(item.get("text", "") for item in body.get("text_prompts", []))
+        image = render_prompt(prompt, stub.image_size)
+        if "image/png" in self.headers.get("Accept", "") and not stub.json_only:
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(image)))
+            self.end_headers()
+            self.wfile.write(image)
+            return
+        artifacts = [{"base64": base64.b64encode(image).decode("ascii"), "seed": 0, "finishReason": "SUCCESS"}
+                     for _ in range(body.get("samples", 1))]
+        self._send_json(200, {"artifacts": artifacts})
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StabilityStubServer:
+    def __init__(self, latency=0.0, error_rate=0.0, fail_first=0, error_status=500,
+                 image_size=(64, 64), json_only=False, host="127.0.0.1", port=0):
+        """Initialize stub server
+
+        Args:
+            latency (float): Seconds to wait before answering any request
+            error_rate (float): Probability (0-1) of answering with error_status
+            fail_first (int): Number of initial requests that always fail
+            error_status (int): HTTP status used for simulated errors
+            image_size (tuple): Size of the returned images
+            json_only (bool): Always answer with base64 JSON, ignoring Accept: image/png
+            host (str): Interface to bind
+            port (int): Port to bind, or 0 for any free port
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_status = error_status
+        self.image_size = image_size
+        self.json_only = json_only
+        self.requests = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.thread = None
+
+    def next_error(self):
+        """Decide whether the current request should fail
+
+        Returns:
+            int: HTTP status to fail with, or None to succeed
+        """
+        with self.lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return self.error_status
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a background thread
+
+        Returns:
+            str: Base URL to pass to StabilityClient
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Stability AI API stub server")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=2.0, help="Delay before answering each request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--size", type=int, default=512, help="Width and height of returned images")
+    args = parser.parse_args()
+
+    server = StabilityStubServer(latency=args.latency, error_rate=args.error_rate,
+                                 image_size=(args.size, args.size), port=args.port)
+    print(f"Stability stub server listening on {server.base_url}")
+    print(f"Point GRACE at it with: STABILITY_API_BASE={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStub server stopped")
+
+if __name__ == "__main__":
+    main()
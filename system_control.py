@@ -1,13 +1,28 @@
-import subprocess
 import os
+import sys
+import shutil
 import pyautogui
 import time
 import pyperclip
 import webbrowser
+from urllib.parse import quote
+from screen_capture import get_capture_backend
+from clipboard_watcher import ClipboardWatcher
+from app_catalogue import AppCatalogue, is_destructive, terminal_command
+from process_launcher import ProcessLauncher
+from ui_wait import wait_until, region_changed, region_stable, text_present
+from text_injection import TextInjector
+from whatsapp_queue import PartialSendError
+from input_backend import get_input_backend
+from screenshot_writer import ScreenshotWriter
 
 class SystemControl:
-    def __init__(self):
-        """Initialize system control module"""
+    def __init__(self, app_catalogue=None):
+        """Initialize system control module
+        
+        Args:
+            app_catalogue (AppCatalogue, optional): Installed application catalogue, or None for the default
+        """
         # Default applications dictionary
         self.applications = {
             "chrome": "chrome",
@@ -45,6 +60,37 @@ class SystemControl:
         # Store actions history
         self.action_history = []
         
+        # Screen capture backend, created on first screenshot
+        self.capture_backend = None
+        
+        # Whether the Tesseract binary works, checked on the first OCR wait
+        self.ocr_available = None
+        
+        # Encodes screenshots in the background and keeps the folder within its limits
+        self.screenshot_writer = ScreenshotWriter(image_format=os.getenv("SCREENSHOT_FORMAT", "png").lower())
+        
+        # Detects clipboard updates so copies don't need a fixed sleep
+        self.clipboard_watcher = ClipboardWatcher(paste=pyperclip.paste)
+        
+        # Mouse and keyboard events (XTest on X11, pyautogui elsewhere), without per-call pauses
+        self.input = get_input_backend()
+        
+        # Picks key events or a clipboard paste for each piece of typed text
+        self.text_injector = TextInjector(write=self.input.write, hotkey=self.input.hotkey,
+                                          copy=pyperclip.copy, paste=pyperclip.paste)
+        
+        # Installed applications, scanned in the background so startup isn't delayed
+        self.app_catalogue = app_catalogue or AppCatalogue()
+        self.app_catalogue.load_async()
+        
+        # Starts apps without a shell and tracks when their windows appear
+        self.launcher = ProcessLauncher()
+        self.last_launch = None
+        
+        # WhatsApp client kept open between messages ("desktop", "web" or None)
+        self.whatsapp_session = None
+        self.whatsapp_session_used_at = 0.0
+        
     def open_application(self, app_name):
         """Open an application by name
         
@@ -74,7 +120,7 @@ class SystemControl:
                 try:
                     print(f"Trying WhatsApp location: {location}")
                     if os.path.exists(location):
-                        subprocess.Popen(location, shell=True)
+                        self._start([location], "WhatsApp")
                         self.action_history.append(f"Opened WhatsApp desktop app")
                         print(f"Successfully launched WhatsApp desktop app")
                         return True
@@ -85,7 +131,7 @@ class SystemControl:
             # If reached here, try Windows App URI launch for Microsoft Store apps
             try:
                 # Use Windows App URI to launch WhatsApp
-                subprocess.Popen(["explorer.exe", "whatsapp:"])
+                self._start(["explorer.exe", "whatsapp:"], "WhatsApp", broker=True)
                 self.action_history.append(f"Opened WhatsApp using Windows App URI")
                 print(f"Opened WhatsApp using Windows App URI")
                 return True
@@ -94,7 +140,7 @@ class SystemControl:
                 
             # If that fails, try the generic approach
             try:
-                os.system("start WhatsApp")
+                self._start_by_name("WhatsApp", "WhatsApp")
                 self.action_history.append(f"Opened WhatsApp using generic method")
                 print(f"Opened WhatsApp using generic method")
                 return True
@@ -122,11 +168,18 @@ class SystemControl:
         if app_name in websites:
             return self.open_url(websites[app_name])
         
+        # Look the app up in the catalogue of installed applications
+        entry = self.find_application(app_name)
+        if entry and self._launch_catalogue_entry(entry):
+            self.action_history.append(f"Opened {entry['name']}")
+            return True
+        
         # Check if it's a modern Windows app
         if app_name in self.modern_apps:
             app_command = self.modern_apps[app_name]
             try:
-                subprocess.Popen(app_command, shell=True)
+                argv = app_command.split()
+                self._start(argv, app_name, broker=(argv[0] == "explorer.exe"))
                 self.action_history.append(f"Opened modern app: {app_name}")
                 print(f"Successfully launched modern app: {app_name}")
                 return True
@@ -138,7 +191,7 @@ class SystemControl:
         if app_name in self.applications:
             app_command = self.applications[app_name]
             try:
-                subprocess.Popen(app_command, shell=True)
+                self._start([app_command], app_name)
                 self.action_history.append(f"Opened {app_name}")
                 print(f"Successfully launched {app_name}")
                 return True
@@ -147,7 +200,7 @@ class SystemControl:
                 
                 # Try alternate methods for common applications
                 try:
-                    os.system(f"start {app_command}")
+                    self._start_by_name(app_command, app_name)
                     self.action_history.append(f"Opened {app_name} (alternative method)")
                     print(f"Successfully launched {app_name} using alternative method")
                     return True
@@ -161,7 +214,7 @@ class SystemControl:
         
         # If we don't have a predefined command, try to open it directly
         try:
-            os.system(f"start {app_name}")
+            self._start_by_name(app_name, app_name)
             self.action_history.append(f"Opened {app_name}")
             print(f"Opened {app_name} using generic method")
             return True
@@ -169,6 +222,150 @@ class SystemControl:
             print(f"Generic open method failed: {e}")
             return False
     
+    def find_application(self, app_name):
+        """Find an installed application by spoken name
+        
+        Args:
+            app_name (str): Name of the application, e.g. "firefox" or "text editor"
+            
+        Returns:
+            dict: Catalogue entry, or None if nothing matches
+        """
+        try:
+            start = time.perf_counter()
+            entry = self.app_catalogue.find(app_name)
+            if not entry and app_name in self.applications:
+                # Try the executable name for aliases like "visual studio code" -> "code"
+                entry = self.app_catalogue.find(self.applications[app_name])
+            if entry:
+                print(f"Found {entry['name']} ({entry['source']}) in {(time.perf_counter() - start) * 1e6:.0f} us")
+            return entry
+        except Exception as e:
+            print(f"Error searching app catalogue: {e}")
+            return None
+    
+    def _launch_catalogue_entry(self, entry):
+        """Launch an application found in the catalogue
+        
+        Args:
+            entry (dict): Catalogue entry
+            
+        Returns:
+            bool: Success status
+        """
+        if is_destructive(entry):
+            print(f"Refusing to launch {entry['name']}: {entry['command'][0]} is on the denylist")
+            return False
+        try:
+            if entry["source"] == "startmenu":
+                os.startfile(entry["path"])
+                self.last_launch = self.launcher.track(entry["name"])
+            elif entry.get("terminal"):
+                # Console programs (htop, vim...) need a terminal window to run in
+                argv = terminal_command(entry["command"])
+                if argv is None:
+                    print(f"Can't open {entry['name']}: it needs a terminal and no terminal emulator was found")
+                    return False
+                self._start(argv, entry["name"])
+            else:
+                self._start(entry["command"], entry["name"])
+            print(f"Successfully launched {entry['name']}")
+            return True
+        except Exception as e:
+            print(f"Error launching {entry['name']}: {e}")
+            return False
+    
+    def _start(self, argv, name, broker=False):
+        """Launch a program without a shell and remember it for wait_for_app()"""
+        self.last_launch = self.launcher.launch(argv, name=name, broker=broker)
+        return self.last_launch
+    
+    def _start_by_name(self, target, name):
+        """Shell-free equivalent of `start <target>`
+        
+        Uses ShellExecute on Windows (which also searches App Paths) and a PATH
+        lookup elsewhere. Programs on the destructive-command denylist are refused.
+        """
+        if is_destructive({"command": [target]}):
+            raise PermissionError(f"{target} is on the denylist")
+        if os.name == "nt":
+            os.startfile(target)
+            self.last_launch = self.launcher.track(name)
+            return self.last_launch
+        
+        path = shutil.which(target)
+        if not path:
+            raise FileNotFoundError(f"{target} not found on PATH")
+        return self._start([path], name)
+    
+    def wait_for_app(self, timeout=10.0):
+        """Wait until the most recently opened app is ready for input
+        
+        Args:
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            bool: True if the app is ready (or nothing is starting)
+        """
+        handle = self.last_launch
+        if handle is None or handle.done:
+            return handle is None or handle.ready
+        print(f"Waiting for {handle.name} to open...")
+        return handle.wait_ready(timeout)
+    
+    def _launch_pending(self, within=5.0):
+        """Whether an app was launched in the last few seconds and isn't ready yet
+        
+        Args:
+            within (float): Seconds since the launch that still count as "just opened"
+        """
+        handle = self.last_launch
+        return (handle is not None and not handle.done
+                and time.monotonic() - handle.started_at <= within)
+    
+    def _grab(self, region=None):
+        """Capture the screen or a region as a Frame for wait conditions"""
+        if self.capture_backend is None:
+            self.capture_backend = get_capture_backend()
+        return self.capture_backend.grab(region)
+    
+    def wait_until(self, condition, timeout=10.0, interval=0.05, description=None):
+        """Wait until a UI condition holds, checking often at first and less later
+        
+        Conditions come from ui_wait: window_present, pixel_matches,
+        template_present, region_changed, region_stable and text_present.
+        
+        Args:
+            condition (callable): Returns a truthy value once the UI is ready
+            timeout (float): Maximum seconds to wait
+            interval (float): First polling interval in seconds
+            description (str, optional): What is being waited for, for logging
+            
+        Returns:
+            object: The condition's result, or None if it timed out
+        """
+        return wait_until(condition, timeout=timeout, interval=interval, description=description)
+    
+    def _wait_for_text(self, label, region, timeout=10.0, description=None):
+        """Wait for OCR to find a label in a region, or for the region to settle without OCR"""
+        if self._ocr_ready():
+            condition = text_present(self._grab, label, region)
+        else:
+            condition = region_stable(self._grab, region, settle=1.0)
+        return self.wait_until(condition, timeout=timeout, interval=0.25, description=description)
+    
+    def _ocr_ready(self):
+        """Whether pytesseract and the Tesseract binary are usable, probed once"""
+        if self.ocr_available is None:
+            try:
+                import pytesseract
+                pytesseract.get_tesseract_version()
+                self.ocr_available = True
+            except Exception as e:
+                print(f"OCR unavailable, waiting for screen regions to settle instead: {e}")
+                self.ocr_available = False
+        return self.ocr_available
+    
     def open_url(self, url):
         """Open a URL in the default browser
         
@@ -196,25 +393,17 @@ class SystemControl:
         Args:
             text (str): Text to type
         """
+        # If an app was just opened, type into it once its window is up
+        if self._launch_pending():
+            self.wait_for_app()
+        
         try:
-            # Try to use pyautogui's write function
-            pyautogui.write(text)
-            print(f"Typed text: {text[:20]}..." if len(text) > 20 else f"Typed text: {text}")
-            
-            # Alternative approach using clipboard for reliability with special characters
-            if not text.isascii():
-                # Backup current clipboard
-                old_clipboard = pyperclip.paste()
-                
-                # Set new content and paste
-                pyperclip.copy(text)
-                pyautogui.hotkey('ctrl', 'v')
-                
-                # Restore clipboard after a small delay
-                time.sleep(0.5)
-                pyperclip.copy(old_clipboard)
-                print("Used clipboard method for non-ASCII text")
-                
+            # Key events for short ASCII text, a clipboard paste for long or Unicode text
+            start = time.perf_counter()
+            strategy = self.text_injector.type(text)
+            elapsed = time.perf_counter() - start
+            print(f"Typed {len(text)} chars by {strategy} in {elapsed * 1000:.0f} ms: {text[:20]}..." if len(text) > 20
+                  else f"Typed {len(text)} chars by {strategy} in {elapsed * 1000:.0f} ms: {text}")
             self.action_history.append(f"Typed: {text[:20]}..." if len(text) > 20 else f"Typed: {text}")
         except Exception as e:
             print(f"Error typing text: {e}")
@@ -233,7 +422,7 @@ class SystemControl:
         Args:
             key (str): Key to press
         """
-        pyautogui.press(key)
+        self.input.press(key)
         self.action_history.append(f"Pressed key: {key}")
     
     def press_key_combination(self, *keys):
@@ -242,7 +431,7 @@ class SystemControl:
         Args:
             *keys: Keys to press simultaneously
         """
-        pyautogui.hotkey(*keys)
+        self.input.hotkey(*keys)
         self.action_history.append(f"Pressed keys: {'+'.join(keys)}")
     
     def press_keyboard_shortcut(self, shortcut):
@@ -290,13 +479,9 @@ class SystemControl:
             except Exception as e:
                 print(f"Error executing shortcut {shortcut}: {e}")
                 
-                # Try individual key presses as fallback
+                # Try pyautogui's own key presses as fallback
                 try:
-                    for key in shortcuts[shortcut_lower]:
-                        pyautogui.keyDown(key)
-                    time.sleep(0.2)
-                    for key in reversed(shortcuts[shortcut_lower]):
-                        pyautogui.keyUp(key)
+                    pyautogui.hotkey(*shortcuts[shortcut_lower])
                     print(f"Used fallback method for shortcut: {shortcut}")
                     return True
                 except Exception as fallback_error:
@@ -326,11 +511,11 @@ class SystemControl:
         """
         try:
             if x is not None and y is not None:
-                pyautogui.click(x, y, button=button)
+                self.input.click(x, y, button=button)
                 self.action_history.append(f"{button.capitalize()} clicked at ({x}, {y})")
             else:
-                pyautogui.click(button=button)
-                current_pos = pyautogui.position()
+                self.input.click(button=button)
+                current_pos = self.input.position()
                 print(f"{button.capitalize()} click at position {current_pos}")
                 self.action_history.append(f"{button.capitalize()} clicked at current position {current_pos}")
         except Exception as e:
@@ -358,11 +543,11 @@ class SystemControl:
         """
         try:
             if x is not None and y is not None:
-                pyautogui.doubleClick(x, y)
+                self.input.click(x, y, clicks=2)
                 self.action_history.append(f"Double clicked at ({x}, {y})")
             else:
-                pyautogui.doubleClick()
-                current_pos = pyautogui.position()
+                self.input.click(clicks=2)
+                current_pos = self.input.position()
                 print(f"Double click at position {current_pos}")
                 self.action_history.append(f"Double clicked at current position {current_pos}")
         except Exception as e:
@@ -395,8 +580,7 @@ class SystemControl:
         adjusted_amount = amount * scroll_speed
         
         try:
-            # Try scrolling with pyautogui
-            pyautogui.scroll(adjusted_amount)
+            self.input.scroll(adjusted_amount)
             
             # Add to action history
             if amount > 0:
@@ -411,12 +595,10 @@ class SystemControl:
             
             # Fallback approach using Page Up/Down keys
             try:
-                if amount > 0:
-                    for _ in range(abs(int(amount / 120))):
-                        pyautogui.press('pageup')
-                else:
+                key = 'pageup' if amount > 0 else 'pagedown'
+                with self.input.batch():
                     for _ in range(abs(int(amount / 120))):
-                        pyautogui.press('pagedown')
+                        self.input.press(key)
                 
                 print("Used fallback method for scrolling")
             except Exception as fallback_error:
@@ -430,7 +612,7 @@ class SystemControl:
             y (int): Y coordinate
         """
         try:
-            pyautogui.moveTo(x, y)
+            self.input.move_to(x, y)
             self.action_history.append(f"Moved mouse to ({x}, {y})")
         except Exception as e:
             print(f"Error moving mouse: {e}")
@@ -441,7 +623,7 @@ class SystemControl:
         Returns:
             tuple: (x, y) coordinates
         """
-        return pyautogui.position()
+        return self.input.position()
     
     def copy_to_clipboard(self):
         """Copy currently selected text to clipboard
@@ -449,11 +631,16 @@ class SystemControl:
         Returns:
             str: Copied text
         """
-        self.press_keyboard_shortcut("copy")
-        time.sleep(0.2)  # Wait for the clipboard to update
+        # Put back the user's clipboard first if a typed paste is still pending restore
+        self.text_injector.flush()
         
         try:
-            text = pyperclip.paste()
+            # Returns as soon as the clipboard changes, or after the deadline
+            changed, text = self.clipboard_watcher.copy_and_wait(
+                lambda: self.press_keyboard_shortcut("copy"), timeout=1.0
+            )
+            if not changed:
+                print("Warning: Clipboard did not change after copy")
             if text:
                 print(f"Copied to clipboard: {text[:50]}..." if len(text) > 50 else f"Copied to clipboard: {text}")
             return text
@@ -477,30 +664,35 @@ class SystemControl:
         except Exception as e:
             print(f"Error setting clipboard: {e}")
     
-    def take_screenshot(self, filename=None):
+    def take_screenshot(self, filename=None, wait=False):
         """Take a screenshot
         
+        The screen is captured here and saved in the background.
+        
         Args:
             filename (str, optional): Output filename, or None for auto-generated name
+            wait (bool): Block until the file has been written
             
         Returns:
-            str: Path to the saved screenshot file
+            str: Path to the screenshot file
         """
         try:
-            if filename is None:
-                filename = f"screenshot_{time.strftime('%Y%m%d_%H%M%S')}.png"
-            
-            # Ensure we have a folder for screenshots
-            os.makedirs("screenshots", exist_ok=True)
-            filepath = os.path.join("screenshots", filename)
+            if self.capture_backend is None:
+                self.capture_backend = get_capture_backend()
+            try:
+                screenshot = self.capture_backend.grab()
+            except Exception as capture_error:
+                print(f"Capture backend failed, using pyautogui: {capture_error}")
+                screenshot = pyautogui.screenshot()
             
-            # Take the screenshot
-            screenshot = pyautogui.screenshot()
-            screenshot.save(filepath)
+            job = self.screenshot_writer.submit(screenshot, filename)
+            if job.duplicate:
+                print(f"Screen unchanged, reusing {job.path}")
+            if wait and not job.wait(timeout=10):
+                return None
             
-            print(f"Screenshot saved to {filepath}")
-            self.action_history.append(f"Took screenshot: {filepath}")
-            return filepath
+            self.action_history.append(f"Took screenshot: {job.path}")
+            return job.path
         except Exception as e:
             print(f"Error taking screenshot: {e}")
             return None
@@ -526,35 +718,190 @@ class SystemControl:
         Returns:
             bool: Success status
         """
-        # First try WhatsApp desktop app
-        desktop_result = self._send_whatsapp_message_desktop(contact, message)
+        # Numbers go straight to the chat through a send link instead of searching the UI
+        if self._is_phone_number(contact):
+            return self._send_whatsapp_deep_link(contact, message)
         
-        # If desktop app fails, try WhatsApp Web as fallback
-        if not desktop_result:
+        # Reuse WhatsApp if a recent message left it open, otherwise open the desktop app
+        session = self.open_whatsapp_session()
+        if session == "desktop":
+            if self._send_whatsapp_message_desktop(contact, message, open_app=False):
+                self.whatsapp_session_used_at = time.monotonic()
+                return True
+            
+            # If desktop app fails, try WhatsApp Web as fallback
             print("Desktop app failed, trying WhatsApp Web as fallback...")
-            return self._send_whatsapp_message_web(contact, message)
+            self.close_whatsapp_session()
+            session = self.open_whatsapp_session(prefer="web")
+        
+        if session == "web":
+            if self._send_whatsapp_message_web(contact, message, open_page=False):
+                self.whatsapp_session_used_at = time.monotonic()
+                return True
+            self.close_whatsapp_session()
+        return False
+    
+    def _is_phone_number(self, contact):
+        digits = contact.replace(" ", "").replace("-", "")
+        return len(digits) >= 7 and all(c.isdigit() or c == '+' for c in digits)
+    
+    def _send_whatsapp_deep_link(self, number, message):
+        """Send to a phone number by opening its chat directly with the message pre-filled
+        
+        Uses the desktop app's whatsapp:// link on Windows, which the running app
+        handles in place. An open WhatsApp Web tab navigates to the send link
+        itself, so no extra tab takes over the session; other desktop clients
+        search their chat list for the number. Only without an open session is
+        a new WhatsApp Web tab opened.
+        
+        Args:
+            number (str): Phone number in international format
+            message (str): Message to send
+            
+        Returns:
+            bool: Success status
+        """
+        number = number.replace(" ", "").replace("-", "").lstrip("+")
+        session = self._live_whatsapp_session()
+        if os.name == "nt" and session != "web":
+            typed = False
+            try:
+                os.startfile(f"whatsapp://send?phone={number}&text={quote(message)}")
+                screen_width, screen_height = self.input.size()
+                message_bar = (int(screen_width * 0.3), int(screen_height * 0.8), screen_width, screen_height)
+                
+                # The chat is ready once the pre-filled message shows in the message box
+                if not self._wait_for_text(message[:30], message_bar, timeout=15, description="WhatsApp chat"):
+                    print(f"WhatsApp chat for {number} didn't show the message, not sending")
+                    return False
+                typed = True
+                self.input.press('enter')
+                
+                self.whatsapp_session = "desktop"
+                self.whatsapp_session_used_at = time.monotonic()
+                self.action_history.append(f"Sent WhatsApp message to {number}")
+                print(f"Successfully sent WhatsApp message to {number} via send link")
+                return True
+            except Exception as e:
+                if typed:
+                    raise PartialSendError(f"send link to {number} failed after pressing Enter: {e}") from e
+                print(f"WhatsApp desktop send link failed, using WhatsApp Web: {e}")
+        elif session == "desktop":
+            if self._send_whatsapp_message_desktop(number, message, open_app=False):
+                self.whatsapp_session_used_at = time.monotonic()
+                return True
+            return False
+        
+        if not self._send_whatsapp_message_web(number, message, open_page=session != "web"):
+            return False
+        self.whatsapp_session = "web"
+        self.whatsapp_session_used_at = time.monotonic()
+        return True
+    
+    def _live_whatsapp_session(self, max_idle=300.0):
+        """The open WhatsApp session, if it was used recently and its window could be focused
         
-        return desktop_result
+        Returns:
+            str: "desktop" or "web", or None
+        """
+        if self.whatsapp_session and time.monotonic() - self.whatsapp_session_used_at < max_idle:
+            # Only type into it if its window is still there and in front
+            if self._focus_whatsapp():
+                return self.whatsapp_session
+            print("WhatsApp window not found, reopening it")
+            self.whatsapp_session = None
+        return None
+    
+    def open_whatsapp_session(self, prefer="desktop", max_idle=300.0):
+        """Open WhatsApp, or reuse it if it was used recently
         
-    def _send_whatsapp_message_desktop(self, contact, message):
+        Args:
+            prefer (str): "desktop" to try the app before WhatsApp Web, or "web"
+            max_idle (float): Seconds since the last message after which the session is reopened
+            
+        Returns:
+            str: "desktop" or "web", or None if WhatsApp couldn't be opened
+        """
+        session = self._live_whatsapp_session(max_idle)
+        if session:
+            return session
+        
+        self.whatsapp_session = None
+        if prefer == "desktop" and self._open_whatsapp_desktop():
+            self.whatsapp_session = "desktop"
+        elif self._open_whatsapp_web():
+            self.whatsapp_session = "web"
+        self.whatsapp_session_used_at = time.monotonic()
+        return self.whatsapp_session
+    
+    def _focus_whatsapp(self):
+        """Bring the open WhatsApp window (app or browser tab) to the front
+        
+        Returns:
+            bool: True if a WhatsApp window was found and focused
+        """
+        probe = self.launcher.window_probe
+        if probe is None:
+            return False
+        try:
+            return probe.activate(title="WhatsApp")
+        except Exception as e:
+            print(f"Error focusing WhatsApp: {e}")
+            return False
+    
+    def close_whatsapp_session(self):
+        """Forget the open WhatsApp session so the next message reopens it"""
+        self.whatsapp_session = None
+    
+    def _open_whatsapp_desktop(self):
+        """Open the WhatsApp desktop app and wait for its chat list to load
+        
+        Returns:
+            bool: Success status
+        """
+        if not self.open_application("whatsapp"):
+            return False
+        self.wait_for_app(timeout=15)
+        
+        # Wait for the chat list to finish loading
+        screen_width, screen_height = self.input.size()
+        chat_list = (0, int(screen_height * 0.15), int(screen_width * 0.35), int(screen_height * 0.9))
+        self.wait_until(region_stable(self._grab, chat_list, settle=0.5), timeout=15,
+                        description="WhatsApp chat list")
+        return True
+    
+    def _open_whatsapp_web(self):
+        """Open WhatsApp Web and wait for the search box to appear
+        
+        Returns:
+            bool: Success status
+        """
+        if not webbrowser.open("https://web.whatsapp.com"):
+            return False
+        screen_width, screen_height = self.input.size()
+        search_area = (0, 0, int(screen_width * 0.35), int(screen_height * 0.2))
+        self._wait_for_text("search", search_area, timeout=20, description="WhatsApp Web")
+        return True
+    
+    def _send_whatsapp_message_desktop(self, contact, message, open_app=True):
         """Send a WhatsApp message using the desktop application
         
         Args:
             contact (str): Contact name or number
             message (str): Message to send
+            open_app (bool): Open WhatsApp first; False when it's already open
             
         Returns:
             bool: Success status
         """
         # First make sure WhatsApp is open
-        self.open_application("whatsapp")
-        
-        # Wait longer for WhatsApp to load fully
-        time.sleep(8)
+        if open_app:
+            self._open_whatsapp_desktop()
         
+        typed = False
         try:
             # Get screen size to calculate relative positions
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = self.input.size()
             
             # Calculate positions as percentages of screen size
             # Search box is usually in the top-left portion of WhatsApp
@@ -565,138 +912,176 @@ class SystemControl:
             message_x = int(screen_width * 0.5)  # Center horizontally
             message_y = int(screen_height * 0.8)  # 80% from top (near bottom)
             
-            # Click on the search bar
-            pyautogui.moveTo(search_x, search_y, duration=0.5)
-            pyautogui.click()
-            time.sleep(1)
+            # The chat list on the left and the open conversation on the right
+            chat_list = (0, int(screen_height * 0.15), int(screen_width * 0.35), int(screen_height * 0.9))
+            conversation = (int(screen_width * 0.35), int(screen_height * 0.1), screen_width, screen_height)
             
-            # Type the contact name
-            pyautogui.write(contact, interval=0.1)
-            time.sleep(2)
+            # Click on the search bar, clearing any previous search
+            self.input.click(search_x, search_y)
+            self.input.hotkey('ctrl', 'a')
             
-            # Press Down and Enter to select the first contact
-            pyautogui.press('down')
-            time.sleep(0.5)
-            pyautogui.press('enter')
-            time.sleep(2)
+            # Type the contact name and wait for the search results to update
+            results_changed = region_changed(self._grab, chat_list)
+            self.text_injector.type(contact)
+            self.wait_until(results_changed, timeout=3, description="Search results")
+            self.wait_until(region_stable(self._grab, chat_list, settle=0.3), timeout=3)
+            
+            # Press Down and Enter to select the first contact, then wait for the chat to open
+            chat_opened = region_changed(self._grab, conversation)
+            self.input.press('down')
+            self.input.press('enter')
+            self.wait_until(chat_opened, timeout=3, description="Chat")
+            self.wait_until(region_stable(self._grab, conversation, settle=0.3), timeout=3)
             
             # Click on the message box
-            pyautogui.moveTo(message_x, message_y, duration=0.5)
-            pyautogui.click()
-            time.sleep(1)
+            self.input.click(message_x, message_y)
             
             # Type and send the message
-            pyautogui.write(message, interval=0.05)
-            pyautogui.press('enter')
+            typed = True
+            self.text_injector.type(message)
+            self.input.press('enter')
             
             self.action_history.append(f"Sent WhatsApp message to {contact}")
             print(f"Successfully sent WhatsApp message to {contact}")
             return True
             
         except Exception as e:
+            if typed:
+                # Retrying could send the message twice
+                raise PartialSendError(f"desktop send to {contact} failed after typing: {e}") from e
             print(f"Error sending WhatsApp message via desktop app: {e}")
             
             # Try alternative method using clipboard for the message
             try:
-                # Try to locate and click the message box by tab navigation
-                pyautogui.hotkey('ctrl', 'f')  # Focus search
-                time.sleep(0.5)
-                pyautogui.write(contact, interval=0.1)
-                time.sleep(1)
-                pyautogui.press('enter')
-                time.sleep(1)
+                screen_width, screen_height = self.input.size()
+                chat_list = (0, int(screen_height * 0.15), int(screen_width * 0.35), int(screen_height * 0.9))
+                conversation = (int(screen_width * 0.35), int(screen_height * 0.1), screen_width, screen_height)
+                message_bar = (int(screen_width * 0.35), int(screen_height * 0.8), screen_width, screen_height)
+                
+                # Focus search and wait for the results to update
+                self.input.hotkey('ctrl', 'f')
+                results_changed = region_changed(self._grab, chat_list)
+                self.text_injector.type(contact)
+                self.wait_until(results_changed, timeout=3, description="Search results")
+                self.wait_until(region_stable(self._grab, chat_list, settle=0.3), timeout=3)
+                
+                # Open the first result and wait for the chat to load
+                chat_opened = region_changed(self._grab, conversation)
+                self.input.press('enter')
+                self.wait_until(chat_opened, timeout=3, description="Chat")
+                self.wait_until(region_stable(self._grab, conversation, settle=0.3), timeout=3)
                 
                 # Try to focus the message area with tab
-                pyautogui.press('tab')
-                time.sleep(0.5)
+                self.input.press('tab')
                 
-                # Send message using clipboard
-                pyperclip.copy(message)
-                pyautogui.hotkey('ctrl', 'v')
-                time.sleep(0.5)
-                pyautogui.press('enter')
+                # Send message using clipboard, once it shows in the message bar
+                message_typed = region_changed(self._grab, message_bar)
+                typed = True
+                self.text_injector.paste_text(message)
+                self.wait_until(message_typed, timeout=2, description="Pasted message")
+                self.input.press('enter')
                 
                 self.action_history.append(f"Sent WhatsApp message to {contact} (alternative method)")
                 print(f"Successfully sent WhatsApp message to {contact} using alternative method")
                 return True
             except Exception as alt_error:
+                if typed:
+                    raise PartialSendError(f"desktop send to {contact} failed after pasting: {alt_error}") from alt_error
                 print(f"Alternative desktop method also failed: {alt_error}")
                 return False
     
-    def _send_whatsapp_message_web(self, contact, message):
+    def _send_whatsapp_message_web(self, contact, message, open_page=True):
         """Send a WhatsApp message using WhatsApp Web
         
         Args:
             contact (str): Contact name or phone number
             message (str): Message to send
+            open_page (bool): Open WhatsApp Web first; False when it's already open
             
         Returns:
             bool: Success status
         """
+        typed = False
         try:
             # Check if contact is a phone number
             is_phone_number = all(c.isdigit() or c == '+' for c in contact)
             
+            # Get screen dimensions
+            screen_width, screen_height = self.input.size()
+            message_bar = (int(screen_width * 0.3), int(screen_height * 0.8), screen_width, screen_height)
+            
             if is_phone_number:
                 # For phone numbers, we can use the direct API
                 # Make sure phone number is in international format without + sign
                 if contact.startswith('+'):
                     contact = contact[1:]
                 
-                # Open WhatsApp Web with the phone number
-                url = f"https://web.whatsapp.com/send?phone={contact}&text={message}"
-                webbrowser.open(url)
+                # Open the chat with the phone number: in the open WhatsApp Web tab if
+                # there is one, since a second tab would take the session over
+                url = f"https://web.whatsapp.com/send?phone={contact}&text={quote(message)}"
+                if open_page:
+                    webbrowser.open(url)
+                else:
+                    self.input.hotkey('command' if sys.platform == "darwin" else 'ctrl', 'l')
+                    self.text_injector.type(url)
+                    self.input.press('enter')
                 
-                # Wait for page to load
-                time.sleep(10)
+                # The page is ready once the pre-filled message shows in the message box
+                if not self._wait_for_text(message[:30], message_bar, timeout=20, description="WhatsApp Web chat"):
+                    print(f"WhatsApp Web chat for {contact} didn't show the message, not sending")
+                    return False
                 
                 # Press Enter to send the message
-                pyautogui.press('enter')
+                typed = True
+                self.input.press('enter')
                 
                 self.action_history.append(f"Sent WhatsApp Web message to {contact}")
                 print(f"Successfully sent WhatsApp Web message to {contact}")
                 return True
             else:
                 # For contact names, we need to open WhatsApp Web, search and select the contact
-                webbrowser.open("https://web.whatsapp.com")
-                time.sleep(10)  # Wait for WhatsApp Web to load
-                
-                # Get screen dimensions
-                screen_width, screen_height = pyautogui.size()
+                if open_page:
+                    self._open_whatsapp_web()
                 
                 # Search box is typically in the top left
                 search_x = int(screen_width * 0.15)
                 search_y = int(screen_height * 0.1)
+                chat_list = (0, int(screen_height * 0.15), int(screen_width * 0.35), int(screen_height * 0.9))
                 
-                # Click on search
-                pyautogui.moveTo(search_x, search_y, duration=0.5)
-                pyautogui.click()
-                time.sleep(1)
+                # Click on search, clearing any previous search
+                self.input.click(search_x, search_y)
+                self.input.hotkey('ctrl', 'a')
                 
-                # Type contact name
-                pyautogui.write(contact, interval=0.1)
-                time.sleep(2)
+                # Type contact name and wait for the results to settle
+                results_changed = region_changed(self._grab, chat_list)
+                self.text_injector.type(contact)
+                self.wait_until(results_changed, timeout=3, description="Search results")
+                self.wait_until(region_stable(self._grab, chat_list, settle=0.3), timeout=3)
                 
                 # Click on the first result (assuming it's the correct contact)
                 first_result_y = int(screen_height * 0.2)
-                pyautogui.moveTo(search_x, first_result_y, duration=0.5)
-                pyautogui.click()
-                time.sleep(2)
+                self.input.click(search_x, first_result_y)
+                
+                # Wait for the chat's message box to appear
+                if not self._wait_for_text("type a message", message_bar, timeout=5, description="WhatsApp Web chat"):
+                    print(f"WhatsApp Web chat for {contact} didn't open, not sending")
+                    return False
                 
                 # Type message in the message box (typically at the bottom)
                 message_y = int(screen_height * 0.9)
-                pyautogui.moveTo(int(screen_width * 0.5), message_y, duration=0.5)
-                pyautogui.click()
-                time.sleep(1)
+                self.input.click(int(screen_width * 0.5), message_y)
                 
                 # Type and send message
-                pyautogui.write(message, interval=0.05)
-                pyautogui.press('enter')
+                typed = True
+                self.text_injector.type(message)
+                self.input.press('enter')
                 
                 self.action_history.append(f"Sent WhatsApp Web message to {contact}")
                 print(f"Successfully sent WhatsApp Web message to {contact}")
                 return True
                 
         except Exception as e:
+            if typed:
+                raise PartialSendError(f"WhatsApp Web send to {contact} failed after typing: {e}") from e
             print(f"Error sending WhatsApp message via web: {e}")
             return False 
\ No newline at end of file
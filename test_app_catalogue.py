@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the application catalogue
+
+Scans temporary PATH and .desktop directories instead of the real system.
+"""
+
+import os
+import time
+import tempfile
+from app_catalogue import AppCatalogue, parse_desktop_file, is_destructive, terminal_command
+
+DESKTOP_ENTRY = """[Desktop Entry]
+Type=Application
+Name={name}
+GenericName={generic}
+Keywords={keywords}
+Exec={exec_line}
+"""
+
+def write_desktop(directory, filename, name, exec_line, generic="", keywords="", extra=""):
+    path = os.path.join(directory, filename)
+    with open(path, "w") as f:
+        f.write(DESKTOP_ENTRY.format(name=name, generic=generic, keywords=keywords, exec_line=exec_line) + extra)
+    return path
+
+def write_executable(directory, name):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(path, 0o755)
+    return path
+
+def make_tree(root):
+    bin_dir = os.path.join(root, "bin")
+    apps_dir = os.path.join(root, "applications")
+    os.makedirs(bin_dir)
+    os.makedirs(apps_dir)
+    write_executable(bin_dir, "firefox")
+    write_executable(bin_dir, "gedit")
+    write_desktop(apps_dir, "org.mozilla.firefox.desktop", "Firefox Web Browser", "firefox %u",
+                  generic="Web Browser", keywords="Internet;WWW;")
+    write_desktop(apps_dir, "org.gnome.gedit.desktop", "Text Editor", "gedit %U", keywords="Text;Notepad;")
+    write_desktop(apps_dir, "hidden.desktop", "Hidden Tool", "hidden", extra="NoDisplay=true\n")
+    return [(bin_dir, "path"), (apps_dir, "desktop")], apps_dir
+
+def test_parse_desktop_file():
+    """Test that Exec field codes are dropped and hidden entries skipped"""
+    with tempfile.TemporaryDirectory() as root:
+        entry = parse_desktop_file(write_desktop(root, "a.desktop", "Files", "nautilus --new-window %U"))
+        assert entry["command"] == ["nautilus", "--new-window"]
+        assert parse_desktop_file(write_desktop(root, "b.desktop", "B", "b", extra="Hidden=true\n")) is None
+
+def test_find_by_name_keyword_and_fuzzy():
+    """Test exact, keyword and misheard lookups"""
+    print("=== Testing app lookup ===")
+    with tempfile.TemporaryDirectory() as root:
+        sources, _ = make_tree(root)
+        catalogue = AppCatalogue(path=None, sources=sources)
+
+        entry = catalogue.find("firefox")
+        print(f"firefox -> {entry['name']} {entry['command']}")
+        assert entry["command"][0] == "firefox"
+        assert catalogue.find("text editor")["name"] == "Text Editor"
+        assert catalogue.find("notepad")["name"] == "Text Editor"
+        assert catalogue.find("web browser")["name"] == "Firefox Web Browser"
+        assert catalogue.find("fire fox")["name"].startswith("Firefox")
+        assert catalogue.find("hidden tool") is None
+        assert catalogue.find("photoshop") is None
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            catalogue.find("text editor")
+        per_lookup = (time.perf_counter() - start) / 1000
+        print(f"Exact lookup: {per_lookup * 1e6:.1f} us")
+        assert per_lookup < 0.0005
+
+def test_persisted_and_incremental_refresh():
+    """Test that a reload reuses the cache and only rescans changed directories"""
+    print("=== Testing incremental refresh ===")
+    with tempfile.TemporaryDirectory() as root:
+        sources, apps_dir = make_tree(root)
+        cache_path = os.path.join(root, "cache", "apps.json")
+        AppCatalogue(path=cache_path, sources=sources).ensure_loaded()
+
+        catalogue = AppCatalogue(path=cache_path, sources=sources)
+        catalogue.ensure_loaded()
+        print(f"Reload stats: {catalogue.stats}")
+        assert catalogue.stats["dirs_scanned"] == 0
+        assert catalogue.find("text editor")
+
+        write_desktop(apps_dir, "gimp.desktop", "GNU Image Manipulation Program", "gimp-2.10 %U",
+                      keywords="GIMP;Photo;")
+        os.utime(apps_dir, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        catalogue.refresh()
+        assert catalogue.stats["dirs_scanned"] == 1
+        assert catalogue.find("gimp")["command"] == ["gimp-2.10"]
+
+def test_path_binaries_need_exact_name_and_denylist():
+    """Test that PATH binaries aren't fuzzy-matched and destructive commands are never found"""
+    print("=== Testing PATH matching and denylist ===")
+    with tempfile.TemporaryDirectory() as root:
+        sources, apps_dir = make_tree(root)
+        bin_dir = sources[0][0]
+        for name in ("htop", "reboot", "poweroff", "rm", "mkfs.ext4"):
+            write_executable(bin_dir, name)
+        write_desktop(apps_dir, "restart.desktop", "Restart", "systemctl reboot")
+        catalogue = AppCatalogue(path=None, sources=sources)
+
+        assert catalogue.find("htop")["source"] == "path"
+        assert catalogue.find("h top") is None
+        assert catalogue.find("htp") is None
+        for name in ("reboot", "reboots", "power off", "rm", "mkfs.ext4", "restart"):
+            entry = catalogue.find(name)
+            print(f"{name} -> {entry and entry['name']}")
+            assert entry is None
+
+def test_wrapped_destructive_commands():
+    """Test that env and shell wrappers don't hide a denied command"""
+    for command in (["env", "rm", "-rf", "/tmp/x"], ["env", "LANG=C", "shutdown", "now"],
+                    ["sh", "-c", "sleep 1; shutdown now"], ["bash", "-c", "echo hi && reboot"],
+                    ["nice", "-n", "10", "dd", "if=/dev/zero"], ["cmd.exe", "/c", "del", "C:\\x"]):
+        assert is_destructive({"command": command}), command
+    for command in (["env", "GTK_THEME=dark", "gedit"], ["sh", "-c", "firefox --new-window"], ["code"]):
+        assert not is_destructive({"command": command}), command
+
+def test_terminal_launchers():
+    """Test that Terminal=true launchers are wrapped in a terminal emulator"""
+    with tempfile.TemporaryDirectory() as root:
+        entry = parse_desktop_file(write_desktop(root, "htop.desktop", "Htop", "htop", extra="Terminal=true\n"))
+        assert entry["terminal"]
+        terminal = write_executable(root, "myterm")
+        previous = os.environ.get("TERMINAL")
+        os.environ["TERMINAL"] = terminal
+        try:
+            assert terminal_command(entry["command"]) == [terminal, "-e", "htop"]
+        finally:
+            if previous is None:
+                del os.environ["TERMINAL"]
+            else:
+                os.environ["TERMINAL"] = previous
+
+def test_load_async():
+    """Test that a background load is waited for by the first lookup"""
+    with tempfile.TemporaryDirectory() as root:
+        sources, _ = make_tree(root)
+        catalogue = AppCatalogue(path=None, sources=sources)
+        catalogue.load_async()
+        assert catalogue.find("gedit")["name"] == "Text Editor"
+
+if __name__ == "__main__":
+    test_parse_desktop_file()
+    test_find_by_name_keyword_and_fuzzy()
+    test_persisted_and_incremental_refresh()
+    test_path_binaries_need_exact_name_and_denylist()
+    test_wrapped_destructive_commands()
+    test_terminal_launchers()
+    test_load_async()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the brightness service
+
+Uses a fake driver and a temporary /sys/class/backlight tree, so the real screen isn't touched.
+"""
+
+import os
+import time
+import tempfile
+from brightness_control import BrightnessService, FakeBrightnessDriver, discover_backlights, get_brightness_service
+
+def make_backlight(root, name, max_brightness, brightness, kind):
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    for filename, value in (("max_brightness", max_brightness), ("brightness", brightness), ("type", kind)):
+        with open(os.path.join(path, filename), "w") as f:
+            f.write(f"{value}\n")
+    return path
+
+def test_reads_come_from_mirror():
+    print("\n=== Testing in-memory mirror ===")
+    driver = FakeBrightnessDriver(level=40, write_time=0.05)
+    service = BrightnessService(driver)
+    start = time.perf_counter()
+    for _ in range(100):
+        service.adjust(0.5)
+        service.get_brightness()
+    elapsed = time.perf_counter() - start
+    print(f"100 adjustments in {elapsed * 1000:.1f} ms, {len(driver.writes)} writes so far")
+    # The frame loop doesn't wait for 50 ms hardware writes
+    assert elapsed < 0.05
+    assert service.get_brightness() == 90
+    assert driver.reads == 1
+    assert service.wait(2.0)
+    assert driver.level == 90
+    service.close()
+
+def test_writes_are_rate_limited():
+    print("\n=== Testing rate limit ===")
+    driver = FakeBrightnessDriver(level=50)
+    service = BrightnessService(driver, min_interval=0.05)
+    for level in range(0, 101, 2):
+        service.set_brightness(level)
+        time.sleep(0.002)
+    assert service.wait(2.0)
+    print(f"Writes: {driver.writes}")
+    assert driver.writes[-1] == 100
+    assert len(driver.writes) < 10
+    service.close()
+
+def test_smooth_transition():
+    print("\n=== Testing smoothing ===")
+    driver = FakeBrightnessDriver(level=0)
+    service = BrightnessService(driver, min_interval=0.01, smoothing=0.5)
+    service.set_brightness(80, smooth=True)
+    assert service.wait(2.0)
+    print(f"Steps: {[round(level, 1) for level in driver.writes]}")
+    assert len(driver.writes) > 3
+    assert driver.writes == sorted(driver.writes)
+    assert driver.writes[-1] == 80
+    service.close()
+
+def test_sysfs_backlight():
+    print("\n=== Testing sysfs backlight ===")
+    with tempfile.TemporaryDirectory() as root:
+        make_backlight(root, "acpi_video0", 15, 7, "firmware")
+        raw_path = make_backlight(root, "intel_backlight", 1000, 500, "raw")
+        devices = discover_backlights(root)
+        assert [device.device for device in devices] == ["acpi_video0", "intel_backlight"]
+
+        device = devices[1]
+        assert device.max_brightness == 1000
+        assert device.read() == 50
+        device.write(25)
+        device.write(25)
+        with open(os.path.join(raw_path, "brightness")) as f:
+            assert int(f.readline()) == 250
+        device.close()
+
+        service = get_brightness_service(root)
+        assert service.driver.device == "acpi_video0"
+        service.close()
+
+def test_external_changes_are_picked_up():
+    print("\n=== Testing changes made outside the service ===")
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(make_backlight(root, "intel_backlight", 100, 80, "raw"), "brightness")
+        service = BrightnessService(discover_backlights(root)[0], cache_ttl=0.05)
+        service.set_brightness(50)
+        assert service.wait(1.0)
+
+        # A brightness key or the power manager changes the level behind our back
+        with open(path, "w") as f:
+            f.write("20\n")
+        time.sleep(0.1)
+        print(f"Mirror after external write: {service.get_brightness()}")
+        assert service.get_brightness() == 20
+
+        # Setting the same level again is still written
+        service.set_brightness(50)
+        assert service.wait(1.0)
+        with open(path) as f:
+            assert int(f.readline()) == 50
+        assert service.get_brightness() == 50
+        service.close()
+
+if __name__ == "__main__":
+    test_reads_come_from_mirror()
+    test_writes_are_rate_limited()
+    test_smooth_transition()
+    test_sysfs_backlight()
+    test_external_changes_are_picked_up()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the clipboard watcher
+
+Uses an in-memory clipboard updated from a timer thread to simulate apps
+that take different amounts of time to answer Ctrl+C.
+"""
+
+import time
+import threading
+from clipboard_watcher import ClipboardWatcher
+
+class FakeClipboard:
+    def __init__(self, text=""):
+        self.text = text
+        self.sequence = 0
+
+    def paste(self):
+        return self.text
+
+    def copy(self, text):
+        self.text = text
+        self.sequence += 1
+
+    def copy_later(self, text, delay):
+        threading.Timer(delay, self.copy, args=(text,)).start()
+
+def test_returns_as_soon_as_clipboard_changes():
+    """Test that a fast copy returns well before the deadline"""
+    print("=== Testing fast clipboard update ===")
+    clipboard = FakeClipboard("old")
+    watcher = ClipboardWatcher(paste=clipboard.paste, sequence_source=None)
+    start = time.perf_counter()
+    changed, text = watcher.copy_and_wait(lambda: clipboard.copy_later("selected", 0.02), timeout=1.0)
+    elapsed = time.perf_counter() - start
+    print(f"Clipboard change seen after {elapsed * 1000:.1f} ms")
+    assert changed and text == "selected"
+    assert elapsed < 0.2
+
+def test_slow_app_within_deadline():
+    """Test that a slow app still gets until the deadline"""
+    clipboard = FakeClipboard("old")
+    watcher = ClipboardWatcher(paste=clipboard.paste, sequence_source=None)
+    changed, text = watcher.copy_and_wait(lambda: clipboard.copy_later("slow", 0.3), timeout=1.0)
+    assert changed and text == "slow"
+
+def test_timeout_when_nothing_changes():
+    """Test that an unchanged clipboard gives up at the deadline"""
+    print("=== Testing timeout ===")
+    clipboard = FakeClipboard("old")
+    watcher = ClipboardWatcher(paste=clipboard.paste, sequence_source=None)
+    start = time.perf_counter()
+    changed, text = watcher.copy_and_wait(lambda: None, timeout=0.1)
+    elapsed = time.perf_counter() - start
+    print(f"Gave up after {elapsed * 1000:.1f} ms")
+    assert not changed and text == "old"
+    assert 0.1 <= elapsed < 0.2
+
+def test_sequence_number_detects_identical_text():
+    """Test that a sequence counter catches a copy of the same text"""
+    clipboard = FakeClipboard("same")
+    watcher = ClipboardWatcher(paste=clipboard.paste, sequence_source=lambda: clipboard.sequence)
+    changed, text = watcher.copy_and_wait(lambda: clipboard.copy("same"), timeout=0.5)
+    assert changed and text == "same"
+
+if __name__ == "__main__":
+    test_returns_as_soon_as_clipboard_changes()
+    test_slow_app_within_deadline()
+    test_timeout_when_nothing_changes()
+    test_sequence_number_detects_identical_text()
+    print("\n=== Test Complete ===")
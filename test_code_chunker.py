@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for splitting large code selections into chunks
+"""
+
+from code_chunker import split_code
+
+PYTHON_CODE = '''import os
+
+@decorator
+def first():
+    return 1
+
+class Second:
+    def method(self):
+        return 2
+
+def third():
+    return 3
+'''
+
+def test_python_boundaries():
+    """Test that chunks break between top-level definitions, keeping decorators attached"""
+    print("=== Testing Python chunk boundaries ===")
+    chunks = split_code(PYTHON_CODE, max_chars=60)
+    for i, chunk in enumerate(chunks):
+        print(f"--- chunk {i + 1} ---\n{chunk}")
+
+    assert "".join(chunks) == PYTHON_CODE
+    assert len(chunks) == 3
+    assert "@decorator\ndef first" in chunks[0]
+    assert any("class Second" in chunk and "def method" in chunk for chunk in chunks)
+
+def test_small_code_is_one_chunk():
+    """Test that code under the limit isn't split"""
+    assert split_code(PYTHON_CODE, max_chars=10000) == [PYTHON_CODE]
+
+def test_generic_and_oversized():
+    """Test non-Python code and a single definition larger than a chunk"""
+    print("=== Testing non-Python code ===")
+    js = "function a() {\n  return 1;\n}\n\nfunction b() {\n  return 2;\n}\n"
+    chunks = split_code(js, max_chars=30)
+    assert len(chunks) == 2
+    assert chunks[1].startswith("function b")
+
+    long_function = "def big():\n" + "".join(f"    x{i} = {i}\n" for i in range(100))
+    chunks = split_code(long_function, max_chars=200)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "".join(chunks) == long_function
+
+if __name__ == "__main__":
+    test_python_boundaries()
+    test_small_code_is_one_chunk()
+    test_generic_and_oversized()
+    print("\n=== Test Complete ===")
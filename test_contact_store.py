@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the contact directory
+
+Imports small vCard and CSV files written to a temporary folder.
+"""
+
+import os
+import tempfile
+from contact_store import ContactStore, normalize_phone, phonetic_key
+
+VCARDS = """BEGIN:VCARD
+VERSION:3.0
+FN:Catherine Smith
+N:Smith;Catherine;;;
+TEL;TYPE=HOME:+44 20 7946 0000
+TEL;TYPE=CELL:+44 7700 900123
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Mary Jane Wat
+ son
+item1.TEL:0044 7700 900456
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:No Number
+END:VCARD
+"""
+
+CSV_EXPORT = """First Name,Last Name,Mobile Phone,Home Phone
+Jon,Snow,+1 555 010 0001,
+Priya,Sharma,098765 43210,
+"""
+
+def make_store(root):
+    vcf_path = os.path.join(root, "contacts.vcf")
+    csv_path = os.path.join(root, "contacts.csv")
+    with open(vcf_path, "w") as f:
+        f.write(VCARDS)
+    with open(csv_path, "w") as f:
+        f.write(CSV_EXPORT)
+    store = ContactStore(path=os.path.join(root, "contacts.sqlite"), default_country_code="91")
+    assert store.import_file(vcf_path) == 2
+    assert store.import_file(csv_path) == 2
+    return store
+
+def test_phone_normalization():
+    assert normalize_phone("+44 7700 900123") == "447700900123"
+    assert normalize_phone("0044 7700 900456") == "447700900456"
+    assert normalize_phone("098765 43210", "+91") == "919876543210"
+    assert normalize_phone("12") == ""
+    assert phonetic_key("Kathryn") == phonetic_key("Catherine")
+
+def test_import_and_resolve():
+    """Test exact, first-name, phonetic and misrecognised lookups"""
+    print("=== Testing contact resolution ===")
+    with tempfile.TemporaryDirectory() as root:
+        store = make_store(root)
+        assert store.resolve("catherine smith").phone == "447700900123"
+        assert store.resolve("Mary Jane Watson").phone == "447700900456"
+        assert store.resolve("john snow").phone == "15550100001"
+        assert store.resolve("kathryn").name == "Catherine Smith"
+        assert store.resolve("pria").name == "Priya Sharma"
+        assert store.resolve("bartholomew") is None
+        print(store.resolve("kathryn smyth"))
+
+        # Contacts persist in SQLite
+        store.db.close()
+        reopened = ContactStore(path=os.path.join(root, "contacts.sqlite"))
+        assert len(reopened) == 4
+        assert reopened.resolve("priya").phone == "919876543210"
+
+def test_split_multi_word_names():
+    """Test that "<name> <message>" parsing takes as many words as the name has"""
+    with tempfile.TemporaryDirectory() as root:
+        store = make_store(root)
+        contact, message = store.split_name("mary jane watson are we still on for tonight")
+        assert contact.name == "Mary Jane Watson"
+        assert message == "are we still on for tonight"
+
+        contact, message = store.split_name("catherine running ten minutes late")
+        assert contact.name == "Catherine Smith"
+        assert message == "running ten minutes late"
+
+        contact, message = store.split_name("bob see you soon")
+        assert contact is None
+
+if __name__ == "__main__":
+    test_phone_normalization()
+    test_import_and_resolve()
+    test_split_multi_word_names()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming Gemini responses into speech
+
+Runs against the local Gemini stub server, so no API key is needed.
+"""
+
+import time
+from gemini_rest import GeminiRestModel
+from llm_stub_server import LLMStubServer
+from tts import SentenceBuffer
+
+def test_stream_arrives_incrementally():
+    """Test that the first chunk arrives before the whole response is generated"""
+    print("=== Testing streamed Gemini response ===")
+    chunks = ["First sentence. ", "Second ", "sentence. ", "Third sentence."]
+    with LLMStubServer(chunks=chunks, chunk_delay=0.1) as server:
+        model = GeminiRestModel(api_key="test", base_url=server.base_url)
+
+        start = time.perf_counter()
+        arrivals = []
+        for chunk in model.generate_content("Explain this code", stream=True):
+            arrivals.append((time.perf_counter() - start, chunk.text))
+
+        print(f"Chunk arrivals: {[(round(t, 2), text) for t, text in arrivals]}")
+        assert [text for _, text in arrivals] == chunks
+        assert arrivals[0][0] < arrivals[-1][0] - 0.2
+
+        full = model.generate_content("Explain this code")
+        assert full.text == "".join(chunks)
+        assert "Explain this code" in str(server.requests[0]["body"])
+
+def test_sentence_buffer():
+    """Test that streamed chunks are released as whole sentences"""
+    print("=== Testing sentence buffer ===")
+    buffer = SentenceBuffer()
+    spoken = []
+    for chunk in ["First sentence. ", "Second ", "sentence. ", "Third sentence."]:
+        spoken.extend(buffer.feed(chunk))
+    assert spoken == ["First sentence.", "Second sentence."]
+    spoken.extend(buffer.flush())
+    assert spoken[-1] == "Third sentence."
+
+    long_buffer = SentenceBuffer(max_chars=20)
+    released = long_buffer.feed("a very long run of words without any punctuation")
+    assert released and len(long_buffer.pending) <= 20
+
+if __name__ == "__main__":
+    test_stream_arrives_incrementally()
+    test_sentence_buffer()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the staged gesture pipeline
+
+Uses simulated camera, inference and actuation stages, so no webcam or
+MediaPipe is needed.
+"""
+
+import time
+from gesture_pipeline import DropQueue, StageStats, GesturePipeline
+
+def test_drop_queue_keeps_newest():
+    print("\n=== Testing drop queue ===")
+    queue = DropQueue(maxsize=2)
+    for item in range(5):
+        queue.put(item)
+    assert queue.dropped == 3
+    assert queue.get(0) == 3 and queue.get(0) == 4
+    assert queue.get(0.01) is None
+    queue.close()
+    start = time.perf_counter()
+    assert queue.get(1.0) is None
+    assert time.perf_counter() - start < 0.1
+
+def test_stage_stats():
+    print("\n=== Testing stage stats ===")
+    stats = StageStats("test", window=1.0)
+    for i in range(11):
+        stats.record(0.01, now=100 + i * 0.05)
+    assert abs(stats.fps(now=100.5) - 20) < 0.01
+    assert abs(stats.latency() - 0.01) < 1e-9
+    # Old samples fall out of the window
+    stats.record(0.03, now=110)
+    assert stats.latency() == 0.03 and stats.fps(now=110) == 0.0
+
+def test_slow_actuation_does_not_stall_capture():
+    print("\n=== Testing stage decoupling ===")
+    frames = iter(range(10 ** 6))
+
+    def read_frame():
+        time.sleep(1 / 100)  # 100 fps camera
+        return next(frames)
+
+    def infer(frame):
+        time.sleep(1 / 50)  # 50 fps model
+        return frame
+
+    actuated = []
+
+    def actuate(packet):
+        actuated.append(packet.seq)
+        if len(actuated) % 3 == 0:
+            time.sleep(0.2)  # occasional slow click or brightness write
+
+    with GesturePipeline(read_frame, infer, actuate, report_interval=0) as pipeline:
+        time.sleep(1.0)
+        summary = pipeline.summary()
+        latest = pipeline.latest(timeout=0.5)
+    print(f"Summary: {pipeline.format_summary()}")
+    assert summary["capture"]["fps"] > 70
+    assert summary["inference"]["fps"] > 35
+    assert summary["dropped"]["inference"] > 0 and summary["dropped"]["actuation"] > 0
+    # Actuation always moves on to the newest frame rather than a backlog
+    assert actuated == sorted(actuated) and actuated[-1] - actuated[0] > 50
+    # Latency stays bounded by one slow action plus one inference, not a growing queue
+    assert summary["end_to_end"]["latency_ms"] < 300
+    assert latest is not None and latest.actuated_at >= latest.inferred_at >= latest.captured_at
+    assert not any(thread.is_alive() for thread in pipeline.threads)
+
+if __name__ == "__main__":
+    test_drop_queue_keeps_newest()
+    test_stage_stats()
+    test_slow_actuation_does_not_stall_capture()
+    print("\n=== Test Complete ===")
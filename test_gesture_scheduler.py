@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the gesture controller's idle scheduler
+
+Uses a fake clock, and simulated camera and inference stages, so no
+webcam or MediaPipe is needed.
+"""
+
+import time
+from gesture_scheduler import AdaptiveScheduler
+from gesture_pipeline import GesturePipeline
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class Result:
+    def __init__(self, hand):
+        self.multi_hand_landmarks = ["hand"] if hand else None
+
+def test_idle_and_wake():
+    print("\n=== Testing idle and wake transitions ===")
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(idle_after=5.0, idle_fps=2.0, clock=clock)
+    assert scheduler.mode == "active" and scheduler.profile.width == 640
+    assert scheduler.next_frame_delay() == 0.0
+
+    clock.now += 4.9
+    assert scheduler.observe(False) == "active"
+    clock.now += 0.2
+    assert scheduler.observe(False) == "idle"
+    assert scheduler.profile.width == 320
+
+    # Idle: one frame every half second
+    scheduler.frame_taken()
+    clock.now += 0.1
+    assert abs(scheduler.next_frame_delay() - 0.4) < 1e-9
+    clock.now += 0.4
+    assert scheduler.next_frame_delay() == 0.0
+
+    # The first probe with a hand wakes it up
+    scheduler.frame_taken()
+    clock.now += 0.03
+    assert scheduler.observe(True, captured_at=clock.now - 0.03) == "active"
+    assert scheduler.next_frame_delay() == 0.0
+    summary = scheduler.summary()
+    print(f"Summary: {summary}")
+    assert summary["wakes"] == 1 and summary["sleeps"] == 1
+    assert summary["frames"] == {"active": 0, "idle": 2}
+    assert abs(summary["max_wake_ms"] - 30) < 1e-6
+    assert abs(summary["seconds"]["active"] - 5.1) < 1e-9 and abs(summary["seconds"]["idle"] - 0.53) < 1e-9
+
+def test_disabled():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(idle_after=0, clock=clock)
+    clock.now += 3600
+    assert scheduler.observe(False) == "active"
+
+def test_pipeline_probes_slowly_and_wakes_quickly():
+    print("\n=== Testing idle pipeline ===")
+    hand = {"visible": False, "appeared": None}
+    woke = []
+
+    def read_frame():
+        time.sleep(1 / 100)
+        return hand["visible"]
+
+    def actuate(packet):
+        if packet.result.multi_hand_landmarks and not woke:
+            woke.append(time.monotonic() - hand["appeared"])
+
+    scheduler = AdaptiveScheduler(idle_after=0.2, idle_fps=10)
+    with GesturePipeline(read_frame, Result, actuate, report_interval=0, scheduler=scheduler) as pipeline:
+        time.sleep(0.3)
+        assert scheduler.mode == "idle"
+        frames_before = scheduler.stats["frames"]["idle"]
+        time.sleep(0.5)
+        idle_frames = scheduler.stats["frames"]["idle"] - frames_before
+        print(f"Idle frames in 0.5s: {idle_frames}")
+        assert 3 <= idle_frames <= 7
+
+        hand["visible"], hand["appeared"] = True, time.monotonic()
+        time.sleep(0.3)
+        assert scheduler.mode == "active"
+        print(f"Wake-up latency: {woke[0] * 1000:.0f} ms, {pipeline.format_summary()}")
+        # At most one probe interval plus a frame
+        assert woke[0] < 0.1 + 0.05
+
+if __name__ == "__main__":
+    test_idle_and_wake()
+    test_disabled()
+    test_pipeline_probes_slowly_and_wakes_quickly()
+    print("\n=== Test Complete ===")
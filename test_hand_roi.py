@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for hand ROI tracking
+
+Uses a fake landmark model that finds a bright square in the image, so no
+webcam or MediaPipe is needed.
+"""
+
+import numpy as np
+from hand_roi import HandROITracker, TrackedHandDetector, remap_landmarks
+
+class Landmark:
+    def __init__(self, x, y, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+class Hand:
+    def __init__(self, landmarks):
+        self.landmark = landmarks
+
+class Results:
+    def __init__(self, hands):
+        self.multi_hand_landmarks = hands or None
+
+def fake_process(image):
+    """Landmarks at the corners and centre of the bright square, if it's wholly visible"""
+    ys, xs = np.nonzero(image[:, :, 0])
+    if len(xs) < 400:
+        return Results([])
+    height, width = image.shape[:2]
+    x0, x1, y0, y1 = xs.min() / width, (xs.max() + 1) / width, ys.min() / height, (ys.max() + 1) / height
+    points = [(x0, y0), (x1, y0), (x0, y1), (x1, y1), ((x0 + x1) / 2, (y0 + y1) / 2)]
+    return Results([Hand([Landmark(x, y, 0.1) for x, y in points])])
+
+def frame_with_hand(left, top, size=20, shape=(480, 640)):
+    frame = np.zeros(shape + (3,), dtype=np.uint8)
+    if left is not None:
+        frame[top:top + size, left:left + size] = 255
+    return frame
+
+def test_remap_landmarks():
+    print("\n=== Testing landmark remapping ===")
+    landmark = Landmark(0.5, 0.25, 0.2)
+    remap_landmarks([landmark], (100, 40, 300, 240), 640, 480)
+    assert abs(landmark.x - 200 / 640) < 1e-9
+    assert abs(landmark.y - 90 / 480) < 1e-9
+    assert abs(landmark.z - 0.2 * 200 / 640) < 1e-9
+
+def test_tracker_prediction():
+    print("\n=== Testing ROI prediction ===")
+    tracker = HandROITracker(padding=0.5, min_fraction=0.1)
+    assert tracker.predict(640, 480) is None
+    tracker.update([(0.5, 0.5), (0.6, 0.6)])
+    left, top, right, bottom = tracker.predict(640, 480)
+    # 64 px wide hand doubled by padding, centred on the hand
+    assert right - left == bottom - top == 128
+    assert (left + right) // 2 == 352 and (top + bottom) // 2 == 264
+    # Moving right: the next region is shifted ahead of the hand
+    tracker.update([(0.55, 0.5), (0.65, 0.6)])
+    assert tracker.predict(640, 480)[0] > left + 32
+    # Near the edge the region is clamped inside the frame
+    tracker.update([(0.95, 0.9), (1.0, 1.0)])
+    left, top, right, bottom = tracker.predict(640, 480)
+    assert right <= 640 and bottom <= 480
+    tracker.lose()
+    assert not tracker.tracking and tracker.predict(640, 480) is None
+
+def test_tracked_detector():
+    print("\n=== Testing tracked detection ===")
+    detector = TrackedHandDetector(fake_process)
+    # Hand moving steadily to the right, then jumping across the frame, then gone
+    positions = [(100 + 8 * i, 200) for i in range(20)] + [(500, 50)] + [(None, None)] * 3
+    for left, top in positions:
+        results = detector(frame_with_hand(left, top))
+        if left is None:
+            assert results.multi_hand_landmarks is None
+            continue
+        # Landmarks come back in full-frame coordinates whichever path found them
+        centre = results.multi_hand_landmarks[0].landmark[4]
+        assert abs(centre.x * 640 - (left + 10)) < 1 and abs(centre.y * 480 - (top + 10)) < 1
+
+    summary = detector.summary()
+    print(f"Summary: {summary}")
+    # The ROI misses the jump and the first empty frame; each miss is retried in full.
+    # The first frame and the remaining empty frames are searched in full too.
+    assert summary["roi_inferences"] == 21
+    assert detector.stats["lost"] == 2
+    assert summary["full_inferences"] == 5
+    assert summary["roi_area"] < 0.2
+    assert abs(summary["loss_rate"] - 2 / 21) < 1e-9
+
+def test_separate_full_frame_model():
+    print("\n=== Testing separate ROI and full-frame models ===")
+    shapes = {"roi": [], "full": []}
+
+    def model(kind):
+        def process(image):
+            shapes[kind].append(image.shape[:2])
+            return fake_process(image)
+        return process
+
+    detector = TrackedHandDetector(model("roi"), full_process=model("full"))
+    for i in range(5):
+        detector(frame_with_hand(100 + 8 * i, 200))
+    print(f"ROI calls {len(shapes['roi'])}, full-frame calls {len(shapes['full'])}")
+    # Only the first frame is searched in full; crops never reach the full-frame model
+    assert shapes["full"] == [(480, 640)]
+    assert len(shapes["roi"]) == 4 and all(shape != (480, 640) for shape in shapes["roi"])
+
+if __name__ == "__main__":
+    test_remap_landmarks()
+    test_tracker_prediction()
+    test_tracked_detector()
+    test_separate_full_frame_model()
+    print("\n=== Test Complete ===")
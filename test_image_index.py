@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the generated-image index
+
+Runs against the local Stability stub server, so no API key is needed.
+"""
+
+import os
+import time
+import tempfile
+import image_index
+from PIL import Image
+from image_index import ImageIndex, make_image_key, prompt_from_filename
+from image_jobs import StabilityClient, ImageJobManager
+from stability_stub_server import StabilityStubServer
+
+def test_keys_and_filenames():
+    print("\n=== Testing cache keys and file names ===")
+    assert make_image_key("A red fox.") == make_image_key("  a RED   fox ")
+    assert make_image_key("a red fox") != make_image_key("a red fox", {"steps": 50})
+    assert make_image_key("a red fox", {"steps": 30}) == make_image_key("a red fox")
+    assert prompt_from_filename("a_photo_of_elephant_20250418_172022.png")[0] == "a photo of elephant"
+    prompt, created = prompt_from_filename("red_fox_20250418_172022_12_1.png")
+    assert prompt == "red fox" and created is not None
+
+def test_repeat_prompts_served_from_cache():
+    print("\n=== Testing repeat prompts ===")
+    with StabilityStubServer() as server, tempfile.TemporaryDirectory() as directory:
+        index = ImageIndex(directory, path=os.path.join(directory, "index.sqlite"))
+        manager = ImageJobManager(StabilityClient("test-key", base_url=server.base_url), directory, index=index)
+        first = manager.submit("a red fox")
+        assert manager.wait(first, 5) and first.status == "done" and not first.cached
+
+        repeat = manager.submit("A red fox!")
+        # Answered without queueing or calling the API
+        assert repeat.status == "done" and repeat.cached
+        assert repeat.path == first.path and repeat.thumbnail_path == first.thumbnail_path
+        assert len(server.requests) == 1
+
+        different = manager.submit("a red fox", {"steps": 10})
+        fresh = manager.submit("a red fox", use_cache=False)
+        assert manager.wait(different, 5) and manager.wait(fresh, 5)
+        assert not different.cached and not fresh.cached
+        assert len(server.requests) == 3
+
+        # A deleted image is no longer served
+        for job in (first, fresh):
+            os.remove(job.path)
+        again = manager.submit("a red fox")
+        assert not again.cached
+        assert manager.wait(again, 5)
+        print(f"Index stats: {index.stats}")
+        manager.shutdown()
+        index.close()
+
+def test_search_and_incremental_refresh():
+    print("\n=== Testing search and refresh ===")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("a_photo_of_elephant_20250418_172022.png", "red_fox_in_snow_20250418_172231.png",
+                     "a_red_dragon_20250418_174020.png"):
+            Image.new("RGB", (512, 512), (200, 80, 40)).save(os.path.join(directory, name))
+        path = os.path.join(directory, "index.sqlite")
+
+        index = ImageIndex(directory, path=path)
+        assert index.refresh() == (3, 0)
+        assert len(index) == 3
+        assert os.path.exists(os.path.join(directory, "thumbnails", "red_fox_in_snow_20250418_172231.jpg"))
+
+        results = index.search("images of the red fox")
+        print(f"Search results: {results}")
+        assert [record.prompt for record in results] == ["red fox in snow", "a red dragon"]
+        assert index.search("of the") == []
+        # Files found on disk have unknown parameters, so they aren't served for generation
+        assert index.lookup("red fox in snow") is None
+        index.close()
+
+        # Reopening rescans nothing that hasn't changed
+        os.remove(os.path.join(directory, "a_red_dragon_20250418_174020.png"))
+        Image.new("RGB", (64, 64)).save(os.path.join(directory, "a_blue_whale_20250419_090000.png"))
+        reopened = ImageIndex(directory, path=path)
+        start = time.perf_counter()
+        assert reopened.refresh() == (1, 1)
+        print(f"Incremental refresh took {(time.perf_counter() - start) * 1000:.1f} ms, stats: {reopened.stats}")
+        assert reopened.stats["unchanged"] == 2
+        assert [record.prompt for record in reopened.search("whale")] == ["a blue whale"]
+        assert reopened.search("dragon") == []
+        reopened.close()
+
+def test_refresh_keeps_images_added_during_scan():
+    print("\n=== Testing images added during a refresh ===")
+    with tempfile.TemporaryDirectory() as directory:
+        Image.new("RGB", (64, 64)).save(os.path.join(directory, "red_fox_20250418_172022.png"))
+        index = ImageIndex(directory, path=os.path.join(directory, "index.sqlite"))
+
+        # A job saves and adds its image right after the directory was listed
+        def racing_scandir(path):
+            entries = list(scandir(path))
+            new_path = os.path.join(directory, "a_green_frog_20250419_100000.png")
+            Image.new("RGB", (64, 64)).save(new_path)
+            index.add(new_path, "a green frog")
+            return entries
+
+        scandir, image_index.os.scandir = os.scandir, racing_scandir
+        try:
+            assert index.refresh() == (1, 0)
+        finally:
+            image_index.os.scandir = scandir
+        print(f"Indexed: {len(index)} images")
+        assert len(index) == 2
+        assert [record.prompt for record in index.search("frog")] == ["a green frog"]
+        index.close()
+
+if __name__ == "__main__":
+    test_keys_and_filenames()
+    test_repeat_prompts_served_from_cache()
+    test_search_and_incremental_refresh()
+    test_refresh_keeps_images_added_during_scan()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the image generation job manager
+
+Runs against the local Stability stub server, so no API key is needed.
+"""
+
+import os
+import time
+import tempfile
+from PIL import Image
+from image_jobs import StabilityClient, ImageJobManager, ImageGenerationError, save_image_stream
+from stability_stub_server import StabilityStubServer
+
+def test_jobs_run_in_background():
+    print("\n=== Testing background generation ===")
+    with StabilityStubServer(latency=0.3) as server, tempfile.TemporaryDirectory() as directory:
+        updates = []
+        manager = ImageJobManager(StabilityClient("test-key", base_url=server.base_url), directory,
+                                  workers=2, on_update=lambda job: updates.append((job.id, job.status)))
+        start = time.perf_counter()
+        first = manager.submit("a red fox")
+        second = manager.submit("a blue whale")
+        # submit() returns straight away
+        assert time.perf_counter() - start < 0.1
+        assert manager.wait(first, 5) and manager.wait(second, 5)
+        elapsed = time.perf_counter() - start
+        print(f"Two jobs in {elapsed:.2f}s, updates: {updates}")
+        # Both ran at once on the pool
+        assert elapsed < 0.55
+        assert first.status == "done" and second.status == "done"
+        assert first.path != second.path
+        with Image.open(first.path) as image:
+            assert image.size == (64, 64)
+        assert os.path.basename(first.thumbnail_path) == os.path.basename(first.path)[:-4] + ".jpg"
+        assert (first.id, "running") in updates and (first.id, "done") in updates
+        assert {"text": "a red fox"} in [request["body"]["text_prompts"][0] for request in server.requests]
+        assert manager.get() is second
+        manager.shutdown()
+
+def test_status_and_cancel():
+    print("\n=== Testing status and cancellation ===")
+    with StabilityStubServer(latency=0.3) as server, tempfile.TemporaryDirectory() as directory:
+        manager = ImageJobManager(StabilityClient("test-key", base_url=server.base_url), directory, workers=1)
+        running = manager.submit("a castle")
+        queued = manager.submit("a dragon")
+        time.sleep(0.1)
+        print(running.describe())
+        assert running.status == "running"
+        assert "waiting" in queued.describe()
+
+        # The latest unfinished job is cancelled first; it never reaches the server
+        assert manager.cancel() is queued
+        assert queued.status == "cancelled"
+        assert manager.cancel(running.id) is running
+        print(running.describe())
+        assert running.status == "cancelling" and "being cancelled" in running.describe()
+        assert manager.active() == []
+        assert manager.cancel(running.id) is None
+        assert manager.wait(running, 5)
+        assert running.status == "cancelled"
+        assert running.path is None
+        assert len(server.requests) == 1
+        assert os.listdir(directory) == []
+        assert manager.cancel() is None
+        manager.shutdown()
+
+def test_errors_and_timeouts():
+    print("\n=== Testing errors and timeouts ===")
+    with StabilityStubServer(fail_first=1) as server, tempfile.TemporaryDirectory() as directory:
+        manager = ImageJobManager(StabilityClient("test-key", base_url=server.base_url), directory)
+        job = manager.submit("a storm")
+        manager.wait(job, 5)
+        print(f"Failed job error: {job.error}")
+        assert job.status == "failed" and "500" in job.error
+        manager.shutdown()
+
+    with StabilityStubServer(latency=1.0) as server:
+        client = StabilityClient("test-key", base_url=server.base_url, read_timeout=0.2)
+        start = time.perf_counter()
+        try:
+            client.text_to_image("slow")
+            assert False, "Expected a timeout"
+        except ImageGenerationError:
+            pass
+        assert time.perf_counter() - start < 0.8
+
+def test_single_pass_save():
+    print("\n=== Testing single-pass save ===")
+    for json_only in (False, True):
+        with StabilityStubServer(image_size=(600, 300), json_only=json_only) as server, \
+                tempfile.TemporaryDirectory() as directory:
+            manager = ImageJobManager(StabilityClient("test-key", base_url=server.base_url), directory)
+            jobs = [manager.submit("a lighthouse") for _ in range(3)]
+            for job in jobs:
+                assert manager.wait(job, 5) and job.status == "done"
+            # Same prompt in the same second still gets distinct files
+            assert len({job.path for job in jobs}) == 3
+            assert server.requests[0]["headers"]["Accept"] == "image/png"
+            with Image.open(jobs[0].path) as image:
+                assert image.size == (600, 300)
+            with Image.open(jobs[0].thumbnail_path) as thumbnail:
+                print(f"json_only={json_only}: thumbnail {thumbnail.size}")
+                assert thumbnail.size == (256, 128)
+            leftovers = [name for root, _, names in os.walk(directory) for name in names if name.endswith(".part")]
+            assert leftovers == []
+            manager.shutdown()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "broken.png")
+        rejected = False
+        try:
+            save_image_stream([b"\x89PNG\r\n\x1a\n", b"not really a png"], path,
+                              os.path.join(directory, "thumbnails", "broken.jpg"))
+        except Exception as e:
+            print(f"Corrupt image rejected: {e}")
+            rejected = True
+        assert rejected
+        # Nothing half-written is left under either name
+        assert not os.path.exists(path) and not os.path.exists(path + ".part")
+
+if __name__ == "__main__":
+    test_jobs_run_in_background()
+    test_status_and_cancel()
+    test_errors_and_timeouts()
+    test_single_pass_save()
+    print("\n=== Test Complete ===")
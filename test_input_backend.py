@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the input backends
+
+Uses the recording backend, so no events reach the real mouse or keyboard.
+"""
+
+import threading
+from input_backend import RecordingInputBackend, XTestInputBackend, get_input_backend
+
+def test_actions_become_events():
+    print("\n=== Testing action events ===")
+    backend = RecordingInputBackend()
+    backend.hotkey("ctrl", "shift", "t")
+    backend.click(100, 200, button="right")
+    backend.scroll(-3)
+    print(f"Batches: {backend.batches}")
+    assert backend.batches[0] == [
+        ("key", "ctrl", True), ("key", "shift", True), ("key", "t", True),
+        ("key", "t", False), ("key", "shift", False), ("key", "ctrl", False),
+    ]
+    assert backend.batches[1] == [("move", 100, 200), ("button", "right", True), ("button", "right", False)]
+    assert backend.batches[2] == [("scroll", -3)]
+    assert backend.position() == (100, 200)
+
+def test_batch_sends_one_flush():
+    print("\n=== Testing batching ===")
+    backend = RecordingInputBackend()
+    with backend.batch():
+        for x in range(0, 500, 10):
+            backend.move_to(x, x // 2)
+        with backend.batch():
+            backend.click()
+        # Nothing is sent until the outermost block ends
+        assert backend.batches == []
+    assert backend.flush_count == 1
+    assert len(backend.events) == 52
+    assert backend.position() == (490, 245)
+
+def test_write_and_double_click():
+    print("\n=== Testing typing and double click ===")
+    backend = RecordingInputBackend()
+    backend.write("Hi!")
+    assert [event[1] for event in backend.events if event[2]] == ["H", "i", "!"]
+    backend.clear()
+    backend.click(clicks=2)
+    assert [event[0] for event in backend.events] == ["button"] * 4
+    # A zero scroll sends nothing
+    backend.scroll(0)
+    assert backend.flush_count == 2
+
+def test_batches_from_threads_dont_interleave():
+    print("\n=== Testing concurrent batches ===")
+    backend = RecordingInputBackend()
+
+    def worker(x):
+        for _ in range(200):
+            with backend.batch():
+                backend.move_to(x, x)
+                backend.click()
+
+    threads = [threading.Thread(target=worker, args=(x,)) for x in (1, 2, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Flushes: {backend.flush_count}")
+    assert backend.flush_count == 600
+    for batch in backend.batches:
+        assert len(batch) == 3 and batch[0][0] == "move"
+
+def test_backend_selection():
+    print("\n=== Testing backend selection ===")
+    backend = get_input_backend("recording")
+    print(f"Selected: {backend.name}")
+    assert isinstance(backend, RecordingInputBackend)
+
+    # An unknown name falls back to auto-detection instead of raising KeyError
+    try:
+        backend = get_input_backend("xtst")
+        print(f"Unknown name selected: {backend.name}")
+        assert backend.name in ("xtest", "pyautogui")
+    except ImportError as e:
+        print(f"Auto-detected backend needs a missing module: {e}")
+
+class FakeXTest:
+    """Stands in for libXtst/libX11 and records the events sent"""
+
+    def __init__(self):
+        self.sent = []
+
+    def XTestFakeKeyEvent(self, display, keycode, down, delay):
+        self.sent.append(("key", keycode, down))
+
+    def XTestFakeButtonEvent(self, display, button, down, delay):
+        self.sent.append(("button", button, down))
+
+    def XTestFakeMotionEvent(self, display, screen, x, y, delay):
+        self.sent.append(("move", x, y))
+
+    def XFlush(self, display):
+        pass
+
+class FakeXTestInputBackend(XTestInputBackend):
+    KEYS = {"ctrl": (37, False), "shift": (50, False), "c": (54, False), "C": (54, True)}
+
+    def __init__(self):
+        super().__init__()
+        self._xlib = self._xtst = FakeXTest()
+        self.display = 1
+
+    def _keycode(self, key):
+        if key not in self.KEYS:
+            raise ValueError(f"No key on the current keyboard layout for {key!r}")
+        return self.KEYS[key]
+
+def test_xtest_unknown_key_sends_nothing():
+    print("\n=== Testing XTest unknown key ===")
+    backend = FakeXTestInputBackend()
+    try:
+        backend.hotkey("ctrl", "nosuchkey")
+        assert False, "unknown key should raise"
+    except ValueError as e:
+        print(f"Raised: {e}")
+    print(f"Sent: {backend._xtst.sent}")
+    assert backend._xtst.sent == []
+
+    backend.press("C")
+    print(f"Sent: {backend._xtst.sent}")
+    assert backend._xtst.sent == [("key", 50, 1), ("key", 54, 1), ("key", 54, 0), ("key", 50, 0)]
+
+if __name__ == "__main__":
+    test_actions_become_events()
+    test_batch_sends_one_flush()
+    test_write_and_double_click()
+    test_batches_from_threads_dont_interleave()
+    test_backend_selection()
+    test_xtest_unknown_key_sends_nothing()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for the Gemini response cache
+"""
+
+import os
+import time
+import tempfile
+from llm_cache import ResponseCache, make_cache_key
+
+def test_cache_key_normalization():
+    """Test that whitespace-only differences map to the same key"""
+    print("=== Testing cache key normalization ===")
+    a = make_cache_key("analyze", "gemini-pro", "1", "    def f():\r\n        return 1   \n")
+    b = make_cache_key("analyze", "gemini-pro", "1", "def f():\n    return 1")
+    assert a == b
+    assert a != make_cache_key("debug", "gemini-pro", "1", "def f():\n    return 1")
+    assert a != make_cache_key("analyze", "gemini-pro", "2", "def f():\n    return 1")
+
+def test_memory_and_disk_layers():
+    """Test LRU eviction, disk persistence and hit/miss counters"""
+    print("=== Testing memory and disk cache layers ===")
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite")
+
+    cache = ResponseCache(path, max_memory_entries=1)
+    assert cache.get("a") is None
+    cache.put("a", "first")
+    cache.put("b", "second")  # evicts "a" from memory
+    assert cache.get("b") == "second"
+    assert cache.get("a") == "first"  # served from disk
+    stats = cache.stats()
+    print(f"Stats: {stats}")
+    assert stats["memory_hits"] == 1
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 1
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.get("b") == "second"
+    reopened.close()
+
+def test_ttl_expiry():
+    """Test that expired entries are treated as misses"""
+    print("=== Testing cache TTL ===")
+    cache = ResponseCache(None, ttl=0.05)
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+if __name__ == "__main__":
+    test_cache_key_normalization()
+    test_memory_and_disk_layers()
+    test_ttl_expiry()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared LLM client
+
+Runs against the local Gemini stub server with simulated errors and latency.
+"""
+
+import time
+import requests
+from llm_client import LLMClient, CircuitBreaker, CircuitOpenError, DeadlineExceeded, LLMError
+from llm_stub_server import LLMStubServer
+
+def test_retries_transient_errors():
+    """Test that 503s are retried and the call still succeeds"""
+    print("=== Testing retry on transient errors ===")
+    with LLMStubServer(fail_first=2) as server:
+        client = LLMClient(base_url=server.base_url, backoff=0.01)
+        response = client.generate_content("hello")
+        print(f"Stats: {client.stats}")
+        assert response.text.startswith("This code defines")
+        assert client.stats["retries"] == 2
+        assert len(server.requests) == 3
+
+def test_client_errors_are_not_retried():
+    """Test that a 400 fails immediately"""
+    with LLMStubServer(fail_first=1, error_status=400) as server:
+        client = LLMClient(base_url=server.base_url, backoff=0.01)
+        try:
+            client.generate_content("hello")
+            assert False, "Expected LLMError"
+        except LLMError:
+            pass
+        assert len(server.requests) == 1
+
+def test_deadline():
+    """Test that a slow server can't hold a call past its deadline"""
+    print("=== Testing per-call deadline ===")
+    with LLMStubServer(latency=1.0) as server:
+        client = LLMClient(base_url=server.base_url, max_retries=0)
+        start = time.perf_counter()
+        try:
+            client.generate_content("hello", timeout=0.2)
+            assert False, "Expected a timeout"
+        except (LLMError, DeadlineExceeded):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"Gave up after {elapsed:.2f}s")
+        assert elapsed < 0.8
+
+def test_circuit_breaker():
+    """Test that repeated failures open the breaker and it recovers after the reset timeout"""
+    print("=== Testing circuit breaker ===")
+    with LLMStubServer(error_rate=1.0) as server:
+        client = LLMClient(base_url=server.base_url, max_retries=0, breaker_threshold=2, breaker_reset=0.2)
+        for _ in range(2):
+            try:
+                client.generate_content("hello")
+            except LLMError:
+                pass
+        try:
+            client.generate_content("hello")
+            assert False, "Expected the breaker to be open"
+        except CircuitOpenError:
+            pass
+        assert len(server.requests) == 2
+
+        server.error_rate = 0.0
+        time.sleep(0.25)
+        assert client.generate_content("hello").text
+        assert client.breaker.state == "closed"
+
+def test_breaker_half_open_allows_one_trial():
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+def test_streaming_retries_before_first_chunk():
+    """Test that streaming calls are retried when they fail before any text arrives"""
+    with LLMStubServer(fail_first=1, chunks=["One. ", "Two."]) as server:
+        client = LLMClient(base_url=server.base_url, backoff=0.01)
+        chunks = [chunk.text for chunk in client.generate_content("hello", stream=True)]
+        assert chunks == ["One. ", "Two."]
+
+def test_stream_holds_slot_until_finished():
+    """Test that an open stream counts towards max_concurrency"""
+    with LLMStubServer(chunks=["One. ", "Two."]) as server:
+        client = LLMClient(base_url=server.base_url, max_concurrency=1)
+        stream = client.generate_content("hello", stream=True)
+        assert next(stream).text == "One. "
+        try:
+            client.generate_content("second", timeout=0.2)
+            assert False, "slot should be taken by the open stream"
+        except DeadlineExceeded:
+            pass
+        assert [chunk.text for chunk in stream] == ["Two."]
+        assert client.generate_content("third").text
+
+class DroppingModel:
+    """Streams one chunk, then loses the connection"""
+
+    def generate_content(self, prompt, stream=False, timeout=None):
+        def chunks():
+            yield "One. "
+            raise requests.ConnectionError("connection reset")
+        return chunks()
+
+def test_stream_failure_after_first_chunk():
+    """Test that a mid-stream failure is an LLMError and counts against the breaker"""
+    client = LLMClient(base_url="http://127.0.0.1:9", breaker_threshold=1)
+    client.model = DroppingModel()
+    received = []
+    try:
+        for chunk in client.generate_content("hello", stream=True):
+            received.append(chunk)
+        assert False, "stream should fail"
+    except LLMError as e:
+        print(f"Mid-stream failure: {e}")
+    assert received == ["One. "]
+    assert client.stats["failures"] == 1
+    assert client.breaker.state == "open"
+    # The slot was given back
+    assert client.semaphore.acquire(timeout=0)
+
+if __name__ == "__main__":
+    test_retries_transient_errors()
+    test_client_errors_are_not_retried()
+    test_deadline()
+    test_circuit_breaker()
+    test_breaker_half_open_allows_one_trial()
+    test_streaming_retries_before_first_chunk()
+    test_stream_holds_slot_until_finished()
+    test_stream_failure_after_first_chunk()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the OCR word-box index
+
+Builds Tesseract-style data dicts by hand, so Tesseract isn't needed.
+"""
+
+import time
+import random
+import string
+from ocr_index import OCRIndex, parse_tesseract_data
+
+def make_data(lines):
+    """Build an image_to_data dict from [(top, [(left, text), ...]), ...]"""
+    data = {key: [] for key in ("text", "left", "top", "width", "height", "conf",
+                                "block_num", "par_num", "line_num")}
+    for line_num, (top, words) in enumerate(lines, start=1):
+        for left, text in words:
+            data["text"].append(text)
+            data["left"].append(left)
+            data["top"].append(top)
+            data["width"].append(10 * len(text))
+            data["height"].append(20)
+            data["conf"].append(90)
+            data["block_num"].append(1)
+            data["par_num"].append(1)
+            data["line_num"].append(line_num)
+    return data
+
+def toolbar_index():
+    index = OCRIndex()
+    index.update(parse_tesseract_data(make_data([
+        (10, [(10, "File"), (60, "Edit"), (110, "View")]),
+        (400, [(300, "Sign"), (345, "in"), (600, "Cancel")]),
+        (700, [(800, "Save"), (850, "as..."), (1000, "Save")]),
+    ])))
+    return index
+
+def test_find_word_and_phrase():
+    """Test single and multi-word labels resolve to their box centers"""
+    print("=== Testing label lookup ===")
+    index = toolbar_index()
+    match = index.find("cancel")
+    print(match)
+    assert match.text == "Cancel"
+    assert match.center == (630, 410)
+
+    match = index.find("sign in")
+    assert match.text == "Sign in"
+    assert match.box == (300, 400, 365, 420)
+
+    assert index.find("save as").text == "Save as..."
+    assert index.find("preferences") is None
+
+def test_fuzzy_match_survives_ocr_errors():
+    """Test that a garbled OCR word still matches the spoken label"""
+    index = OCRIndex()
+    index.update(parse_tesseract_data(make_data([(50, [(20, "5ubmit")])])))
+    assert index.find("submit").text == "5ubmit"
+
+def test_region_offset_and_incremental_update():
+    """Test that rescanning a region only replaces the words inside it"""
+    index = toolbar_index()
+    rescan = parse_tesseract_data(make_data([(10, [(0, "Publish")])]), offset=(700, 690))
+    index.update(rescan, region=(700, 650, 1200, 750))
+
+    assert index.find("save") is None
+    assert index.find("publish").center == (735, 710)
+    assert index.find("cancel").text == "Cancel"
+    assert [word.text for word in index.words_in((0, 0, 200, 50))] == ["File", "Edit", "View"]
+    assert "Publish" in index.text()
+
+def test_lookup_is_sub_millisecond():
+    """Test lookups stay fast on a screen full of words"""
+    print("=== Testing lookup speed ===")
+    rng = random.Random(1)
+    lines = []
+    for row in range(100):
+        words = [(col * 80, "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))))
+                 for col in range(20)]
+        lines.append((row * 25, words))
+    lines.append((2600, [(10, "Download"), (100, "now")]))
+    index = OCRIndex()
+    index.update(parse_tesseract_data(make_data(lines)))
+
+    start = time.perf_counter()
+    for _ in range(200):
+        match = index.find("download now")
+    per_lookup = (time.perf_counter() - start) / 200
+    print(f"{len(index)} words indexed, {per_lookup * 1e6:.0f} us per lookup")
+    assert match.text == "Download now"
+    assert per_lookup < 0.001
+
+if __name__ == "__main__":
+    test_find_word_and_phrase()
+    test_fuzzy_match_survives_ocr_errors()
+    test_region_offset_and_incremental_update()
+    test_lookup_is_sub_millisecond()
+    print("\n=== Test Complete ===")
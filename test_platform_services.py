@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the platform services layer
+
+Probes with fake tool lookups and records commands instead of running them.
+"""
+
+from platform_services import PlatformServices
+from volume_control import FakeVolumeBackend
+
+class FakeTools:
+    """shutil.which replacement that knows a fixed set of tools and counts lookups"""
+
+    def __init__(self, *tools):
+        self.tools = set(tools)
+        self.lookups = 0
+
+    def __call__(self, name):
+        self.lookups += 1
+        return f"/usr/bin/{name}" if name in self.tools else None
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, argv, **kwargs):
+        self.calls.append(argv)
+
+def make_services(system, *tools, volume=None):
+    which, run, popen = FakeTools(*tools), Recorder(), Recorder()
+    services = PlatformServices(system=system, which=which, run=run, popen=popen,
+                                volume=volume, brightness=None)
+    return services, which, run, popen
+
+def test_linux_bindings():
+    print("\n=== Testing Linux bindings ===")
+    services, which, run, popen = make_services("Linux", "xdg-open", "systemctl", volume=FakeVolumeBackend())
+    print(services.capabilities)
+    assert services.capabilities == {"volume": "fake", "brightness": None, "open_file": "xdg-open",
+                                     "shutdown": "systemctl"}
+    assert services.set_brightness is None
+
+    lookups = which.lookups
+    services.open_file("/tmp/image.png")
+    services.open_file("/tmp/other.png")
+    services.shutdown()
+    # Calls go straight to the bound command, with no further probing
+    assert which.lookups == lookups
+    assert popen.calls == [["xdg-open", "/tmp/image.png"], ["xdg-open", "/tmp/other.png"]]
+    assert run.calls == [["systemctl", "poweroff"]]
+
+def test_missing_tools_are_unsupported():
+    print("\n=== Testing missing tools ===")
+    services, which, run, popen = make_services("Linux", "gio")
+    assert not services.supports("volume")
+    assert not services.supports("shutdown")
+    assert services.shutdown is None
+    services.open_file("/tmp/a.png")
+    assert popen.calls == [["gio", "open", "/tmp/a.png"]]
+
+def test_windows_brightness_fallback():
+    print("\n=== Testing Windows brightness fallback ===")
+    services, which, run, popen = make_services("Windows", "powershell", "shutdown")
+    assert services.capabilities["brightness"] == "wmi"
+    services.set_brightness(40)
+    assert run.calls[0][0] == "powershell"
+    assert "WmiSetBrightness(1, 40)" in run.calls[0][-1]
+    services.shutdown()
+    assert run.calls[1] == ["shutdown", "/s", "/t", "10", "/f"]
+
+if __name__ == "__main__":
+    test_linux_bindings()
+    test_missing_tools_are_unsupported()
+    test_windows_brightness_fallback()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the shell-free process launcher
+
+Launches small Python child processes and uses readiness probes in place of
+real application windows.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from process_launcher import ProcessLauncher, X11WindowProbe
+
+def child(code):
+    return [sys.executable, "-c", code]
+
+class FakeWindowProbe:
+    """Reports a window once a marker file exists"""
+
+    def __init__(self, marker):
+        self.marker = marker
+        self.calls = []
+
+    def has_window(self, pid=None, title=None):
+        self.calls.append((pid, title))
+        return os.path.exists(self.marker)
+
+def test_ready_when_window_appears():
+    """Test that readiness resolves as soon as the window probe passes"""
+    print("=== Testing window readiness ===")
+    with tempfile.TemporaryDirectory() as root:
+        marker = os.path.join(root, "window")
+        launcher = ProcessLauncher(window_probe=FakeWindowProbe(marker), poll_interval=0.01)
+        handle = launcher.launch(child(f"import time; time.sleep(0.3); open({marker!r}, 'w').close(); time.sleep(5)"),
+                                 name="editor")
+        assert not handle.ready
+        assert handle.wait_ready(timeout=5)
+        print(f"Ready after {handle.startup_time():.2f}s")
+        assert 0.2 < handle.startup_time() < 2.0
+        assert launcher.window_probe.calls[0] == (handle.pid, "editor")
+        assert launcher.terminate(handle.pid)
+
+def test_arguments_are_not_shell_interpreted():
+    """Test that shell metacharacters reach the program untouched"""
+    with tempfile.TemporaryDirectory() as root:
+        output = os.path.join(root, "argv.txt")
+        launcher = ProcessLauncher(window_probe=None, poll_interval=0.01)
+        handle = launcher.launch(child(f"import sys; open({output!r}, 'w').write(sys.argv[1])") + ["a; echo $HOME && b"],
+                                 ready_probe=lambda: os.path.exists(output))
+        assert handle.wait_ready(timeout=5)
+        handle.process.wait(timeout=5)
+        with open(output) as f:
+            assert f.read() == "a; echo $HOME && b"
+
+def test_failed_launch_is_reported_quickly():
+    """Test that a crashing app doesn't hold callers until the timeout"""
+    launcher = ProcessLauncher(window_probe=FakeWindowProbe("/nonexistent"), poll_interval=0.01)
+    start = time.perf_counter()
+    handle = launcher.launch(child("import sys; sys.exit(3)"), timeout=10)
+    assert not handle.wait_ready(timeout=10)
+    assert handle.failed
+    assert time.perf_counter() - start < 2.0
+
+def test_grace_period_without_window_probe():
+    """Test that a surviving process counts as ready when windows can't be seen"""
+    launcher = ProcessLauncher(window_probe=None, poll_interval=0.01, grace_period=0.1)
+    handle = launcher.launch(child("import time; time.sleep(5)"))
+    assert handle.wait_ready(timeout=2)
+    assert len(launcher.reap()) == 1
+    launcher.terminate(handle.pid)
+    handle.process.wait(timeout=5)
+    assert launcher.reap() == []
+
+def test_broker_exit_code_ignored():
+    """Test that a launcher process exiting non-zero doesn't fail the launch"""
+    with tempfile.TemporaryDirectory() as root:
+        marker = os.path.join(root, "window")
+        launcher = ProcessLauncher(window_probe=FakeWindowProbe(marker), poll_interval=0.01)
+        handle = launcher.launch(child(f"import sys; open({marker!r}, 'w').close(); sys.exit(1)"),
+                                 name="Camera", broker=True)
+        assert handle.wait_ready(timeout=5)
+        assert handle.pid is None
+
+def test_exited_apps_are_reaped_on_launch():
+    """Test that finished children are waited for instead of left as zombies"""
+    launcher = ProcessLauncher(window_probe=None, poll_interval=0.01, grace_period=0.1)
+    first = launcher.launch(child("pass"))
+    first.process.wait(timeout=5)
+    second = launcher.launch(child("import time; time.sleep(5)"))
+    assert list(launcher.children) == [second.pid]
+    launcher.terminate(second.pid)
+    second.process.wait(timeout=5)
+
+def test_x11_titles_are_escaped():
+    """Test that window titles aren't treated as regular expressions"""
+    probe = X11WindowProbe()
+    searches = []
+    probe._search = lambda *args: searches.append(args) or []
+    assert not probe.has_window(title="notepad (x86)")
+    assert not probe.activate(title="c++")
+    print(f"Searches: {searches}")
+    assert searches == [("--name", r"notepad\ \(x86\)"), ("--name", r"c\+\+")]
+
+if __name__ == "__main__":
+    test_ready_when_window_appears()
+    test_arguments_are_not_shell_interpreted()
+    test_failed_launch_is_reported_quickly()
+    test_grace_period_without_window_probe()
+    test_broker_exit_code_ignored()
+    test_exited_apps_are_reaped_on_launch()
+    test_x11_titles_are_escaped()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for the screen capture backends
+
+Uses the fake backend so it runs without a display.
+"""
+
+from screen_capture import FakeCaptureBackend, get_capture_backend
+
+def test_buffers_are_reused():
+    """Test that repeated grabs of the same size don't allocate new buffers"""
+    print("=== Testing capture buffer reuse ===")
+    backend = FakeCaptureBackend(screen_size=(640, 480))
+
+    first = backend.grab()
+    allocated = backend.bytes_allocated
+    second = backend.grab()
+
+    print(f"Allocated after first grab: {allocated} bytes")
+    assert backend.bytes_allocated == allocated
+    assert first.buffer is second.buffer
+    assert second.array.shape == (480, 640, 4)
+
+def test_region_and_image():
+    """Test region grabs and conversion to a PIL image"""
+    print("=== Testing region capture ===")
+    backend = FakeCaptureBackend(screen_size=(640, 480))
+
+    frame = backend.grab((10, 20, 110, 70))
+    assert frame.size == (100, 50)
+    # Blue channel of the fake desktop is the x coordinate
+    assert frame.array[0, 0, 0] == 10
+
+    image = frame.to_image()
+    print(f"Image: {image.mode} {image.size}")
+    assert image.size == (100, 50)
+    assert image.getpixel((0, 0))[2] == 10
+
+    copy = frame.copy()
+    backend.grab((10, 20, 110, 70))
+    assert copy.buffer is not frame.buffer
+
+def test_backend_selection():
+    """Test that a misspelt backend name falls back to auto-detection"""
+    assert isinstance(get_capture_backend("fake"), FakeCaptureBackend)
+    backend = get_capture_backend("xshmm")
+    print(f"Unknown name -> {backend.name}")
+    assert not isinstance(backend, FakeCaptureBackend)
+
+if __name__ == "__main__":
+    test_buffers_are_reused()
+    test_region_and_image()
+    test_backend_selection()
+    print("\n=== Test Complete ===")
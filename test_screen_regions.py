@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script for named screen region resolution
+
+Uses the static window backend so it runs without a display.
+"""
+
+from screen_regions import RegionResolver, StaticWindowBackend
+
+def test_named_regions():
+    """Test that named regions map to the right part of the screen"""
+    print("=== Testing named screen regions ===")
+    resolver = RegionResolver(StaticWindowBackend(screen_size=(1920, 1080)))
+
+    cases = {
+        "top half": (0, 0, 1920, 540),
+        "the left pane": (0, 0, 960, 1080),
+        "bottom right": (960, 540, 1920, 1080),
+        "screen": None,
+        "": None,
+    }
+
+    for phrase, expected in cases.items():
+        region = resolver.resolve(phrase)
+        print(f"'{phrase}' -> {region}")
+        assert region == expected
+
+def test_active_window():
+    """Test that window phrases use the backend and are clipped to the screen"""
+    print("=== Testing active window region ===")
+    backend = StaticWindowBackend(screen_size=(1920, 1080), active_window=(-10, 100, 800, 1200))
+    resolver = RegionResolver(backend)
+
+    region = resolver.resolve("active window")
+    print(f"'active window' -> {region}")
+    assert region == (0, 100, 800, 1080)
+
+    backend.active_window = None
+    assert resolver.resolve("this window") is None
+
+if __name__ == "__main__":
+    test_named_regions()
+    test_active_window()
+    print("\n=== Test Complete ===")
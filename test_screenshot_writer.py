@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the background screenshot writer
+
+Uses the fake capture backend and a temporary folder.
+"""
+
+import os
+import time
+import tempfile
+from PIL import Image
+from screen_capture import FakeCaptureBackend
+from screenshot_writer import ScreenshotWriter
+
+def test_submit_returns_before_encoding():
+    print("\n=== Testing background encoding ===")
+    backend = FakeCaptureBackend(screen_size=(1920, 1080))
+    with tempfile.TemporaryDirectory() as directory:
+        writer = ScreenshotWriter(directory, png_compress_level=9)
+        start = time.perf_counter()
+        job = writer.submit(backend.grab())
+        submit_time = time.perf_counter() - start
+        assert job.wait(10)
+        print(f"Submit {submit_time * 1000:.1f} ms, encode {job.encode_time * 1000:.1f} ms")
+        assert submit_time < job.encode_time
+        assert os.path.exists(job.path)
+        assert not os.path.exists(job.path + ".part")
+        with Image.open(job.path) as image:
+            assert image.size == (1920, 1080)
+
+def test_formats():
+    print("\n=== Testing output formats ===")
+    backend = FakeCaptureBackend(screen_size=(320, 240))
+    with tempfile.TemporaryDirectory() as directory:
+        for image_format, pil_format in (("png", "PNG"), ("webp", "WEBP"), ("jpeg", "JPEG")):
+            writer = ScreenshotWriter(directory, image_format=image_format, quality=70)
+            job = writer.submit(backend.grab())
+            assert job.wait(10), job.error
+            with Image.open(job.path) as image:
+                print(f"{image_format}: {os.path.basename(job.path)} {os.path.getsize(job.path)} bytes")
+                assert image.format == pil_format
+
+        # SCREENSHOT_FORMAT values from the environment
+        assert ScreenshotWriter(directory, image_format="JPG").image_format == "jpeg"
+        assert ScreenshotWriter(directory, image_format="gif").image_format == "png"
+
+def test_identical_frames_are_deduplicated():
+    print("\n=== Testing deduplication ===")
+    backend = FakeCaptureBackend(screen_size=(320, 240))
+    with tempfile.TemporaryDirectory() as directory:
+        writer = ScreenshotWriter(directory)
+        first = writer.submit(backend.grab())
+        second = writer.submit(backend.grab())
+        assert second.duplicate and second.path == first.path
+
+        backend.desktop[0:10, 0:10] = 255
+        third = writer.submit(backend.grab())
+        assert not third.duplicate and third.path != first.path
+        # PIL images are hashed the same way
+        fourth = writer.submit(Image.new("RGB", (32, 32), "red"))
+        fifth = writer.submit(Image.new("RGB", (32, 32), "red"))
+        assert fifth.path == fourth.path
+        assert writer.flush(10)
+        assert len(os.listdir(directory)) == 3
+
+def test_retention():
+    print("\n=== Testing retention sweep ===")
+    with tempfile.TemporaryDirectory() as directory:
+        now = time.time()
+        for index in range(10):
+            path = os.path.join(directory, f"screenshot_old_{index:02d}.png")
+            with open(path, "wb") as f:
+                f.write(b"x" * 1000)
+            os.utime(path, (now - 3600 * (10 - index), now - 3600 * (10 - index)))
+        stale = os.path.join(directory, "screenshot_stale.png")
+        with open(stale, "wb") as f:
+            f.write(b"x")
+        os.utime(stale, (now - 40 * 86400, now - 40 * 86400))
+        with open(os.path.join(directory, "notes.txt"), "w") as f:
+            f.write("not a screenshot")
+
+        writer = ScreenshotWriter(directory, max_files=6, max_bytes=None, max_age_days=30)
+        assert writer.sweep() == 5
+        remaining = sorted(os.listdir(directory))
+        print(f"Remaining: {remaining}")
+        assert "notes.txt" in remaining
+        assert "screenshot_stale.png" not in remaining
+        assert remaining[1] == "screenshot_old_04.png"
+
+        writer = ScreenshotWriter(directory, max_files=None, max_bytes=2500, max_age_days=None)
+        assert writer.sweep() == 4
+        assert len(os.listdir(directory)) == 3
+
+if __name__ == "__main__":
+    test_submit_returns_before_encoding()
+    test_formats()
+    test_identical_frames_are_deduplicated()
+    test_retention()
+    print("\n=== Test Complete ===")
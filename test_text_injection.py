@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for adaptive text injection
+
+Uses a fake keyboard and clipboard, so nothing is typed into real windows.
+"""
+
+import time
+from text_injection import TextInjector
+
+class FakeInput:
+    """Records key events and pastes, with configurable per-key and per-paste costs"""
+
+    def __init__(self, key_latency=0.0, paste_latency=0.0):
+        self.key_latency = key_latency
+        self.paste_latency = paste_latency
+        self.clipboard = "user clipboard"
+        self.typed = []
+        self.hotkeys = []
+
+    def write(self, text):
+        time.sleep(self.key_latency * len(text))
+        self.typed.append(text)
+
+    def hotkey(self, *keys):
+        time.sleep(self.paste_latency)
+        self.hotkeys.append(keys)
+        self.typed.append(self.clipboard)
+
+    def copy(self, text):
+        self.clipboard = text
+
+    def paste(self):
+        return self.clipboard
+
+    def injector(self, **kwargs):
+        return TextInjector(write=self.write, hotkey=self.hotkey, copy=self.copy, paste=self.paste, **kwargs)
+
+def test_short_ascii_uses_keys():
+    print("\n=== Testing short ASCII text ===")
+    fake = FakeInput()
+    injector = fake.injector()
+    assert injector.type("hello") == "keys"
+    assert fake.typed == ["hello"]
+    assert fake.hotkeys == []
+    assert fake.clipboard == "user clipboard"
+
+def test_unicode_is_pasted_once():
+    print("\n=== Testing Unicode text ===")
+    fake = FakeInput()
+    injector = fake.injector(restore_delay=0.05)
+    assert injector.type("café ☕") == "paste"
+    # Typed exactly once, not written as keys and then pasted again
+    assert fake.typed == ["café ☕"]
+    assert fake.hotkeys == [injector.paste_keys]
+
+def test_clipboard_restored_after_delay():
+    print("\n=== Testing clipboard restore ===")
+    fake = FakeInput()
+    injector = fake.injector(restore_delay=0.05)
+    start = time.perf_counter()
+    injector.type("x" * 500)
+    # The caller doesn't wait for the restore
+    assert time.perf_counter() - start < 0.05
+    assert fake.clipboard == "x" * 500
+    time.sleep(0.15)
+    assert fake.clipboard == "user clipboard"
+
+def test_back_to_back_pastes_keep_original_clipboard():
+    print("\n=== Testing back-to-back pastes ===")
+    fake = FakeInput()
+    injector = fake.injector(restore_delay=0.1)
+    injector.type("first sentence ünïcode")
+    injector.type("second sentence ünïcode")
+    time.sleep(0.25)
+    assert fake.clipboard == "user clipboard"
+    assert fake.typed == ["first sentence ünïcode", "second sentence ünïcode"]
+
+def test_flush_restores_immediately():
+    print("\n=== Testing flush ===")
+    fake = FakeInput()
+    injector = fake.injector(restore_delay=10)
+    injector.type("naïve")
+    assert fake.clipboard == "naïve"
+    injector.flush()
+    assert fake.clipboard == "user clipboard"
+    # Nothing pending: a second flush is harmless
+    injector.flush()
+    assert fake.clipboard == "user clipboard"
+
+def test_strategy_adapts_to_measured_speed():
+    print("\n=== Testing adaptive threshold ===")
+    text = "a" * 40
+    # Slow key events: 40 keys take 0.2s, much longer than a paste
+    fake = FakeInput(key_latency=0.005, paste_latency=0.001)
+    injector = fake.injector(keys_per_second=1000, paste_overhead=0.08, restore_delay=0.01)
+    assert injector.choose(text) == "keys"
+    for _ in range(5):
+        injector.type(text, strategy="keys")
+        injector.type(text, strategy="paste")
+    print(f"Estimates: {injector.keys_per_second:.0f} keys/s, {injector.paste_overhead * 1000:.1f} ms/paste")
+    assert injector.choose(text) == "paste"
+    assert injector.stats["keys"] == 5 and injector.stats["paste"] == 5
+    injector.flush()
+
+if __name__ == "__main__":
+    test_short_ascii_uses_keys()
+    test_unicode_is_pasted_once()
+    test_clipboard_restored_after_delay()
+    test_back_to_back_pastes_keep_original_clipboard()
+    test_flush_restores_immediately()
+    test_strategy_adapts_to_measured_speed()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for condition-based UI waits
+
+Drives the fake capture backend's desktop from a timer thread to simulate a
+UI that finishes loading after a while.
+"""
+
+import time
+import threading
+import numpy as np
+from screen_capture import FakeCaptureBackend
+from ui_wait import wait_until, pixel_matches, template_present, region_changed, region_stable
+
+def paint_later(backend, delay, region, bgr):
+    """Fill a region of the fake desktop after a delay"""
+    def paint():
+        left, top, right, bottom = region
+        backend.desktop[top:bottom, left:right, :3] = bgr
+    threading.Timer(delay, paint).start()
+
+def test_wait_until_returns_early_and_times_out():
+    """Test that waits end as soon as the condition holds, and give up at the deadline"""
+    print("=== Testing wait_until ===")
+    ready_at = time.monotonic() + 0.1
+    start = time.perf_counter()
+    assert wait_until(lambda: time.monotonic() >= ready_at, timeout=5) is True
+    elapsed = time.perf_counter() - start
+    print(f"Condition met after {elapsed:.2f}s")
+    assert elapsed < 0.5
+
+    start = time.perf_counter()
+    assert wait_until(lambda: False, timeout=0.2) is None
+    assert 0.2 <= time.perf_counter() - start < 0.4
+
+def test_pixel_and_region_changes():
+    """Test pixel, change and stability conditions against a UI that loads after 0.2s"""
+    backend = FakeCaptureBackend((400, 300))
+    button = (100, 100, 150, 130)
+    changed = region_changed(backend.grab, button)
+    paint_later(backend, 0.2, button, (0, 200, 50))
+
+    assert wait_until(pixel_matches(backend.grab, (120, 110), (50, 200, 0)), timeout=2)
+    assert wait_until(changed, timeout=2)
+
+    start = time.perf_counter()
+    assert wait_until(region_stable(backend.grab, button, settle=0.2), timeout=2)
+    assert time.perf_counter() - start >= 0.2
+
+def test_template_present():
+    """Test finding a small icon inside a region"""
+    print("=== Testing template match ===")
+    backend = FakeCaptureBackend((400, 300))
+    backend.desktop[200:210, 300:312, :3] = (10, 20, 250)
+    backend.desktop[203:207, 304:308, :3] = (255, 255, 255)
+    icon = np.zeros((10, 12, 3), dtype=np.uint8)
+    icon[...] = (250, 20, 10)
+    icon[3:7, 4:8] = (255, 255, 255)
+
+    center = wait_until(template_present(backend.grab, icon, (250, 150, 400, 300)), timeout=1)
+    print(f"Icon found at {center}")
+    assert center == (306, 205)
+    assert wait_until(template_present(backend.grab, icon, (0, 0, 100, 100)), timeout=0.1) is None
+
+if __name__ == "__main__":
+    test_wait_until_returns_early_and_times_out()
+    test_pixel_and_region_changes()
+    test_template_present()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the volume backends
+
+Uses the fake mixer and a fake command runner, so the system volume isn't touched.
+"""
+
+import time
+from volume_control import FakeVolumeBackend, PactlVolumeBackend, AmixerVolumeBackend, get_volume_backend
+
+class FakeRun:
+    """Records subprocess.run calls and answers reads with fixed output"""
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.calls = []
+
+    def __call__(self, argv, **kwargs):
+        self.calls.append(argv)
+        assert "shell" not in kwargs
+        return type("Result", (), {"stdout": self.stdout, "returncode": 0})()
+
+def test_set_is_one_call():
+    print("\n=== Testing absolute volume ===")
+    mixer = FakeVolumeBackend(level=30)
+    assert mixer.set_volume(72) == 72
+    assert mixer.writes == [72]
+    # The level just written is served from the cache
+    assert mixer.get_volume() == 72
+    assert mixer.reads == 0
+    assert mixer.set_volume(150) == 100
+    assert mixer.set_volume(-5) == 0
+
+def test_adjust_uses_cached_level():
+    print("\n=== Testing cached adjustments ===")
+    mixer = FakeVolumeBackend(level=40)
+    for _ in range(30):
+        mixer.adjust(0.5)
+    print(f"Level {mixer.get_volume()}, reads {mixer.reads}, writes {len(mixer.writes)}")
+    assert mixer.get_volume() == 55
+    assert mixer.reads == 1
+
+def test_cache_expires():
+    print("\n=== Testing cache expiry ===")
+    mixer = FakeVolumeBackend(level=40, cache_ttl=0.05)
+    assert mixer.get_volume() == 40
+    # Changed outside GRACE, e.g. with the keyboard's volume keys
+    mixer.mixer_level = 20.0
+    assert mixer.get_volume() == 40
+    time.sleep(0.1)
+    assert mixer.get_volume() == 20
+    assert mixer.reads == 2
+
+def test_command_backends():
+    print("\n=== Testing command line mixers ===")
+    run = FakeRun("Volume: front-left: 32768 /  50% / -18.06 dB,   front-right: 32768 /  50% / -18.06 dB\n")
+    pactl = PactlVolumeBackend(run=run)
+    assert pactl.adjust(10) == 60
+    assert run.calls == [
+        ["pactl", "get-sink-volume", "@DEFAULT_SINK@"],
+        ["pactl", "set-sink-volume", "@DEFAULT_SINK@", "60%"],
+    ]
+
+    run = FakeRun("Simple mixer control 'Master',0\n  Front Left: Playback 42598 [65%] [on]\n")
+    amixer = AmixerVolumeBackend(run=run)
+    assert amixer.get_volume() == 65
+
+def test_backend_selection():
+    print("\n=== Testing backend selection ===")
+    assert isinstance(get_volume_backend("fake"), FakeVolumeBackend)
+    # A typo falls back to auto-detection instead of raising
+    backend = get_volume_backend("pulsaudio")
+    print(f"Unknown name -> {backend.name if backend else None}")
+    assert not isinstance(backend, FakeVolumeBackend)
+
+if __name__ == "__main__":
+    test_set_is_one_call()
+    test_adjust_uses_cached_level()
+    test_cache_expires()
+    test_command_backends()
+    test_backend_selection()
+    print("\n=== Test Complete ===")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched WhatsApp send queue
+
+Uses a fake sender that records calls, so no WhatsApp client is needed.
+"""
+
+import time
+from whatsapp_queue import WhatsAppSendQueue, PartialSendError
+
+class FakeWhatsApp:
+    """Stands in for SystemControl, with a slow session open and fast sends"""
+
+    def __init__(self, open_time=0.2, fail_contacts=(), flaky_contacts=(), partial_contacts=()):
+        self.open_time = open_time
+        self.fail_contacts = set(fail_contacts)
+        self.flaky_contacts = set(flaky_contacts)
+        self.partial_contacts = set(partial_contacts)
+        self.session = None
+        self.opens = 0
+        self.sent = []
+
+    def open_whatsapp_session(self):
+        if self.session is None:
+            time.sleep(self.open_time)
+            self.opens += 1
+            self.session = "desktop"
+        return self.session
+
+    def close_whatsapp_session(self):
+        self.session = None
+
+    def send_whatsapp_message(self, contact, message):
+        self.open_whatsapp_session()
+        if contact in self.fail_contacts:
+            return False
+        if contact in self.flaky_contacts:
+            self.flaky_contacts.discard(contact)
+            raise RuntimeError("search box not found")
+        if contact in self.partial_contacts:
+            self.sent.append((contact, message))
+            raise PartialSendError("Enter key failed after typing")
+        self.sent.append((contact, message))
+        return True
+
+def test_batch_opens_whatsapp_once():
+    """Test that a batch shares one session and keeps its order"""
+    print("=== Testing batch send ===")
+    whatsapp = FakeWhatsApp()
+    send_queue = WhatsAppSendQueue(whatsapp)
+    contacts = ["Alice", "Bob", "Carol", "Dave", "Eve"]
+
+    start = time.perf_counter()
+    items = send_queue.send_all([(contact, "standup moved to 10") for contact in contacts], timeout=5)
+    elapsed = time.perf_counter() - start
+    print(f"Sent {len(items)} messages in {elapsed:.2f}s with {whatsapp.opens} session open(s)")
+    assert [item.status for item in items] == ["sent"] * 5
+    assert [contact for contact, _ in whatsapp.sent] == contacts
+    assert whatsapp.opens == 1
+    assert elapsed < 1.0
+
+def test_status_callbacks_and_retry():
+    """Test per-message statuses, a retry after reopening, and a permanent failure"""
+    whatsapp = FakeWhatsApp(open_time=0, fail_contacts=["Mallory"], flaky_contacts=["Bob"])
+    events = []
+    send_queue = WhatsAppSendQueue(whatsapp, on_status=lambda item: events.append((item.contact, item.status)))
+    items = send_queue.send_all([("Alice", "hi"), ("Bob", "hi"), ("Mallory", "hi")], timeout=5)
+
+    assert [item.status for item in items] == ["sent", "sent", "failed"]
+    assert items[1].attempts == 2
+    assert whatsapp.opens == 3  # first open, then a reopen before each retry
+    assert events == [("Alice", "sending"), ("Alice", "sent"),
+                      ("Bob", "sending"), ("Bob", "sent"),
+                      ("Mallory", "sending"), ("Mallory", "failed")]
+
+def test_partial_send_is_not_retried():
+    """Test that a failure after the message was typed isn't sent again"""
+    print("=== Testing partial send ===")
+    whatsapp = FakeWhatsApp(open_time=0, partial_contacts=["Bob"])
+    send_queue = WhatsAppSendQueue(whatsapp)
+    items = send_queue.send_all([("Bob", "hi"), ("Carol", "hi")], timeout=5)
+
+    print(f"Statuses: {[(item.contact, item.status, item.attempts) for item in items]}")
+    assert [item.status for item in items] == ["failed", "sent"]
+    assert items[0].attempts == 1
+    assert whatsapp.sent == [("Bob", "hi"), ("Carol", "hi")]
+
+def test_queue_accepts_messages_while_sending():
+    """Test that messages added later reuse the warm session"""
+    whatsapp = FakeWhatsApp()
+    send_queue = WhatsAppSendQueue(whatsapp)
+    first = send_queue.add("Alice", "one")
+    second = send_queue.add("Bob", "two")
+    assert send_queue.wait([first, second], timeout=5)
+    third = send_queue.add("Carol", "three")
+    assert send_queue.wait([third], timeout=5)
+    assert third.status == "sent"
+    assert whatsapp.opens == 1
+
+def test_history_is_bounded():
+    """Test that finished messages don't pile up in a long-running agent"""
+    whatsapp = FakeWhatsApp(open_time=0)
+    send_queue = WhatsAppSendQueue(whatsapp, history_size=10)
+    for i in range(50):
+        send_queue.send_all([(f"Contact {i}", "hi")], timeout=5)
+    print(f"History: {len(send_queue.history)} of 50 messages")
+    assert len(send_queue.history) == 10
+    assert send_queue.history[-1].contact == "Contact 49"
+    assert send_queue.wait(timeout=5)
+
+if __name__ == "__main__":
+    test_batch_opens_whatsapp_once()
+    test_status_callbacks_and_retry()
+    test_partial_send_is_not_retried()
+    test_queue_accepts_messages_while_sending()
+    test_history_is_bounded()
+    print("\n=== Test Complete ===")
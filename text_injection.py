@@ -0,0 +1,151 @@
+import sys
+import time
+import threading
+
+
+class TextInjector:
+    """Type text with whichever method is faster for it
+
+    Short ASCII text is sent as key events. Long or non-ASCII text is pasted
+    through the clipboard in a transaction: the old clipboard is saved, the
+    text is pasted, and the old contents are restored shortly afterwards on a
+    timer instead of the caller sleeping. Back-to-back pastes (e.g. dictation)
+    share one restore.
+
+    The choice uses running estimates of key-event throughput and paste
+    overhead, updated from real timings, so it adapts to slow or fast
+    input paths.
+    """
+
+    def __init__(self, write=None, hotkey=None, copy=None, paste=None, keys_per_second=150.0,
+                 paste_overhead=0.08, restore_delay=0.3, paste_keys=None):
+        """Initialize text injector
+
+        Args:
+            write (callable, optional): Types ASCII text as key events, default pyautogui.write
+            hotkey (callable, optional): Presses a key combination, default pyautogui.hotkey
+            copy (callable, optional): Sets clipboard text, default pyperclip.copy
+            paste (callable, optional): Reads clipboard text, default pyperclip.paste
+            keys_per_second (float): Initial estimate of key-event throughput
+            paste_overhead (float): Initial estimate of seconds per paste transaction
+            restore_delay (float): Seconds after the last paste before the clipboard is restored
+            paste_keys (tuple, optional): Paste shortcut, default Cmd+V on macOS and Ctrl+V elsewhere
+        """
+        if write is None or hotkey is None:
+            import pyautogui
+            write = write or pyautogui.write
+            hotkey = hotkey or pyautogui.hotkey
+        if copy is None or paste is None:
+            import pyperclip
+            copy = copy or pyperclip.copy
+            paste = paste or pyperclip.paste
+        self.write = write
+        self.hotkey = hotkey
+        self.copy = copy
+        self.paste = paste
+        self.keys_per_second = keys_per_second
+        self.paste_overhead = paste_overhead
+        self.restore_delay = restore_delay
+        self.paste_keys = paste_keys or (("command", "v") if sys.platform == "darwin" else ("ctrl", "v"))
+
+        self.lock = threading.Lock()
+        self.saved_clipboard = None
+        self.restore_timer = None
+        self.stats = {"keys": 0, "paste": 0, "chars_keys": 0, "chars_paste": 0}
+
+    def choose(self, text):
+        """Pick the strategy for a piece of text
+
+        Returns:
+            str: "keys" or "paste"
+        """
+        # Key events can only produce characters that exist on the keyboard layout
+        if not text.isascii() or any(ord(c) < 32 and c not in "\n\t" for c in text):
+            return "paste"
+        if len(text) / self.keys_per_second <= self.paste_overhead:
+            return "keys"
+        return "paste"
+
+    def type(self, text, strategy=None):
+        """Type text into the focused window
+
+        Args:
+            text (str): Text to type
+            strategy (str, optional): Force "keys" or "paste"
+
+        Returns:
+            str: Strategy used
+        """
+        if not text:
+            return "keys"
+        strategy = strategy or self.choose(text)
+        start = time.perf_counter()
+        if strategy == "keys":
+            self.write(text)
+            elapsed = time.perf_counter() - start
+            # Running estimate, so the threshold follows the real input path
+            if elapsed > 0:
+                self.keys_per_second = 0.8 * self.keys_per_second + 0.2 * (len(text) / elapsed)
+        else:
+            self.paste_text(text)
+            elapsed = time.perf_counter() - start
+            self.paste_overhead = 0.8 * self.paste_overhead + 0.2 * elapsed
+        self.stats[strategy] += 1
+        self.stats["chars_" + strategy] += len(text)
+        return strategy
+
+    def paste_text(self, text, timeout=0.25):
+        """Paste text through the clipboard and schedule restoring the old contents
+
+        Args:
+            text (str): Text to paste
+            timeout (float): Maximum seconds to wait for the clipboard to take the text
+        """
+        with self.lock:
+            if self.restore_timer is not None:
+                # A restore is already pending: keep the clipboard saved before the first paste
+                self.restore_timer.cancel()
+                self.restore_timer = None
+            else:
+                try:
+                    self.saved_clipboard = self.paste()
+                except Exception as e:
+                    print(f"Could not save clipboard: {e}")
+                    self.saved_clipboard = None
+
+            self.copy(text)
+            # Some clipboard managers take over ownership asynchronously; make sure our text is there
+            deadline = time.monotonic() + timeout
+            interval = 0.002
+            while self.paste() != text and time.monotonic() < deadline:
+                time.sleep(interval)
+                interval = min(interval * 2, 0.02)
+
+            self.hotkey(*self.paste_keys)
+
+            # The target app reads the clipboard asynchronously, so restore a little later
+            timer = threading.Timer(self.restore_delay, lambda: self._restore(timer))
+            timer.daemon = True
+            self.restore_timer = timer
+            timer.start()
+
+    def _restore(self, timer):
+        with self.lock:
+            # A newer paste replaced this timer; its own restore will run later
+            if timer is not self.restore_timer:
+                return
+            self.restore_timer = None
+            saved, self.saved_clipboard = self.saved_clipboard, None
+            if saved is not None:
+                try:
+                    self.copy(saved)
+                except Exception as e:
+                    print(f"Could not restore clipboard: {e}")
+
+    def flush(self):
+        """Restore the clipboard now if a restore is pending"""
+        with self.lock:
+            timer = self.restore_timer
+        if timer is not None:
+            timer.cancel()
+            self._restore(timer)
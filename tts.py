@@ -1,8 +1,53 @@
 import pyttsx3
+import re
 import time
+import queue
 import threading
 import sys
 
+class SentenceBuffer:
+    """Collect streamed text chunks and release complete sentences"""
+    
+    # Sentence end punctuation followed by whitespace, or a line break
+    SENTENCE_END = re.compile(r'(?<=[.!?:;])\s+|\n+')
+    
+    def __init__(self, max_chars=300):
+        """Initialize sentence buffer
+        
+        Args:
+            max_chars (int): Release text at a word boundary once this much has built up without a sentence end
+        """
+        self.max_chars = max_chars
+        self.pending = ""
+    
+    def feed(self, chunk):
+        """Add a chunk of text
+        
+        Args:
+            chunk (str): Text chunk
+            
+        Returns:
+            list: Sentences completed by this chunk
+        """
+        self.pending += chunk
+        parts = self.SENTENCE_END.split(self.pending)
+        self.pending = parts.pop()
+        
+        sentences = [part.strip() for part in parts if part.strip()]
+        if len(self.pending) > self.max_chars and " " in self.pending:
+            head, self.pending = self.pending.rsplit(" ", 1)
+            sentences.append(head.strip())
+        return sentences
+    
+    def flush(self):
+        """Release whatever text is left
+        
+        Returns:
+            list: Remaining sentence, if any
+        """
+        rest, self.pending = self.pending.strip(), ""
+        return [rest] if rest else []
+
 class TextToSpeech:
     def __init__(self, rate=170, volume=1.0, voice_index=None):
         """Initialize text-to-speech engine with customizable parameters
@@ -106,6 +151,63 @@ class TextToSpeech:
         except Exception as e:
             print(f"Speech error: {e}", file=sys.stderr)
     
+    def speak_stream(self, chunks, intro=None):
+        """Speak streamed text sentence by sentence as it arrives
+        
+        Chunks are consumed on the calling thread while completed sentences are
+        spoken on the speaking thread, so speech starts before the stream ends.
+        
+        Args:
+            chunks (iterable): Text chunks, e.g. from ScreenReader.analyze_code_stream
+            intro (str, optional): Sentence to speak before the streamed text
+            
+        Returns:
+            str: The full streamed text
+        """
+        if self.speaking_thread and self.speaking_thread.is_alive():
+            self.stop_speaking = True
+            self.speaking_thread.join(timeout=0.5)
+        
+        self.stop_speaking = False
+        sentences = queue.Queue()
+        self.speaking_thread = threading.Thread(target=self._speak_queue_thread, args=(sentences,))
+        self.speaking_thread.daemon = True
+        self.speaking_thread.start()
+        
+        if intro:
+            sentences.put(intro)
+        
+        buffer = SentenceBuffer()
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                for sentence in buffer.feed(chunk):
+                    sentences.put(sentence)
+            for sentence in buffer.flush():
+                sentences.put(sentence)
+        finally:
+            sentences.put(None)
+        
+        return "".join(parts)
+    
+    def _speak_queue_thread(self, sentences):
+        """Internal method that speaks sentences from a queue until None"""
+        while True:
+            sentence = sentences.get()
+            if sentence is None:
+                break
+            if self.stop_speaking:
+                continue
+            try:
+                self.engine.say(sentence)
+                self.engine.runAndWait()
+            except RuntimeError:
+                # Handle error when speech is interrupted
+                pass
+            except Exception as e:
+                print(f"Speech error: {e}", file=sys.stderr)
+    
     def stop(self):
         """Stop current speech"""
         self.stop_speaking = True
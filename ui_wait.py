@@ -0,0 +1,178 @@
+import time
+import numpy as np
+
+
+def wait_until(condition, timeout=10.0, interval=0.05, max_interval=0.5, description=None):
+    """Poll a condition until it holds or a deadline passes
+
+    The polling interval starts short and doubles up to max_interval, so a
+    UI that is already ready costs one check and a slow one isn't hammered.
+
+    Args:
+        condition (callable): Returns a truthy value once the wait is over
+        timeout (float): Maximum seconds to wait
+        interval (float): First polling interval in seconds
+        max_interval (float): Longest polling interval in seconds
+        description (str, optional): What is being waited for, for logging
+
+    Returns:
+        object: The condition's truthy result, or None if the deadline passed
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    while True:
+        try:
+            result = condition()
+        except Exception as e:
+            print(f"Wait condition failed: {e}")
+            result = None
+        if result:
+            if description:
+                print(f"{description}: ready after {time.monotonic() - start:.2f}s")
+            return result
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            if description:
+                print(f"{description}: gave up after {timeout:.1f}s")
+            return None
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+def frame_rgb(frame):
+    """(height, width, 3) RGB array for a captured Frame, whatever its raw layout"""
+    pixels = frame.array
+    if frame.rawmode.startswith("BGR"):
+        return pixels[..., 2::-1]
+    return pixels[..., :3]
+
+
+def window_present(probe, title=None, pid=None):
+    """Condition: a window with this title (or owned by this process) is visible
+
+    Args:
+        probe (object): Window probe with has_window(pid, title), see process_launcher
+        title (str, optional): Case-insensitive title fragment
+        pid (int, optional): Owning process
+    """
+    return lambda: probe is not None and probe.has_window(pid=pid, title=title)
+
+
+def pixel_matches(grab, point, color, tolerance=16):
+    """Condition: the pixel at point has roughly this RGB color
+
+    Args:
+        grab (callable): Captures a region (left, top, right, bottom) and returns a Frame
+        point (tuple): (x, y) screen coordinates
+        color (tuple): Expected (r, g, b)
+        tolerance (int): Maximum difference per channel
+    """
+    x, y = point
+
+    def check():
+        pixel = frame_rgb(grab((x, y, x + 1, y + 1)))[0, 0].astype(int)
+        return bool(np.all(np.abs(pixel - np.array(color)) <= tolerance))
+    return check
+
+
+def template_present(grab, template, region, threshold=0.9):
+    """Condition: an image (e.g. an icon) is visible somewhere in a region
+
+    Uses OpenCV's matchTemplate when it's installed and a brute-force NumPy
+    search otherwise, so keep the region small.
+
+    Args:
+        grab (callable): Captures a region and returns a Frame
+        template (PIL.Image or numpy.ndarray): RGB image to look for
+        region (tuple): (left, top, right, bottom) to search
+        threshold (float): Minimum similarity (0-1)
+
+    Returns:
+        callable: Returns the (x, y) screen center of the match, or None
+    """
+    template = np.asarray(template.convert("RGB") if hasattr(template, "convert") else template)
+    template = template[..., :3].astype(np.float32)
+    height, width = template.shape[:2]
+
+    def check():
+        haystack = frame_rgb(grab(region)).astype(np.float32)
+        if haystack.shape[0] < height or haystack.shape[1] < width:
+            return None
+        try:
+            import cv2
+            scores = cv2.matchTemplate(haystack, template, cv2.TM_SQDIFF_NORMED)
+            y, x = np.unravel_index(np.argmin(scores), scores.shape)
+            score = 1.0 - float(scores[y, x])
+        except ImportError:
+            windows = np.lib.stride_tricks.sliding_window_view(haystack, (height, width, 3))[..., 0, :, :, :]
+            errors = np.abs(windows - template).mean(axis=(2, 3, 4))
+            y, x = np.unravel_index(np.argmin(errors), errors.shape)
+            score = 1.0 - float(errors[y, x]) / 255.0
+        if score < threshold:
+            return None
+        return (region[0] + int(x) + width // 2, region[1] + int(y) + height // 2)
+    return check
+
+
+def region_changed(grab, region, min_fraction=0.01):
+    """Condition: a region looks different from when the condition was created
+
+    Args:
+        grab (callable): Captures a region and returns a Frame
+        region (tuple): (left, top, right, bottom)
+        min_fraction (float): Fraction of pixels that must differ
+    """
+    baseline = frame_rgb(grab(region)).copy()
+
+    def check():
+        current = frame_rgb(grab(region))
+        if current.shape != baseline.shape:
+            return True
+        return float(np.any(current != baseline, axis=2).mean()) >= min_fraction
+    return check
+
+
+def region_stable(grab, region, settle=0.3):
+    """Condition: a region hasn't changed for `settle` seconds (e.g. a list finished loading)
+
+    Args:
+        grab (callable): Captures a region and returns a Frame
+        region (tuple): (left, top, right, bottom)
+        settle (float): Seconds the region must stay unchanged
+    """
+    state = {"pixels": None, "since": None}
+
+    def check():
+        current = frame_rgb(grab(region))
+        now = time.monotonic()
+        if state["pixels"] is None or not np.array_equal(current, state["pixels"]):
+            state["pixels"] = current.copy()
+            state["since"] = now
+            return False
+        return now - state["since"] >= settle
+    return check
+
+
+def text_present(grab, label, region, min_score=0.75):
+    """Condition: OCR finds a label (e.g. "Type a message") in a region
+
+    Args:
+        grab (callable): Captures a region and returns a Frame
+        label (str): Text to look for
+        region (tuple): (left, top, right, bottom); keep it small, OCR is slow
+        min_score (float): Minimum fuzzy match score
+
+    Returns:
+        callable: Returns the TextMatch in screen coordinates, or None
+    """
+    import pytesseract
+    from ocr_index import OCRIndex, parse_tesseract_data
+
+    def check():
+        image = grab(region).to_image()
+        data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        index = OCRIndex()
+        index.update(parse_tesseract_data(data, offset=region[:2]))
+        return index.find(label, min_score=min_score)
+    return check
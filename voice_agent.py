@@ -8,7 +8,6 @@ import pyperclip
 import threading
 import pytesseract
 from PIL import ImageGrab, Image
-import google.generativeai as genai
 import tempfile
 import sounddevice as sd
 import soundfile as sf
@@ -16,6 +15,7 @@ import numpy as np
 import wave
 import openai
 from dotenv import load_dotenv
+from llm_client import get_llm_client
 
 class VoiceAgent:
     def __init__(self):
@@ -40,8 +40,7 @@ class VoiceAgent:
         gemini_key = os.getenv("GEMINI_KEY", "")
         if not gemini_key:
             print("Warning: No Gemini API key found in environment variables. Some features may not work.")
-        genai.configure(api_key=gemini_key)
-        self.model = genai.GenerativeModel('gemini-pro')
+        self.model = get_llm_client(gemini_key, 'gemini-pro')
         
         # Initialize Whisper for better speech recognition
         # using OpenAI's API (free tier has limitations)
@@ -0,0 +1,304 @@
+import os
+import re
+import sys
+import time
+import shutil
+import threading
+import subprocess
+
+
+class VolumeBackend:
+    """Base class for system volume backends
+
+    Levels are percentages (0-100, fractional values allowed). The last level
+    read or written is cached, so repeated reads (e.g. every gesture frame)
+    don't touch the mixer until the cache is older than cache_ttl; a change
+    made outside GRACE is picked up after that.
+    """
+
+    name = "base"
+
+    def __init__(self, cache_ttl=2.0):
+        """Initialize volume backend
+
+        Args:
+            cache_ttl (float): Seconds a read or written level is trusted
+        """
+        self.cache_ttl = cache_ttl
+        self.level = None
+        self.level_at = 0.0
+        self.lock = threading.Lock()
+
+    def is_available(self):
+        return False
+
+    def _read(self):
+        """Read the current level from the mixer"""
+        raise NotImplementedError
+
+    def _write(self, level):
+        """Set an absolute level on the mixer"""
+        raise NotImplementedError
+
+    def get_volume(self, max_age=None):
+        """Current volume
+
+        Args:
+            max_age (float, optional): Oldest cached value to accept, default cache_ttl
+
+        Returns:
+            float: Volume percentage
+        """
+        max_age = self.cache_ttl if max_age is None else max_age
+        with self.lock:
+            if self.level is None or time.monotonic() - self.level_at > max_age:
+                self.level = float(self._read())
+                self.level_at = time.monotonic()
+            return self.level
+
+    def set_volume(self, level):
+        """Set the volume in a single mixer call
+
+        Args:
+            level (float): Volume percentage, clamped to 0-100
+
+        Returns:
+            float: Level that was set
+        """
+        level = max(0.0, min(100.0, float(level)))
+        with self.lock:
+            self._write(level)
+            self.level = level
+            self.level_at = time.monotonic()
+        return level
+
+    def adjust(self, delta):
+        """Change the volume relative to the current level
+
+        Args:
+            delta (float): Percentage points to add (negative to lower)
+
+        Returns:
+            float: New level
+        """
+        return self.set_volume(self.get_volume() + delta)
+
+    def close(self):
+        pass
+
+
+class PulseVolumeBackend(VolumeBackend):
+    """PulseAudio / PipeWire backend over one persistent native-protocol connection (pulsectl)"""
+
+    name = "pulse"
+
+    def __init__(self, cache_ttl=2.0):
+        super().__init__(cache_ttl)
+        self.pulse = None
+
+    def is_available(self):
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            self._connect()
+            return True
+        except Exception as e:
+            print(f"PulseAudio connection not available: {e}")
+            return False
+
+    def _connect(self):
+        if self.pulse is None:
+            import pulsectl
+            self.pulse = pulsectl.Pulse("grace-voice-agent")
+        return self.pulse
+
+    def _default_sink(self):
+        try:
+            pulse = self._connect()
+            return pulse.get_sink_by_name(pulse.server_info().default_sink_name)
+        except Exception:
+            # The server may have restarted; reconnect once
+            self.close()
+            pulse = self._connect()
+            return pulse.get_sink_by_name(pulse.server_info().default_sink_name)
+
+    def _read(self):
+        sink = self._default_sink()
+        return self.pulse.volume_get_all_chans(sink) * 100
+
+    def _write(self, level):
+        sink = self._default_sink()
+        if level > 0 and sink.mute:
+            self.pulse.mute(sink, False)
+        self.pulse.volume_set_all_chans(sink, level / 100.0)
+
+    def close(self):
+        if self.pulse is not None:
+            try:
+                self.pulse.close()
+            except Exception:
+                pass
+            self.pulse = None
+
+
+class EndpointVolumeBackend(VolumeBackend):
+    """Windows backend holding the default speaker's IAudioEndpointVolume (pycaw)"""
+
+    name = "endpoint"
+
+    def __init__(self, cache_ttl=2.0):
+        super().__init__(cache_ttl)
+        self.endpoint = None
+        self.endpoint_thread = None
+
+    def is_available(self):
+        if sys.platform != "win32":
+            return False
+        try:
+            self._connect()
+            return True
+        except Exception as e:
+            print(f"Windows audio endpoint not available: {e}")
+            return False
+
+    def _connect(self):
+        # COM pointers belong to the thread that created them
+        if self.endpoint is None or self.endpoint_thread != threading.get_ident():
+            import comtypes
+            from ctypes import cast, POINTER
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+            comtypes.CoInitialize()
+            devices = AudioUtilities.GetSpeakers()
+            interface = devices.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
+            self.endpoint = cast(interface, POINTER(IAudioEndpointVolume))
+            self.endpoint_thread = threading.get_ident()
+        return self.endpoint
+
+    def _read(self):
+        return self._connect().GetMasterVolumeLevelScalar() * 100
+
+    def _write(self, level):
+        endpoint = self._connect()
+        if level > 0 and endpoint.GetMute():
+            endpoint.SetMute(0, None)
+        endpoint.SetMasterVolumeLevelScalar(level / 100.0, None)
+
+
+class CommandVolumeBackend(VolumeBackend):
+    """Backend driving a mixer command line tool, run without a shell"""
+
+    # argv to print the level, argv prefix to set it, and a regex for the percentage
+    get_argv = None
+    set_argv = None
+    pattern = r"(\d+(?:\.\d+)?)%"
+
+    def __init__(self, cache_ttl=2.0, run=subprocess.run):
+        """Initialize command backend
+
+        Args:
+            cache_ttl (float): Seconds a read or written level is trusted
+            run (callable): subprocess.run replacement, for tests
+        """
+        super().__init__(cache_ttl)
+        self.run = run
+
+    def is_available(self):
+        return shutil.which(self.get_argv[0]) is not None
+
+    def _format(self, level):
+        return f"{round(level)}%"
+
+    def _read(self):
+        result = self.run(self.get_argv, capture_output=True, text=True, timeout=2, check=True)
+        match = re.search(self.pattern, result.stdout)
+        if not match:
+            raise RuntimeError(f"Could not parse volume from {self.get_argv[0]}: {result.stdout[:80]!r}")
+        return float(match.group(1))
+
+    def _write(self, level):
+        self.run(self.set_argv + [self._format(level)], capture_output=True, timeout=2, check=True)
+
+
+class PactlVolumeBackend(CommandVolumeBackend):
+    name = "pactl"
+    get_argv = ["pactl", "get-sink-volume", "@DEFAULT_SINK@"]
+    set_argv = ["pactl", "set-sink-volume", "@DEFAULT_SINK@"]
+
+
+class AmixerVolumeBackend(CommandVolumeBackend):
+    name = "amixer"
+    get_argv = ["amixer", "-D", "pulse", "sget", "Master"]
+    set_argv = ["amixer", "-D", "pulse", "sset", "Master"]
+    pattern = r"\[(\d+)%\]"
+
+
+class OsascriptVolumeBackend(CommandVolumeBackend):
+    name = "osascript"
+    get_argv = ["osascript", "-e", "output volume of (get volume settings)"]
+    set_argv = ["osascript", "-e"]
+    pattern = r"(\d+)"
+
+    def is_available(self):
+        return sys.platform == "darwin"
+
+    def _format(self, level):
+        return f"set volume output volume {round(level)}"
+
+
+class FakeVolumeBackend(VolumeBackend):
+    """In-memory mixer for tests, counting reads and writes"""
+
+    name = "fake"
+
+    def __init__(self, level=50.0, cache_ttl=2.0):
+        super().__init__(cache_ttl)
+        self.mixer_level = float(level)
+        self.reads = 0
+        self.writes = []
+
+    def is_available(self):
+        return True
+
+    def _read(self):
+        self.reads += 1
+        return self.mixer_level
+
+    def _write(self, level):
+        self.writes.append(level)
+        self.mixer_level = level
+
+
+VOLUME_BACKENDS = {
+    "pulse": PulseVolumeBackend,
+    "endpoint": EndpointVolumeBackend,
+    "pactl": PactlVolumeBackend,
+    "amixer": AmixerVolumeBackend,
+    "osascript": OsascriptVolumeBackend,
+    "fake": FakeVolumeBackend,
+}
+
+
+def get_volume_backend(name=None):
+    """Get a volume backend by name, or the best available one
+
+    Args:
+        name (str, optional): Backend name, or None to use VOLUME_BACKEND / auto-detect
+
+    Returns:
+        VolumeBackend: Volume backend, or None if volume control isn't available
+    """
+    name = name or os.getenv("VOLUME_BACKEND")
+    if name in VOLUME_BACKENDS:
+        return VOLUME_BACKENDS[name]()
+    if name:
+        print(f"Unknown volume backend '{name}' (expected one of {', '.join(VOLUME_BACKENDS)}), auto-detecting")
+
+    # Persistent connections first, command line tools as a fallback
+    for backend_class in (EndpointVolumeBackend, PulseVolumeBackend, PactlVolumeBackend,
+                          AmixerVolumeBackend, OsascriptVolumeBackend):
+        backend = backend_class()
+        if backend.is_available():
+            print(f"Volume backend: {backend.name}")
+            return backend
+    print("No volume backend available")
+    return None
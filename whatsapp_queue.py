@@ -0,0 +1,192 @@
+import time
+import queue
+import itertools
+import threading
+
+
+class PartialSendError(Exception):
+    """A send failed after the message was typed, so it may already be in the chat
+
+    Retrying could deliver the message twice, so the queue reports it as
+    failed instead.
+    """
+
+
+class QueuedMessage:
+    """A message waiting in the send queue and its delivery status"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, contact, message, callback=None):
+        self.id = next(self._ids)
+        self.contact = contact
+        self.message = message
+        self.callback = callback
+        self.status = "queued"
+        self.attempts = 0
+        self.error = None
+        self.queued_at = time.monotonic()
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def __repr__(self):
+        return f"QueuedMessage({self.id}, {self.contact!r}, {self.status})"
+
+
+class WhatsAppSendQueue:
+    """Send WhatsApp messages one after another through a single open session
+
+    A worker thread takes messages off the queue and sends them back to back
+    with SystemControl.send_whatsapp_message, which keeps WhatsApp open
+    between calls, so a batch pays the app/page load once instead of per
+    message.
+    """
+
+    def __init__(self, system, on_status=None, max_attempts=2, history_size=100):
+        """Initialize send queue
+
+        Args:
+            system (SystemControl): Object with open_whatsapp_session(),
+                close_whatsapp_session() and send_whatsapp_message(contact, message)
+            on_status (callable, optional): Called with each QueuedMessage whenever
+                its status changes ("sending", "sent", "failed")
+            max_attempts (int): Attempts per message; later attempts reopen WhatsApp first.
+                Failures after the message was typed (PartialSendError) are never retried
+            history_size (int): Messages kept in history; the oldest finished ones are dropped
+        """
+        self.system = system
+        self.on_status = on_status
+        self.max_attempts = max_attempts
+        self.history_size = history_size
+        self.pending = queue.Queue()
+        self.history = []
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def add(self, contact, message, callback=None):
+        """Queue a message for sending
+
+        Args:
+            contact (str): Contact name or phone number
+            message (str): Message text
+            callback (callable, optional): Called with the QueuedMessage on status changes
+
+        Returns:
+            QueuedMessage: Queued message to follow or wait on
+        """
+        item = QueuedMessage(contact, message, callback)
+        self._remember(item)
+        self.pending.put(item)
+        self._ensure_worker()
+        return item
+
+    def add_many(self, pairs, callback=None):
+        """Queue several (contact, message) pairs
+
+        Returns:
+            list: QueuedMessage for each pair, in order
+        """
+        return [self.add(contact, message, callback) for contact, message in pairs]
+
+    def send_all(self, pairs, timeout=None):
+        """Queue messages and block until they've all been attempted
+
+        Args:
+            pairs (list): (contact, message) pairs
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            list: QueuedMessage for each pair with its final status
+        """
+        items = self.add_many(pairs)
+        self.wait(items, timeout)
+        return items
+
+    def wait(self, items=None, timeout=None):
+        """Wait for queued messages to finish
+
+        Args:
+            items (list, optional): Messages to wait for, default everything queued so far
+            timeout (float, optional): Maximum seconds to wait
+
+        Returns:
+            bool: True if all of them finished in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if items is None:
+            with self.lock:
+                items = list(self.history)
+        for item in items:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not item.done.wait(remaining):
+                return False
+        return True
+
+    def _remember(self, item):
+        """Add to history, dropping the oldest finished messages beyond history_size"""
+        with self.lock:
+            self.history.append(item)
+            excess = len(self.history) - self.history_size
+            if excess <= 0:
+                return
+            kept = []
+            for old in self.history:
+                if excess > 0 and old.done.is_set():
+                    excess -= 1
+                else:
+                    kept.append(old)
+            self.history = kept
+
+    def _ensure_worker(self):
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+
+    def _set_status(self, item, status, error=None):
+        item.status = status
+        item.error = error
+        if status in ("sent", "failed"):
+            item.finished_at = time.monotonic()
+        for callback in (item.callback, self.on_status):
+            if callback:
+                try:
+                    callback(item)
+                except Exception as e:
+                    print(f"WhatsApp status callback failed: {e}")
+        if status in ("sent", "failed"):
+            item.done.set()
+
+    def _run(self):
+        while True:
+            try:
+                item = self.pending.get(timeout=1.0)
+            except queue.Empty:
+                # Let the thread exit when idle; add() starts a new one
+                with self.lock:
+                    if self.pending.empty():
+                        self.worker = None
+                        return
+                continue
+
+            self._set_status(item, "sending")
+            error = None
+            while item.attempts < self.max_attempts:
+                item.attempts += 1
+                if item.attempts > 1:
+                    # Whatever state the UI got into, start again from a freshly opened WhatsApp
+                    self.system.close_whatsapp_session()
+                try:
+                    if self.system.send_whatsapp_message(item.contact, item.message):
+                        error = None
+                        break
+                    error = "send failed"
+                except PartialSendError as e:
+                    error = str(e)
+                    print(f"Not retrying {item.contact}, the message may already have been sent: {error}")
+                    break
+                except Exception as e:
+                    error = str(e)
+                print(f"Sending to {item.contact} failed (attempt {item.attempts}): {error}")
+
+            self._set_status(item, "failed" if error else "sent", error)